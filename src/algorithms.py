@@ -1,68 +1,106 @@
 # src/algorithms.py
 
 import heapq
-from collections import deque
+from collections import Counter, deque
+from array import array
+from compact import CompactGraph, VECTORIZE_MIN_WORDS
+from distance_table import table_for
+from instrumentation import start_timer, report
 
-def bfs(graph, start, goal):
+def _path_from_parents(parents, goal):
+    """
+    Rebuilds a path by following parent pointers back from goal.
+    parents maps every reached word to the word it was reached from (None for the start).
+    """
+    path = []
+    node = goal
+    while node is not None:
+        path.append(node)
+        node = parents[node]
+    path.reverse()
+    return path
+
+def bfs(graph, start, goal, stats=None):
     """
     Breadth-First Search (BFS) for finding the shortest path in an unweighted graph.
 
     Parameters:
-        graph: a networkx graph
+        graph: a networkx graph or a CompactGraph
         start: starting word (node)
         goal: target word (node)
+        stats: optional SearchStats (or dict) receiving the search counters, see instrumentation.py
         
     Returns:
         A list of words representing the shortest path from start to goal, or None if no path exists.
     """
-    # Using a deque as our queue; each element is a tuple (current_node, path_so_far)
-    queue = deque()
-    queue.append((start, [start]))
-    visited = {start}
+    if isinstance(graph, CompactGraph):
+        return _bfs_compact(graph, start, goal, stats)
+    started = start_timer(stats)
+    # The queue only holds words; paths are rebuilt from the parent map at the end.
+    queue = deque([start])
+    parents = {start: None}  # Also serves as the visited set
+    expanded = peak = 0
     
     while queue:
-        current, path = queue.popleft()
+        if len(queue) > peak:
+            peak = len(queue)
+        current = queue.popleft()
+        expanded += 1
         if current == goal:
+            path = _path_from_parents(parents, goal)
+            report(stats, "bfs", started, expanded, len(parents) - 1, peak, 0, path)
             return path
         
         # Iterate over all neighboring words (nodes)
         for neighbor in graph.neighbors(current):
-            if neighbor not in visited:
-                visited.add(neighbor)
-                queue.append((neighbor, path + [neighbor]))
+            if neighbor not in parents:
+                parents[neighbor] = current
+                queue.append(neighbor)
+    report(stats, "bfs", started, expanded, len(parents) - 1, peak)
     return None  # Return None if no path is found
 
-def ucs(graph, start, goal):
+def ucs(graph, start, goal, stats=None):
     """
     Uniform Cost Search (UCS) for finding the shortest path in a graph with uniform edge costs.
     In this word ladder, every edge has a cost of 1, so UCS behaves similarly to BFS.
 
     Parameters:
-        graph: a networkx graph
+        graph: a networkx graph or a CompactGraph
         start: starting word (node)
         goal: target word (node)
+        stats: optional SearchStats (or dict) receiving the search counters, see instrumentation.py
         
     Returns:
         A list of words representing the path from start to goal, or None if no path exists.
     """
-    # Priority queue stores tuples: (accumulated_cost, current_node, path_so_far)
-    pq = []
-    heapq.heappush(pq, (0, start, [start]))
-    visited = {}  # Tracks the lowest cost at which we've seen each node
+    if isinstance(graph, CompactGraph):
+        return _ucs_compact(graph, start, goal, stats)
+    started = start_timer(stats)
+    # Priority queue stores tuples: (accumulated_cost, current_node, parent_node)
+    pq = [(0, start, None)]
+    parents = {}  # Parent of each expanded node; a node is final once it is in here
+    expanded = pushed = pops = peak = 0
 
     while pq:
-        cost, current, path = heapq.heappop(pq)
+        if len(pq) > peak:
+            peak = len(pq)
+        cost, current, parent = heapq.heappop(pq)
+        pops += 1
+        # If we've already expanded the node at a lower (or equal) cost, skip this one.
+        if current in parents:
+            continue
+        parents[current] = parent
+        expanded += 1
         if current == goal:
+            path = _path_from_parents(parents, goal)
+            report(stats, "ucs", started, expanded, pushed, peak, pushed + pops, path)
             return path
         
-        # If we've reached the node with a lower cost before, skip this one.
-        if current in visited and visited[current] <= cost:
-            continue
-        visited[current] = cost
-        
         for neighbor in graph.neighbors(current):
-            new_cost = cost + 1  # Each move costs 1
-            heapq.heappush(pq, (new_cost, neighbor, path + [neighbor]))
+            if neighbor not in parents:
+                heapq.heappush(pq, (cost + 1, neighbor, current))  # Each move costs 1
+                pushed += 1
+    report(stats, "ucs", started, expanded, pushed, peak, pushed + pops)
     return None
 
 def heuristic(word, goal):
@@ -79,62 +117,600 @@ def heuristic(word, goal):
     """
     return sum(1 for a, b in zip(word, goal) if a != b)
 
-def astar(graph, start, goal):
+def edit_heuristic(word, goal):
+    """
+    Heuristic for graphs that also allow inserting or deleting a letter, where the
+    letter-by-letter comparison above can overestimate (e.g. "rate" -> "ate" is one
+    deletion but differs in every position).
+
+    Every move removes at most one letter of the word and adds at most one letter,
+    so comparing letters as multisets, the number of moves is at least the larger of
+    the surplus (letters of word not in goal) and the deficit (letters of goal not in
+    word). This is admissible and consistent, and never below the length difference.
+    """
+    balance = Counter(word)
+    balance.subtract(goal)
+    surplus = deficit = 0
+    for count in balance.values():
+        if count > 0:
+            surplus += count
+        else:
+            deficit -= count
+    return max(surplus, deficit)
+
+def _base_heuristic(graph, goal):
+    """Returns the heuristic word -> estimate to goal suited to the graph's move set."""
+    if graph.graph.get("variable_length"):
+        return lambda word: edit_heuristic(word, goal)
+    return lambda word: heuristic(word, goal)
+
+def _precomputed_heuristic(graph, goal_id):
+    """
+    Returns the Hamming distance of every word id of a CompactGraph to the goal,
+    computed in one NumPy pass (bytes indexed by word id), or None for small or
+    variable-length graphs and when numpy is not installed.
+    """
+    if graph.graph.get("variable_length") or len(graph.words) < VECTORIZE_MIN_WORDS:
+        return None
+    try:
+        from vectorized import goal_distances
+    except ImportError:
+        return None
+    return goal_distances(graph, goal_id)
+
+def _landmark_heuristic(landmarks, goal, base=None):
+    """
+    Returns a function word -> max(base heuristic, ALT landmark bound) to goal,
+    or None if the landmarks show that goal cannot be reached from start.
+    base defaults to the Hamming distance.
+    """
+    if base is None:
+        base = lambda word: heuristic(word, goal)
+    index = landmarks.index
+    goal_id = index.get(goal)
+    if goal_id is None:
+        return None
+    bound = landmarks.goal_bound(goal_id)
+    component_of = landmarks.component_of
+    goal_component = component_of[goal_id]
+
+    def estimate(word):
+        word_id = index[word]
+        if component_of[word_id] != goal_component:
+            return None
+        return max(base(word), bound(word_id))
+    return estimate
+
+def astar(graph, start, goal, stats=None, landmarks=None):
     """
     A* Search algorithm that combines the actual cost and a heuristic estimate to find the optimal path.
 
     Parameters:
-        graph: a networkx graph
+        graph: a networkx graph or a CompactGraph
         start: starting word (node)
         goal: target word (node)
+        stats: optional SearchStats (or dict) receiving the search counters, see instrumentation.py
+        landmarks: optional LandmarkIndex for the same words (see landmarks.py); when
+            given, the heuristic is the larger of the Hamming distance and the ALT bound
+
+    On graphs marked graph.graph["variable_length"] (insert / delete moves, see
+    graph.build_variable_length_graph) edit_heuristic replaces the Hamming distance.
         
     Returns:
         A list of words representing the optimal path from start to goal, or None if no path exists.
     """
-    # Priority queue stores tuples: (f, cost, current_node, path_so_far)
-    # f = cost so far + heuristic estimate
-    pq = []
-    start_h = heuristic(start, goal)
-    heapq.heappush(pq, (start_h, 0, start, [start]))
-    visited = {}  # Records the lowest cost at which we reached each node
+    if isinstance(graph, CompactGraph):
+        return _astar_compact(graph, start, goal, stats, landmarks)
+    started = start_timer(stats)
+    h = _base_heuristic(graph, goal)
+    if landmarks is not None:
+        estimate = _landmark_heuristic(landmarks, goal, h)
+        if estimate is None or start not in landmarks.index or estimate(start) is None:
+            report(stats, "astar", started)
+            return None  # start and goal are in different components
+        h = estimate
+    # Priority queue stores tuples: (f, -cost, current_node, parent_node)
+    # f = cost so far + heuristic estimate; among equal f the deeper node is expanded first.
+    pq = [(h(start), 0, start, None)]
+    # The heuristic is consistent (one move changes at most one letter, and landmark
+    # distances change by at most one), so the first time a node is popped its cost
+    # is optimal and its parent is final.
+    parents = {}
+    expanded = pushed = pops = peak = 0
 
     while pq:
-        f, cost, current, path = heapq.heappop(pq)
+        if len(pq) > peak:
+            peak = len(pq)
+        f, cost, current, parent = heapq.heappop(pq)
+        pops += 1
+        cost = -cost
+        if current in parents:
+            continue
+        parents[current] = parent
+        expanded += 1
         if current == goal:
+            path = _path_from_parents(parents, goal)
+            report(stats, "astar", started, expanded, pushed, peak, pushed + pops, path)
             return path
         
-        if current in visited and visited[current] <= cost:
+        new_cost = cost + 1  # Uniform cost for each transformation
+        for neighbor in graph.neighbors(current):
+            if neighbor not in parents:
+                new_f = new_cost + h(neighbor)
+                heapq.heappush(pq, (new_f, -new_cost, neighbor, current))
+                pushed += 1
+    report(stats, "astar", started, expanded, pushed, peak, pushed + pops)
+    return None
+
+def bidirectional(graph, start, goal, stats=None):
+    """
+    Bidirectional BFS: grows one BFS from start and one from goal, always expanding
+    a whole layer of the smaller frontier, and stops when the two searches meet.
+    On word ladders this expands far fewer nodes than a single BFS because each
+    side only has to reach about half the ladder length.
+
+    Parameters:
+        graph: a networkx graph or a CompactGraph
+        start: starting word (node)
+        goal: target word (node)
+        stats: optional SearchStats (or dict) receiving the search counters, see instrumentation.py
+
+    Returns:
+        A list of words representing the shortest path from start to goal, or None if no path exists.
+    """
+    if isinstance(graph, CompactGraph):
+        return _bidirectional_compact(graph, start, goal, stats)
+    started = start_timer(stats)
+    if start == goal:
+        report(stats, "bidirectional", started, 1, 0, 1, 0, [start])
+        return [start]
+    if start not in graph or goal not in graph:
+        report(stats, "bidirectional", started)
+        return None
+
+    # parents_start maps words to the word they were reached from on the start side;
+    # parents_goal does the same on the goal side (i.e. the next word towards goal).
+    parents_start, parents_goal = {start: None}, {goal: None}
+    frontier_start, frontier_goal = [start], [goal]
+    expanded = pushed = peak = 0
+
+    while frontier_start and frontier_goal:
+        if len(frontier_start) + len(frontier_goal) > peak:
+            peak = len(frontier_start) + len(frontier_goal)
+        forward = len(frontier_start) <= len(frontier_goal)
+        if forward:
+            frontier, parents, other = frontier_start, parents_start, parents_goal
+        else:
+            frontier, parents, other = frontier_goal, parents_goal, parents_start
+        next_frontier = []
+        for current in frontier:
+            expanded += 1
+            for neighbor in graph.neighbors(current):
+                if neighbor in parents:
+                    continue
+                parents[neighbor] = current
+                pushed += 1
+                if neighbor in other:
+                    # Both searches have fully expanded their earlier layers, so the
+                    # first meeting word already lies on a shortest path.
+                    path = _path_from_parents(parents_start, neighbor)
+                    path.extend(reversed(_path_from_parents(parents_goal, neighbor)[:-1]))
+                    report(stats, "bidirectional", started, expanded, pushed, peak, 0, path)
+                    return path
+                next_frontier.append(neighbor)
+        if forward:
+            frontier_start = next_frontier
+        else:
+            frontier_goal = next_frontier
+    report(stats, "bidirectional", started, expanded, pushed, peak)
+    return None
+
+# ----- CompactGraph versions -----
+# These work on integer word ids: the visited set is a bytearray and the path is
+# rebuilt from a parent array, so no strings are hashed while expanding nodes.
+
+def _endpoint_ids(graph, start, goal):
+    """Returns the ids of start and goal, or None if either is not in the graph."""
+    start_id = graph.id_of(start)
+    goal_id = graph.id_of(goal)
+    if start_id is None or goal_id is None:
+        return None
+    return start_id, goal_id
+
+def _rebuild_path(graph, parents, goal_id):
+    """Follows the parent array back from goal_id and returns the path as words."""
+    path = []
+    node = goal_id
+    while node != -1:
+        path.append(graph.words[node])
+        node = parents[node]
+    path.reverse()
+    return path
+
+def _bfs_compact(graph, start, goal, stats=None):
+    started = start_timer(stats)
+    ids = _endpoint_ids(graph, start, goal)
+    if ids is None:
+        report(stats, "bfs", started)
+        return None
+    start_id, goal_id = ids
+    offsets, targets = graph.offsets, graph.targets
+    visited = bytearray(len(graph.words))
+    parents = array("i", [-1]) * len(graph.words)
+    visited[start_id] = 1
+    queue = deque([start_id])
+    expanded = pushed = peak = 0
+
+    while queue:
+        if len(queue) > peak:
+            peak = len(queue)
+        current = queue.popleft()
+        expanded += 1
+        if current == goal_id:
+            path = _rebuild_path(graph, parents, goal_id)
+            report(stats, "bfs", started, expanded, pushed, peak, 0, path)
+            return path
+        for neighbor in targets[offsets[current]:offsets[current + 1]]:
+            if not visited[neighbor]:
+                visited[neighbor] = 1
+                parents[neighbor] = current
+                queue.append(neighbor)
+                pushed += 1
+    report(stats, "bfs", started, expanded, pushed, peak)
+    return None
+
+def _ucs_compact(graph, start, goal, stats=None):
+    started = start_timer(stats)
+    ids = _endpoint_ids(graph, start, goal)
+    if ids is None:
+        report(stats, "ucs", started)
+        return None
+    start_id, goal_id = ids
+    offsets, targets = graph.offsets, graph.targets
+    closed = bytearray(len(graph.words))
+    parents = array("i", [-1]) * len(graph.words)
+    # Heap entries: (cost, node_id, parent_id); the parent is fixed when the node is popped.
+    pq = [(0, start_id, -1)]
+    expanded = pushed = pops = peak = 0
+
+    while pq:
+        if len(pq) > peak:
+            peak = len(pq)
+        cost, current, parent = heapq.heappop(pq)
+        pops += 1
+        if closed[current]:
             continue
-        visited[current] = cost
-        
+        closed[current] = 1
+        parents[current] = parent
+        expanded += 1
+        if current == goal_id:
+            path = _rebuild_path(graph, parents, goal_id)
+            report(stats, "ucs", started, expanded, pushed, peak, pushed + pops, path)
+            return path
+        for neighbor in targets[offsets[current]:offsets[current + 1]]:
+            if not closed[neighbor]:
+                heapq.heappush(pq, (cost + 1, neighbor, current))
+                pushed += 1
+    report(stats, "ucs", started, expanded, pushed, peak, pushed + pops)
+    return None
+
+def _astar_compact(graph, start, goal, stats=None, landmarks=None):
+    started = start_timer(stats)
+    ids = _endpoint_ids(graph, start, goal)
+    if ids is None:
+        report(stats, "astar", started)
+        return None
+    start_id, goal_id = ids
+    words, offsets, targets = graph.words, graph.offsets, graph.targets
+    base = _base_heuristic(graph, goal)
+    h = lambda node: base(words[node])
+    distances = _precomputed_heuristic(graph, goal_id)
+    if distances is not None:
+        h = distances.__getitem__
+    if landmarks is not None:
+        if landmarks.index is graph.index:
+            # Landmarks built for this very graph share its word ids.
+            if not landmarks.connected(start_id, goal_id):
+                report(stats, "astar", started)
+                return None
+            bound = landmarks.goal_bound(goal_id)
+            if distances is not None:
+                h = lambda node: max(distances[node], bound(node))
+            else:
+                h = lambda node: max(base(words[node]), bound(node))
+        else:
+            estimate = _landmark_heuristic(landmarks, goal, base)
+            if estimate is None or estimate(start) is None:
+                report(stats, "astar", started)
+                return None
+            h = lambda node: estimate(words[node])
+    closed = bytearray(len(words))
+    parents = array("i", [-1]) * len(words)
+    # Heap entries: (f, -cost, node_id, parent_id); ties on f go to the deeper node.
+    pq = [(h(start_id), 0, start_id, -1)]
+    expanded = pushed = pops = peak = 0
+
+    while pq:
+        if len(pq) > peak:
+            peak = len(pq)
+        f, cost, current, parent = heapq.heappop(pq)
+        pops += 1
+        cost = -cost
+        if closed[current]:
+            continue
+        closed[current] = 1
+        parents[current] = parent
+        expanded += 1
+        if current == goal_id:
+            path = _rebuild_path(graph, parents, goal_id)
+            report(stats, "astar", started, expanded, pushed, peak, pushed + pops, path)
+            return path
+        new_cost = cost + 1
+        for neighbor in targets[offsets[current]:offsets[current + 1]]:
+            if not closed[neighbor]:
+                heapq.heappush(pq, (new_cost + h(neighbor), -new_cost, neighbor, current))
+                pushed += 1
+    report(stats, "astar", started, expanded, pushed, peak, pushed + pops)
+    return None
+
+def _bidirectional_compact(graph, start, goal, stats=None):
+    started = start_timer(stats)
+    ids = _endpoint_ids(graph, start, goal)
+    if ids is None:
+        report(stats, "bidirectional", started)
+        return None
+    start_id, goal_id = ids
+    if start_id == goal_id:
+        report(stats, "bidirectional", started, 1, 0, 1, 0, [start])
+        return [start]
+    offsets, targets = graph.offsets, graph.targets
+    node_count = len(graph.words)
+    # One visited bytearray and parent array per side; side 0 grows from start, side 1 from goal.
+    visited = (bytearray(node_count), bytearray(node_count))
+    parents = (array("i", [-1]) * node_count, array("i", [-1]) * node_count)
+    visited[0][start_id] = 1
+    visited[1][goal_id] = 1
+    frontiers = [[start_id], [goal_id]]
+    expanded = pushed = peak = 0
+
+    while frontiers[0] and frontiers[1]:
+        if len(frontiers[0]) + len(frontiers[1]) > peak:
+            peak = len(frontiers[0]) + len(frontiers[1])
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        seen, other, parent = visited[side], visited[1 - side], parents[side]
+        next_frontier = []
+        for current in frontiers[side]:
+            expanded += 1
+            for neighbor in targets[offsets[current]:offsets[current + 1]]:
+                if seen[neighbor]:
+                    continue
+                seen[neighbor] = 1
+                parent[neighbor] = current
+                pushed += 1
+                if other[neighbor]:
+                    path = _rebuild_path(graph, parents[0], neighbor)
+                    path.extend(reversed(_rebuild_path(graph, parents[1], neighbor)[:-1]))
+                    report(stats, "bidirectional", started, expanded, pushed, peak, 0, path)
+                    return path
+                next_frontier.append(neighbor)
+        frontiers[side] = next_frontier
+    report(stats, "bidirectional", started, expanded, pushed, peak)
+    return None
+
+# ----- All shortest ladders -----
+
+def shortest_path_dag(graph, start, goal, stats=None):
+    """
+    Builds the layered DAG of all shortest paths from start to goal: a BFS from start
+    stops once the goal's layer is reached, then a backward sweep from goal keeps
+    only the edges that go one layer closer to the goal.
+
+    Parameters:
+        graph: a networkx graph or a CompactGraph
+        start: starting word (node)
+        goal: target word (node)
+        stats: optional SearchStats (or dict) receiving the search counters, see instrumentation.py
+
+    Returns:
+        A dict mapping every word on some shortest path to the list of its successors
+        on shortest paths (the goal maps to an empty list), or None if no path exists.
+    """
+    started = start_timer(stats)
+    if start not in graph or goal not in graph:
+        report(stats, "shortest_path_dag", started)
+        return None
+    dist = {start: 0}
+    layer = [start]
+    expanded = peak = 0
+    while layer and goal not in dist:
+        peak = max(peak, len(layer))
+        next_layer = []
+        for current in layer:
+            expanded += 1
+            for neighbor in graph.neighbors(current):
+                if neighbor not in dist:
+                    dist[neighbor] = dist[current] + 1
+                    next_layer.append(neighbor)
+        layer = next_layer
+    if goal not in dist:
+        report(stats, "shortest_path_dag", started, expanded, len(dist) - 1, peak)
+        return None
+
+    successors = {goal: []}
+    layer = [goal]
+    while layer:
+        previous_layer = []
+        for current in layer:
+            before = dist[current] - 1
+            for neighbor in graph.neighbors(current):
+                if dist.get(neighbor) == before:
+                    if neighbor not in successors:
+                        successors[neighbor] = []
+                        previous_layer.append(neighbor)
+                    successors[neighbor].append(current)
+        layer = previous_layer
+    report(stats, "shortest_path_dag", started, expanded, len(dist) - 1, peak,
+           path_length=dist[goal])
+    return successors
+
+def _layers(successors, start):
+    """Returns the words of a shortest path DAG grouped by distance from start."""
+    layers = [[start]]
+    seen = {start}
+    while True:
+        next_layer = []
+        for word in layers[-1]:
+            for successor in successors[word]:
+                if successor not in seen:
+                    seen.add(successor)
+                    next_layer.append(successor)
+        if not next_layer:
+            return layers
+        layers.append(next_layer)
+
+def count_shortest_paths(graph, start, goal):
+    """
+    Counts the shortest ladders from start to goal by dynamic programming over the
+    shortest path DAG, without enumerating them (the count can be astronomically
+    larger than the graph).
+
+    Returns:
+        The number of shortest paths (0 if goal cannot be reached).
+    """
+    successors = shortest_path_dag(graph, start, goal)
+    if successors is None:
+        return 0
+    counts = {goal: 1}
+    for layer in reversed(_layers(successors, start)):
+        for word in layer:
+            if word != goal:
+                counts[word] = sum(counts[successor] for successor in successors[word])
+    return counts[start]
+
+def all_shortest_paths(graph, start, goal):
+    """
+    Yields every shortest ladder from start to goal, one list of words at a time.
+
+    The paths are produced by a depth-first walk of the shortest path DAG, so memory
+    stays proportional to the DAG however many paths there are, and the caller can
+    stop early (e.g. itertools.islice) without paying for the rest.
+    """
+    successors = shortest_path_dag(graph, start, goal)
+    if successors is None:
+        return
+    if start == goal:
+        yield [start]
+        return
+    path = [start]
+    stack = [iter(successors[start])]
+    while stack:
+        word = next(stack[-1], None)
+        if word is None:
+            stack.pop()
+            path.pop()
+            continue
+        path.append(word)
+        if word == goal:
+            yield list(path)
+            path.pop()
+        else:
+            stack.append(iter(successors[word]))
+
+def _bfs_avoiding(graph, start, goal, blocked_nodes, blocked_edges):
+    """BFS from start to goal that never enters blocked_nodes nor follows blocked_edges (pairs)."""
+    parents = {start: None}
+    queue = deque([start])
+    while queue:
+        current = queue.popleft()
+        if current == goal:
+            return _path_from_parents(parents, goal)
         for neighbor in graph.neighbors(current):
-            new_cost = cost + 1  # Uniform cost for each transformation
-            new_f = new_cost + heuristic(neighbor, goal)
-            heapq.heappush(pq, (new_f, new_cost, neighbor, path + [neighbor]))
+            if (neighbor not in parents and neighbor not in blocked_nodes
+                    and (current, neighbor) not in blocked_edges):
+                parents[neighbor] = current
+                queue.append(neighbor)
     return None
 
-def search_path(graph, start, goal, algorithm="bfs"):
+def k_shortest_paths(graph, start, goal, k=None):
+    """
+    Yields loopless ladders from start to goal in order of increasing length (Yen's
+    algorithm), lazily: each next path is only searched for when it is requested.
+
+    Parameters:
+        graph: a networkx graph or a CompactGraph
+        start: starting word (node)
+        goal: target word (node)
+        k: maximum number of paths to yield (None: until no other simple path exists)
+
+    Memory grows with the paths yielded so far and their candidate deviations,
+    i.e. O(k * ladder length), not with the number of possible ladders.
+    """
+    if start not in graph or goal not in graph or k == 0:
+        return
+    first = bfs(graph, start, goal)
+    if first is None:
+        return
+    accepted = [first]
+    yield list(first)
+    candidates = []  # heap of (length, path)
+    known = {tuple(first)}
+    while k is None or len(accepted) < k:
+        last = accepted[-1]
+        for i in range(len(last) - 1):
+            root = last[:i + 1]
+            blocked_edges = {(path[i], path[i + 1]) for path in accepted
+                             if len(path) > i + 1 and path[:i + 1] == root}
+            spur = _bfs_avoiding(graph, last[i], goal, set(root[:-1]), blocked_edges)
+            if spur is not None:
+                candidate = tuple(root[:-1]) + tuple(spur)
+                if candidate not in known:
+                    known.add(candidate)
+                    heapq.heappush(candidates, (len(candidate), candidate))
+        if not candidates:
+            return
+        _, path = heapq.heappop(candidates)
+        accepted.append(list(path))
+        yield list(path)
+
+ALGORITHMS = {
+    "bfs": bfs,
+    "ucs": ucs,
+    "astar": astar,
+    "bidirectional": bidirectional,
+}
+
+def search_path(graph, start, goal, algorithm="bfs", stats=None, landmarks=None):
     """
     Utility function to choose the search algorithm based on a string parameter.
 
     Parameters:
-        graph: a networkx graph
+        graph: a networkx graph or a CompactGraph
         start: starting word (node)
         goal: target word (node)
-        algorithm: one of "bfs", "ucs", or "astar"
+        algorithm: one of "bfs", "ucs", "astar" or "bidirectional"
+        stats: optional SearchStats (or dict) receiving the search counters, see instrumentation.py
+        landmarks: optional LandmarkIndex used by "astar" (ignored by the other algorithms)
+
+    When a DistanceTable is registered for the graph (see distance_table.py), every
+    algorithm is answered from the table by greedy descent instead of a search, and
+    stats reports a "distance_table" operation.
 
     Returns:
         A list of words representing the path, or None if no path is found.
     """
     algorithm = algorithm.lower()
-    if algorithm == "bfs":
-        return bfs(graph, start, goal)
-    elif algorithm == "ucs":
-        return ucs(graph, start, goal)
-    elif algorithm == "astar":
-        return astar(graph, start, goal)
-    else:
-        raise ValueError("Unknown algorithm. Please choose from 'bfs', 'ucs', or 'astar'.")
+    search = ALGORITHMS.get(algorithm)
+    if search is None:
+        raise ValueError("Unknown algorithm. Please choose from 'bfs', 'ucs', 'astar' or 'bidirectional'.")
+    table = table_for(graph)
+    if table is not None:
+        started = start_timer(stats)
+        path = table.path(start, goal)
+        report(stats, "distance_table", started, path=path)
+        return path
+    if algorithm == "astar":
+        return astar(graph, start, goal, stats, landmarks)
+    return search(graph, start, goal, stats)
 
 if __name__ == "__main__":
     # For demonstration: create a simple graph of words of the same length.
@@ -158,3 +734,4 @@ if __name__ == "__main__":
     print("BFS path:", bfs(G, start_word, goal_word))
     print("UCS path:", ucs(G, start_word, goal_word))
     print("A* path:", astar(G, start_word, goal_word))
+    print("Bidirectional path:", bidirectional(G, start_word, goal_word))
@@ -0,0 +1,197 @@
+# src/batch.py
+
+import argparse
+import csv
+import json
+import multiprocessing
+import sys
+import time
+from collections import deque
+from algorithms import search_path
+from cache import CACHE_DIR, get_graph
+from dictionary import load_word_dictionary
+from landmarks import get_landmarks
+
+# Pairs sent to a worker at a time; large enough to amortize the IPC cost.
+CHUNK_SIZE = 2000
+# Chunks in flight per worker. Bounding this keeps memory flat however many pairs
+# are streamed in (Pool.imap would read the whole input ahead of the workers).
+CHUNKS_PER_WORKER = 4
+
+# Graphs by word length, loaded in the parent before the pool starts. With the "fork"
+# start method workers inherit them copy-on-write; otherwise each worker loads them
+# from the memory-mapped cache files in _init_worker (shared pages, no rebuild).
+_GRAPHS = {}
+# Landmark indexes by word length, only filled when astar runs with --landmarks.
+_LANDMARKS = {}
+# Dictionary the two dicts above were loaded from (forked workers inherit them too).
+_SOURCE = None
+
+def read_pairs(stream):
+    """
+    Yields (start, goal) tuples from lines like "start,goal" (a header line
+    "start,goal" and blank lines are skipped). Words are lowercased.
+    """
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        start, _, goal = line.partition(",")
+        start, goal = start.strip().lower(), goal.strip().lower()
+        if (start, goal) == ("start", "goal"):
+            continue
+        yield start, goal
+
+def load_graphs(dictionary_file, lengths, words=None, landmarks=False, cache_dir=CACHE_DIR):
+    """
+    Loads the graph (and optionally the landmark index) of every requested word
+    length through the on-disk cache in cache_dir.
+    """
+    global _SOURCE
+    if _SOURCE != dictionary_file:
+        _GRAPHS.clear()
+        _LANDMARKS.clear()
+        _SOURCE = dictionary_file
+    for length in lengths:
+        if length not in _GRAPHS:
+            _GRAPHS[length] = get_graph(dictionary_file, length, words, cache_dir)
+        if landmarks and length not in _LANDMARKS:
+            _LANDMARKS[length] = get_landmarks(dictionary_file, length, _GRAPHS[length], cache_dir=cache_dir)
+
+def _init_worker(dictionary_file, lengths, landmarks, cache_dir=CACHE_DIR):
+    load_graphs(dictionary_file, lengths, landmarks=landmarks, cache_dir=cache_dir)
+
+def solve_chunk(job):
+    """
+    Solves a chunk of pairs that all have the same word length.
+
+    Parameters:
+        job: (length, algorithm, pairs)
+
+    Returns:
+        A list of (start, goal, path) tuples; path is None if there is no ladder
+        (or a word is not in the dictionary).
+    """
+    length, algorithm, pairs = job
+    graph = _GRAPHS.get(length)
+    landmarks = _LANDMARKS.get(length)
+    results = []
+    for start, goal in pairs:
+        path = None
+        if graph is not None and start in graph and goal in graph:
+            path = search_path(graph, start, goal, algorithm, landmarks=landmarks)
+        results.append((start, goal, path))
+    return results
+
+def make_jobs(pairs, algorithm, chunk_size=CHUNK_SIZE):
+    """
+    Groups a stream of pairs by word length into chunks of at most chunk_size pairs.
+    Pairs of different lengths (no ladder possible) go into chunks of length None.
+    """
+    pending = {}
+    for start, goal in pairs:
+        length = len(start) if len(start) == len(goal) else None
+        bucket = pending.setdefault(length, [])
+        bucket.append((start, goal))
+        if len(bucket) >= chunk_size:
+            yield length, algorithm, bucket
+            pending[length] = []
+    for length, bucket in pending.items():
+        if bucket:
+            yield length, algorithm, bucket
+
+def write_results(results, out, output_format, writer=None):
+    """Writes solved pairs as CSV (start,goal,steps,path) or JSON lines."""
+    for start, goal, path in results:
+        steps = len(path) - 1 if path else -1
+        if output_format == "jsonl":
+            out.write(json.dumps({"start": start, "goal": goal, "steps": steps, "path": path}) + "\n")
+        else:
+            writer.writerow([start, goal, steps, " ".join(path) if path else ""])
+
+def run_batch(pairs, dictionary_file, out, algorithm="bidirectional", output_format="csv",
+              processes=None, chunk_size=CHUNK_SIZE, lengths=None, landmarks=False):
+    """
+    Solves a stream of (start, goal) pairs and writes the results as chunks complete.
+    Pairs are grouped by word length into chunks, so the output is not in input order.
+
+    Parameters:
+        pairs: iterable of (start, goal) tuples
+        dictionary_file: dictionary used to build (or load) the graphs
+        out: writable text stream
+        algorithm: search algorithm name passed to search_path
+        output_format: "csv" or "jsonl"
+        processes: worker count (defaults to the CPU count); 1 solves in this process
+        chunk_size: number of pairs per worker task
+        lengths: word lengths to preload; by default every length of the dictionary
+        landmarks: load (or build) landmark indexes so astar uses the ALT heuristic
+
+    Returns:
+        The number of pairs solved.
+    """
+    words = None
+    if lengths is None:
+        words = load_word_dictionary(dictionary_file)
+        lengths = words.lengths()
+    load_graphs(dictionary_file, lengths, words, landmarks)
+
+    writer = csv.writer(out) if output_format == "csv" else None
+    if writer is not None:
+        writer.writerow(["start", "goal", "steps", "path"])
+    jobs = make_jobs(pairs, algorithm, chunk_size)
+    solved = 0
+    if processes == 1:
+        for job in jobs:
+            results = solve_chunk(job)
+            write_results(results, out, output_format, writer)
+            solved += len(results)
+        return solved
+
+    processes = processes or multiprocessing.cpu_count()
+    with multiprocessing.Pool(processes, initializer=_init_worker,
+                              initargs=(dictionary_file, lengths, landmarks)) as pool:
+        in_flight = deque()
+        for job in jobs:
+            in_flight.append(pool.apply_async(solve_chunk, (job,)))
+            if len(in_flight) >= processes * CHUNKS_PER_WORKER:
+                results = in_flight.popleft().get()
+                write_results(results, out, output_format, writer)
+                solved += len(results)
+        while in_flight:
+            results = in_flight.popleft().get()
+            write_results(results, out, output_format, writer)
+            solved += len(results)
+    return solved
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Solve many word ladder pairs non-interactively.")
+    parser.add_argument("pairs", nargs="?", default="-",
+                        help="file with one 'start,goal' pair per line ('-' for stdin)")
+    parser.add_argument("--dictionary", default="data/oxford_words.txt")
+    parser.add_argument("--algorithm", default="bidirectional")
+    parser.add_argument("--landmarks", action="store_true",
+                        help="use the landmark (ALT) heuristic with --algorithm astar")
+    parser.add_argument("--format", choices=["csv", "jsonl"], default="csv")
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--output", default="-", help="output file ('-' for stdout)")
+    args = parser.parse_args(argv)
+
+    source = sys.stdin if args.pairs == "-" else open(args.pairs, "r")
+    out = sys.stdout if args.output == "-" else open(args.output, "w", newline="")
+    try:
+        begin = time.perf_counter()
+        solved = run_batch(read_pairs(source), args.dictionary, out, args.algorithm,
+                           args.format, args.processes, args.chunk_size,
+                           landmarks=args.landmarks)
+        elapsed = time.perf_counter() - begin
+        print("Solved {} pairs in {:.2f} s ({:.0f} pairs/s)".format(
+            solved, elapsed, solved / max(elapsed, 1e-9)), file=sys.stderr)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if out is not sys.stdout:
+            out.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,570 @@
+# src/benchmark.py
+
+import argparse
+import json
+import os
+import sys
+import time
+import random
+import subprocess
+import tracemalloc
+from collections import defaultdict
+from graph import load_dictionary, build_graph, build_graph_pairwise
+from compact import CompactGraph
+from cache import get_graph
+from algorithms import search_path, ALGORITHMS
+
+DICTIONARY_FILES = ["data/oxford_words.txt", "data/words_alpha.txt"]
+
+# Above this many words the O(n^2) pairwise build takes minutes per length,
+# so it is skipped unless a larger limit is passed on the command line.
+DEFAULT_PAIRWISE_LIMIT = 5000
+
+def group_by_length(words):
+    """
+    Groups a list of words by length.
+
+    Returns:
+        A dict mapping each word length to the list of words of that length.
+    """
+    groups = defaultdict(list)
+    for word in words:
+        groups[len(word)].append(word)
+    return groups
+
+def time_call(func, *args):
+    """
+    Runs func(*args) once and returns (result, elapsed_seconds).
+    """
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+def same_graph(g1, g2):
+    """
+    Returns True if both graphs have the same nodes and the same edges.
+    """
+    if set(g1.nodes) != set(g2.nodes):
+        return False
+    edges1 = {frozenset(edge) for edge in g1.edges}
+    edges2 = {frozenset(edge) for edge in g2.edges}
+    return edges1 == edges2
+
+def benchmark_graph_build(dictionary_file, pairwise_limit=DEFAULT_PAIRWISE_LIMIT):
+    """
+    Compares build_graph_pairwise and build_graph on every word length of a dictionary.
+
+    Parameters:
+        dictionary_file: path of the dictionary to load
+        pairwise_limit: skip the pairwise build for lengths with more words than this
+
+    Returns:
+        A list of dicts, one per word length, with the timings of both builders
+        (pairwise_s is None when skipped) and whether they produced the same graph.
+    """
+    words = load_dictionary(dictionary_file)
+    results = []
+    for length, same_length_words in sorted(group_by_length(words).items()):
+        graph, bucket_time = time_call(build_graph, same_length_words)
+        row = {
+            "dictionary": dictionary_file,
+            "length": length,
+            "words": len(same_length_words),
+            "edges": graph.number_of_edges(),
+            "bucket_s": bucket_time,
+            "pairwise_s": None,
+            "same": None,
+        }
+        if len(same_length_words) <= pairwise_limit:
+            reference, pairwise_time = time_call(build_graph_pairwise, same_length_words)
+            row["pairwise_s"] = pairwise_time
+            row["same"] = same_graph(graph, reference)
+        results.append(row)
+    return results
+
+def print_graph_build_results(results):
+    """
+    Prints the rows returned by benchmark_graph_build as a table.
+    """
+    print("{:<24} {:>3} {:>7} {:>8} {:>10} {:>11} {:>8} {:>5}".format(
+        "dictionary", "len", "words", "edges", "bucket_s", "pairwise_s", "speedup", "same"))
+    for row in results:
+        if row["pairwise_s"] is None:
+            pairwise, speedup, same = "skipped", "-", "-"
+        else:
+            pairwise = "{:.4f}".format(row["pairwise_s"])
+            speedup = "{:.1f}x".format(row["pairwise_s"] / max(row["bucket_s"], 1e-9))
+            same = "yes" if row["same"] else "NO"
+        print("{:<24} {:>3} {:>7} {:>8} {:>10.4f} {:>11} {:>8} {:>5}".format(
+            row["dictionary"].split("/")[-1], row["length"], row["words"], row["edges"],
+            row["bucket_s"], pairwise, speedup, same))
+
+def retained_memory(func, *args):
+    """
+    Runs func(*args) under tracemalloc and returns (result, bytes_still_allocated).
+    """
+    tracemalloc.start()
+    try:
+        result = func(*args)
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, current
+
+def benchmark_backends(dictionary_file, lengths, pair_count=200, algorithm="bfs", seed=0):
+    """
+    Compares the networkx graph and the CompactGraph for some word lengths:
+    memory held by the built graph and time to answer the same seeded random queries.
+
+    Returns:
+        A list of dicts, one per (length, backend).
+    """
+    groups = group_by_length(load_dictionary(dictionary_file))
+    results = []
+    for length in lengths:
+        same_length_words = groups.get(length, [])
+        if len(same_length_words) < 2:
+            continue
+        rng = random.Random(seed)
+        pairs = [tuple(rng.sample(same_length_words, 2)) for _ in range(pair_count)]
+        for backend, builder in (("networkx", build_graph), ("compact", CompactGraph.from_words)):
+            graph, memory = retained_memory(builder, same_length_words)
+            start = time.perf_counter()
+            found = sum(1 for s, g in pairs if search_path(graph, s, g, algorithm) is not None)
+            elapsed = time.perf_counter() - start
+            results.append({
+                "dictionary": dictionary_file,
+                "length": length,
+                "backend": backend,
+                "memory_mb": memory / 2**20,
+                "search_s": elapsed,
+                "queries_per_s": len(pairs) / max(elapsed, 1e-9),
+                "found": found,
+            })
+    return results
+
+def benchmark_expansions(dictionary_file, lengths, pair_count=50, seed=0):
+    """
+    Runs every search algorithm on the same seeded pairs of connected words and
+    reports the total number of expanded nodes and time per algorithm and length.
+
+    Returns:
+        A list of dicts, one per (length, algorithm).
+    """
+    groups = group_by_length(load_dictionary(dictionary_file))
+    results = []
+    for length in lengths:
+        same_length_words = groups.get(length, [])
+        if len(same_length_words) < 2:
+            continue
+        graph = CompactGraph.from_words(same_length_words)
+        rng = random.Random(seed)
+        pairs = []
+        # Keep only pairs that are connected, otherwise every algorithm explores a whole component.
+        for _ in range(pair_count * 100):
+            if len(pairs) == pair_count:
+                break
+            start, goal = rng.sample(same_length_words, 2)
+            if search_path(graph, start, goal, "bidirectional") is not None:
+                pairs.append((start, goal))
+        for algorithm in ALGORITHMS:
+            stats = {}
+            expanded = 0
+            begin = time.perf_counter()
+            for start, goal in pairs:
+                search_path(graph, start, goal, algorithm, stats=stats)
+                expanded += stats["expanded"]
+            results.append({
+                "dictionary": dictionary_file,
+                "length": length,
+                "algorithm": algorithm,
+                "pairs": len(pairs),
+                "expanded": expanded,
+                "search_s": time.perf_counter() - begin,
+            })
+    return results
+
+def benchmark_landmarks(dictionary_file, lengths, pair_count=50, seed=0):
+    """
+    Compares astar with the Hamming heuristic against astar with landmarks (ALT)
+    on the same seeded connected pairs: expanded nodes and search time per length.
+
+    Returns:
+        A list of dicts, one per (length, heuristic).
+    """
+    from landmarks import get_landmarks
+    from components import ComponentIndex
+
+    words = load_dictionary(dictionary_file)
+    groups = group_by_length(words)
+    results = []
+    for length in lengths:
+        if len(groups.get(length, [])) < 2:
+            continue
+        graph = get_graph(dictionary_file, length, words)
+        begin = time.perf_counter()
+        landmarks = get_landmarks(dictionary_file, length, graph)
+        landmark_s = time.perf_counter() - begin
+        components = ComponentIndex(graph)
+        rng = random.Random(seed)
+        pairs = [components.sample_pair(rng) for _ in range(pair_count)]
+        for name, options in (("hamming", {}), ("landmarks", {"landmarks": landmarks})):
+            stats = {}
+            expanded = 0
+            begin = time.perf_counter()
+            for start, goal in pairs:
+                search_path(graph, start, goal, "astar", stats=stats, **options)
+                expanded += stats["expanded"]
+            results.append({
+                "dictionary": dictionary_file,
+                "length": length,
+                "heuristic": name,
+                "pairs": len(pairs),
+                "expanded": expanded,
+                "search_s": time.perf_counter() - begin,
+                "landmark_load_s": landmark_s,
+            })
+    return results
+
+def benchmark_vectorized(dictionary_file, lengths, pair_count=50, seed=0):
+    """
+    Compares the pure-Python and the NumPy (vectorized.py) versions of the graph
+    build and of the astar heuristic on the same words and seeded connected pairs.
+
+    Returns:
+        A list of dicts, one per (length, implementation).
+    """
+    import algorithms
+    import compact
+    from components import ComponentIndex
+    from vectorized import graph_codes
+
+    words = load_dictionary(dictionary_file)
+    groups = group_by_length(words)
+    results = []
+    saved = compact.VECTORIZE_MIN_WORDS, algorithms.VECTORIZE_MIN_WORDS
+    try:
+        for length in lengths:
+            if len(groups.get(length, [])) < 2:
+                continue
+            pairs = None
+            # A threshold above every bucket size turns the NumPy paths off.
+            for name, min_words in (("python", sys.maxsize), ("numpy", 0)):
+                compact.VECTORIZE_MIN_WORDS = algorithms.VECTORIZE_MIN_WORDS = min_words
+                graph, build_s = time_call(CompactGraph.from_words, groups[length])
+                if pairs is None:
+                    components = ComponentIndex(graph)
+                    rng = random.Random(seed)
+                    pairs = [components.sample_pair(rng) for _ in range(pair_count)]
+                # The letter codes are computed once per graph; timed apart from the searches.
+                encode_s = time_call(graph_codes, graph)[1] if name == "numpy" else 0.0
+                begin = time.perf_counter()
+                for start, goal in pairs:
+                    search_path(graph, start, goal, "astar")
+                results.append({
+                    "dictionary": dictionary_file,
+                    "length": length,
+                    "implementation": name,
+                    "words": graph.number_of_nodes(),
+                    "build_s": build_s,
+                    "encode_s": encode_s,
+                    "pairs": len(pairs),
+                    "astar_s": time.perf_counter() - begin,
+                })
+    finally:
+        compact.VECTORIZE_MIN_WORDS, algorithms.VECTORIZE_MIN_WORDS = saved
+    return results
+
+# ----- Import time -----
+
+# Cold start budget of "import main" (interpreter startup excluded), in milliseconds.
+IMPORT_TIME_TARGET_MS = 50
+# Modules that must not be loaded just by importing an entry point.
+HEAVY_MODULES = ("networkx", "numpy", "pygame", "matplotlib", "multiprocessing")
+
+def measure_import(module, runs=5):
+    """
+    Imports module in fresh interpreters (python -X importtime) and reports its
+    cumulative import time and which HEAVY_MODULES it pulled in.
+
+    A first, untimed run lets Python write the bytecode cache, so the timings are
+    those of an installed program rather than of compiling every file.
+
+    Returns:
+        dict with module, runs, median_ms, min_ms and heavy_modules.
+    """
+    src_dir = os.path.dirname(os.path.abspath(__file__))
+    code = ("import sys; sys.path.insert(0, {!r}); import {}; "
+            "print(' '.join(m for m in {!r} if m in sys.modules))").format(src_dir, module, HEAVY_MODULES)
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    timings = []
+    heavy = []
+    for run in range(runs + 1):
+        completed = subprocess.run([sys.executable, "-X", "importtime", "-c", code], env=env,
+                                   capture_output=True, text=True, check=True)
+        heavy = completed.stdout.split()
+        # Lines look like "import time:  self [us] | cumulative | name"; the entry
+        # point is the unindented line with its name.
+        for line in completed.stderr.splitlines():
+            fields = line.split("|")
+            if len(fields) == 3 and fields[2].rstrip() == " " + module:
+                if run > 0:
+                    timings.append(int(fields[1]) / 1000)
+                break
+    timings.sort()
+    return {"module": module, "runs": runs, "median_ms": timings[len(timings) // 2],
+            "min_ms": timings[0], "heavy_modules": heavy}
+
+# ----- Benchmark suite -----
+# Each case records wall time, nodes expanded (searches only) and peak traced memory.
+# Timings are taken in an untraced pass and memory in a second, traced pass, because
+# tracemalloc slows Python code down several times.
+
+SUITE_ALGORITHMS = ["bfs", "ucs", "astar", "bidirectional"]
+DIFFICULTIES = ["easy", "medium", "hard"]
+# Default relative slowdown (0.5 = 50%) tolerated before a case counts as a regression.
+DEFAULT_TOLERANCE = 0.5
+# Timing differences below this many seconds are treated as noise.
+MIN_TIME_DELTA = 0.005
+
+def measure(func, repeat=1):
+    """
+    Runs func() `repeat` times untraced, then once under tracemalloc.
+
+    Returns:
+        (result, wall_seconds_per_run, peak_bytes)
+    """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    wall = (time.perf_counter() - start) / repeat
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, wall, peak
+
+def measure_cold(func, reset):
+    """
+    Like measure(func) for a first call: reset() (which drops whatever func caches)
+    runs before the timed call and again before the traced one.
+
+    Returns:
+        (result, wall_seconds, peak_bytes)
+    """
+    reset()
+    result, wall = time_call(func)
+    reset()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, wall, peak
+
+def _case(dictionary_file, length, name, wall, peak, expanded=None, **extra):
+    row = {
+        "dictionary": os.path.basename(dictionary_file),
+        "length": length,
+        "case": name,
+        "wall_s": round(wall, 6),
+        "peak_bytes": peak,
+        "expanded": expanded,
+    }
+    row.update(extra)
+    return row
+
+def run_suite(dictionary_files=DICTIONARY_FILES, lengths=None, pair_count=10, seed=0,
+              algorithms=SUITE_ALGORITHMS):
+    """
+    Benchmarks load_dictionary, build_graph, select_valid_word_pair and every search
+    algorithm for each word length of each dictionary. Search workloads are seeded
+    pairs of connected words, so the expanded-node counts are reproducible.
+
+    Parameters:
+        dictionary_files: dictionaries to benchmark
+        lengths: word lengths to benchmark (default: every length with at least 2 words)
+        pair_count: number of (start, goal) pairs per length
+        seed: seed of the pair workloads
+        algorithms: search algorithm names
+
+    Returns:
+        A list of case dicts (see _case), ready to be dumped as JSON.
+    """
+    import utils
+    from components import ComponentIndex
+    from utils import select_valid_word_pair
+
+    def drop_length_indexes():
+        utils._LENGTH_INDEXES.clear()
+        utils._DISTANCE_INDEXES.clear()
+
+    results = []
+    for dictionary_file in dictionary_files:
+        words, wall, peak = measure(lambda: load_dictionary(dictionary_file))
+        results.append(_case(dictionary_file, None, "load_dictionary", wall, peak, words=len(words)))
+
+        for difficulty in DIFFICULTIES:
+            rng = random.Random(seed)
+            # The first call builds the per-length graph and component index ("cold");
+            # the 100 timed draws after it reuse them.
+            _, wall, peak = measure_cold(lambda: select_valid_word_pair(words, difficulty, rng=rng),
+                                         drop_length_indexes)
+            results.append(_case(dictionary_file, None, "select_valid_word_pair:" + difficulty + ":cold",
+                                 wall, peak))
+            _, wall, peak = measure(lambda: select_valid_word_pair(words, difficulty, rng=rng), repeat=100)
+            results.append(_case(dictionary_file, None, "select_valid_word_pair:" + difficulty, wall, peak))
+
+        groups = group_by_length(words)
+        for length in sorted(groups):
+            same_length_words = groups[length]
+            if (lengths is not None and length not in lengths) or len(same_length_words) < 2:
+                continue
+            graph, wall, peak = measure(lambda: build_graph(same_length_words))
+            results.append(_case(dictionary_file, length, "build_graph", wall, peak,
+                                 words=len(same_length_words), edges=graph.number_of_edges()))
+
+            components = ComponentIndex(graph)
+            if not components.eligible:
+                continue
+            rng = random.Random(seed)
+            pairs = [components.sample_pair(rng) for _ in range(pair_count)]
+            for algorithm in algorithms:
+                def run_pairs():
+                    stats, expanded, steps = {}, 0, 0
+                    for start, goal in pairs:
+                        path = search_path(graph, start, goal, algorithm, stats=stats)
+                        expanded += stats["expanded"]
+                        steps += len(path) - 1
+                    return expanded, steps
+                (expanded, steps), wall, peak = measure(run_pairs)
+                results.append(_case(dictionary_file, length, "search:" + algorithm, wall, peak,
+                                     expanded=expanded, pairs=len(pairs), steps=steps))
+    return results
+
+def _case_key(row):
+    return (row["dictionary"], row["length"], row["case"])
+
+def compare_to_baseline(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    Compares suite results with a saved baseline (same format).
+
+    A case regresses when its wall time or peak memory grows by more than `tolerance`
+    (relative; tiny timing differences are ignored), when it expands more nodes, or
+    when a search finds longer ladders than before.
+
+    Returns:
+        A list of human-readable regression descriptions (empty if none).
+    """
+    previous = {_case_key(row): row for row in baseline}
+    regressions = []
+    for row in results:
+        old = previous.get(_case_key(row))
+        if old is None:
+            continue
+        name = "{} len={} {}".format(*_case_key(row))
+        if row["wall_s"] > old["wall_s"] * (1 + tolerance) and row["wall_s"] - old["wall_s"] > MIN_TIME_DELTA:
+            regressions.append("{}: wall time {:.4f}s -> {:.4f}s".format(name, old["wall_s"], row["wall_s"]))
+        if row["peak_bytes"] > old["peak_bytes"] * (1 + tolerance) and row["peak_bytes"] - old["peak_bytes"] > 2**16:
+            regressions.append("{}: peak memory {} -> {} bytes".format(name, old["peak_bytes"], row["peak_bytes"]))
+        if row.get("expanded") is not None and old.get("expanded") is not None and row["expanded"] > old["expanded"]:
+            regressions.append("{}: expanded {} -> {}".format(name, old["expanded"], row["expanded"]))
+        if row.get("steps") is not None and old.get("steps") is not None and row["steps"] != old["steps"]:
+            regressions.append("{}: total ladder length {} -> {}".format(name, old["steps"], row["steps"]))
+    return regressions
+
+def suite_main(args):
+    """Runs the suite from parsed command-line arguments; returns the process exit code."""
+    results = run_suite(args.dictionaries, args.lengths, args.pairs, args.seed)
+    document = {"seed": args.seed, "pairs": args.pairs, "python": sys.version.split()[0], "results": results}
+    output = json.dumps(document, indent=1)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+    if args.save_baseline:
+        with open(args.baseline, "w") as file:
+            file.write(output + "\n")
+        print("Baseline saved to " + args.baseline, file=sys.stderr)
+        return 0
+    if args.baseline and os.path.exists(args.baseline):
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        if (baseline.get("seed"), baseline.get("pairs")) != (args.seed, args.pairs):
+            print("Baseline was recorded with another seed or pair count; not comparing.", file=sys.stderr)
+            return 0
+        regressions = compare_to_baseline(results, baseline["results"], args.tolerance)
+        for regression in regressions:
+            print("REGRESSION " + regression, file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Word ladder benchmarks.")
+    commands = parser.add_subparsers(dest="command")
+
+    build = commands.add_parser("build", help="bucket vs pairwise build_graph on every length (default)")
+    build.add_argument("pairwise_limit", nargs="?", type=int, default=DEFAULT_PAIRWISE_LIMIT)
+    for name, default_lengths, help_text in (
+            ("backends", [4, 5, 6], "networkx vs CompactGraph memory and query throughput"),
+            ("expansions", [6, 7, 8], "expanded nodes of every search algorithm"),
+            ("landmarks", [7, 8, 9], "astar expansions with and without landmarks"),
+            ("vectorized", [5, 8, 12], "pure-Python vs NumPy graph build and astar heuristic")):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument("lengths", nargs="*", type=int, default=default_lengths)
+
+    imports = commands.add_parser("imports", help="cold import time of the entry points")
+    imports.add_argument("modules", nargs="*", default=["main", "game", "server"])
+    imports.add_argument("--runs", type=int, default=5)
+    imports.add_argument("--target-ms", type=float, default=IMPORT_TIME_TARGET_MS,
+                         help="fail if main takes longer than this to import")
+
+    suite = commands.add_parser("suite", help="full JSON benchmark suite with baseline comparison")
+    suite.add_argument("--dictionaries", nargs="+", default=DICTIONARY_FILES)
+    suite.add_argument("--lengths", nargs="+", type=int, default=None)
+    suite.add_argument("--pairs", type=int, default=10, help="seeded pairs per length")
+    suite.add_argument("--seed", type=int, default=0)
+    suite.add_argument("--output", help="write the JSON results here instead of stdout")
+    suite.add_argument("--baseline", default="benchmark_baseline.json")
+    suite.add_argument("--save-baseline", action="store_true", help="store these results as the new baseline")
+    suite.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args()
+
+    if args.command == "suite":
+        sys.exit(suite_main(args))
+    elif args.command == "imports":
+        failed = False
+        for module in args.modules:
+            row = measure_import(module, args.runs)
+            print("{module:<12} median {median_ms:7.1f} ms  min {min_ms:7.1f} ms  heavy: {heavy}".format(
+                heavy=", ".join(row["heavy_modules"]) or "none", **row))
+            if module == "main" and (row["median_ms"] > args.target_ms or row["heavy_modules"]):
+                print("main exceeds the cold start target of {} ms or loads heavy modules".format(
+                    args.target_ms), file=sys.stderr)
+                failed = True
+        sys.exit(1 if failed else 0)
+    elif args.command == "landmarks":
+        for row in benchmark_landmarks("data/words_alpha.txt", args.lengths):
+            print("len {length:>2} {heuristic:<10} {pairs:>3} pairs  {expanded:>9} expanded  "
+                  "{search_s:8.3f} s  (landmarks ready in {landmark_load_s:.3f} s)".format(**row))
+    elif args.command == "vectorized":
+        for row in benchmark_vectorized("data/words_alpha.txt", args.lengths):
+            print("len {length:>2} {implementation:<7} {words:>6} words  build {build_s:7.3f} s  "
+                  "encode {encode_s:6.3f} s  astar {pairs} pairs {astar_s:7.3f} s".format(**row))
+    elif args.command == "expansions":
+        for row in benchmark_expansions("data/words_alpha.txt", args.lengths):
+            print("len {length:>2} {algorithm:<14} {pairs:>3} pairs  {expanded:>9} expanded  "
+                  "{search_s:8.3f} s".format(**row))
+    elif args.command == "backends":
+        for row in benchmark_backends("data/words_alpha.txt", args.lengths):
+            print("len {length:>2} {backend:<9} memory {memory_mb:8.2f} MB  "
+                  "{queries_per_s:8.1f} queries/s  ({found} found)".format(**row))
+    else:
+        limit = args.pairwise_limit if args.command == "build" else DEFAULT_PAIRWISE_LIMIT
+        for dictionary_file in DICTIONARY_FILES:
+            print_graph_build_results(benchmark_graph_build(dictionary_file, limit))
@@ -0,0 +1,169 @@
+# src/cache.py
+
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from array import array
+from compact import CompactGraph
+from dictionary import WordDictionary, load_word_dictionary
+
+# Directory holding the cached graphs (relative to the project root, like data/*.txt).
+CACHE_DIR = "data/cache"
+
+# File layout:
+#   header (little-endian): magic, format version, byte order flag of the arrays,
+#                           node count, target count, words blob size
+#   words blob: UTF-8 words joined by "\n", padded to a multiple of 4 bytes
+#   offsets: int32[node_count + 1]
+#   targets: int32[target_count]
+MAGIC = b"WLGC"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sIIIII")
+BYTE_ORDER = 0 if sys.byteorder == "little" else 1
+
+# (absolute path, modification time, size) -> digest, like dictionary._LOADED
+_DIGESTS = {}
+
+def dictionary_hash(file_path):
+    """
+    Returns the SHA-256 hex digest of a dictionary file's content.
+    Any edit to the dictionary changes the digest and so the cache file names.
+    The digest is kept for the process, so later calls for an unchanged file
+    only cost a stat.
+    """
+    status = os.stat(file_path)
+    key = (os.path.abspath(file_path), status.st_mtime_ns, status.st_size)
+    digest = _DIGESTS.get(key)
+    if digest is None:
+        sha = hashlib.sha256()
+        with open(file_path, "rb") as file:
+            for chunk in iter(lambda: file.read(1 << 20), b""):
+                sha.update(chunk)
+        digest = _DIGESTS[key] = sha.hexdigest()
+    return digest
+
+def cache_path(digest, length, cache_dir=CACHE_DIR):
+    """
+    Returns the cache file path for the graph of one word length of a dictionary.
+    """
+    return os.path.join(cache_dir, "{}-{}.graph".format(digest[:32], length))
+
+def _padding(size):
+    return (-size) % 4
+
+def save_graph(graph, path):
+    """
+    Serializes a CompactGraph into a binary file.
+    The file is written next to its final location and then renamed, so readers
+    never see a partially written cache file.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    blob = "\n".join(graph.words).encode("utf-8")
+    offsets = array("i", graph.offsets)
+    targets = array("i", graph.targets)
+    tmp_path = "{}.{}.tmp".format(path, os.getpid())
+    with open(tmp_path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, FORMAT_VERSION, BYTE_ORDER,
+                               len(graph.words), len(targets), len(blob)))
+        file.write(blob)
+        file.write(b"\0" * _padding(len(blob)))
+        file.write(offsets.tobytes())
+        file.write(targets.tobytes())
+    os.replace(tmp_path, path)
+
+def load_graph(path):
+    """
+    Memory-maps a cached graph file and returns it as a CompactGraph.
+    The offsets and targets arrays are views on the mapped file, so they are
+    not copied into memory; only the word list is decoded.
+
+    Returns:
+        A CompactGraph, or None if the file is missing, truncated or was written
+        by another format version or byte order.
+    """
+    try:
+        with open(path, "rb") as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    if len(mapped) < HEADER.size:
+        return None
+    magic, version, byte_order, node_count, target_count, blob_size = HEADER.unpack_from(mapped)
+    if magic != MAGIC or version != FORMAT_VERSION or byte_order != BYTE_ORDER:
+        return None
+    offsets_start = HEADER.size + blob_size + _padding(blob_size)
+    targets_start = offsets_start + 4 * (node_count + 1)
+    end = targets_start + 4 * target_count
+    if len(mapped) != end:
+        return None
+
+    view = memoryview(mapped)
+    blob = view[HEADER.size:HEADER.size + blob_size]
+    words = bytes(blob).decode("utf-8").split("\n") if node_count else []
+    offsets = view[offsets_start:targets_start].cast("i")
+    targets = view[targets_start:end].cast("i")
+    return CompactGraph(words, offsets, targets)
+
+def get_graph(dictionary_file, length, words=None, cache_dir=CACHE_DIR):
+    """
+    Returns the graph of all words of a given length in a dictionary, loading it
+    from the on-disk cache when possible and building (then caching) it otherwise.
+
+    Parameters:
+        dictionary_file: path of the dictionary file (its content hash keys the cache)
+        length: word length of the graph
+        words: the already loaded dictionary, to avoid reading it again on a cache miss
+        cache_dir: directory holding the cache files
+
+    Returns:
+        A CompactGraph.
+    """
+    path = cache_path(dictionary_hash(dictionary_file), length, cache_dir)
+    graph = load_graph(path)
+    if graph is None:
+        if words is None:
+            words = load_word_dictionary(dictionary_file)
+        if isinstance(words, WordDictionary):
+            same_length_words = words.bucket(length)
+        else:
+            same_length_words = [word for word in words if len(word) == length]
+        graph = CompactGraph.from_words(same_length_words)
+        try:
+            save_graph(graph, path)
+        except OSError as e:
+            print("Warning: could not write graph cache {}: {}".format(path, e))
+    return graph
+
+# Cache file "length" of the combined graph of all lengths with insert / delete moves.
+VARIABLE_LENGTH = "all"
+
+def get_variable_length_graph(dictionary_file, words=None, cache_dir=CACHE_DIR):
+    """
+    Returns the graph of every word of a dictionary with substitution, insertion and
+    deletion moves (see CompactGraph.from_words), through the on-disk cache like get_graph.
+    """
+    path = cache_path(dictionary_hash(dictionary_file), VARIABLE_LENGTH, cache_dir)
+    graph = load_graph(path)
+    if graph is not None:
+        graph.graph["variable_length"] = True
+        return graph
+    if words is None:
+        words = load_word_dictionary(dictionary_file)
+    graph = CompactGraph.from_words(words, variable_length=True)
+    try:
+        save_graph(graph, path)
+    except OSError as e:
+        print("Warning: could not write graph cache {}: {}".format(path, e))
+    return graph
+
+if __name__ == "__main__":
+    # Pre-build the cache for every word length of a dictionary:
+    #   python src/cache.py [dictionary_file]
+    dictionary_file = sys.argv[1] if len(sys.argv) > 1 else "data/oxford_words.txt"
+    words = load_word_dictionary(dictionary_file)
+    for length in words.lengths():
+        graph = get_graph(dictionary_file, length, words)
+        print("length {}: {} nodes, {} edges".format(
+            length, graph.number_of_nodes(), graph.number_of_edges()))
@@ -0,0 +1,152 @@
+# src/compact.py
+
+from array import array
+from graph import build_pattern_buckets, insert_delete_edges
+
+# Word lists at least this large are handled with NumPy (see vectorized.py) when it
+# is installed: the graph build here and the A* heuristic in algorithms.py.
+VECTORIZE_MIN_WORDS = 2048
+
+class CompactGraph:
+    """
+    Read-only word graph stored in CSR (compressed sparse row) form.
+
+    Words are interned to integer ids 0..n-1 (in the order given). The neighbors
+    of word id i are targets[offsets[i]:offsets[i + 1]], stored as flat int32
+    arrays instead of the dict-of-dicts used by networkx.
+
+    The class mirrors the small part of the networkx API the game uses
+    (neighbors, graph[word], number_of_nodes, ...), so it can be passed
+    anywhere a networkx graph of words is expected by the search algorithms.
+    """
+
+    __slots__ = ("words", "index", "offsets", "targets", "graph", "__weakref__")
+
+    def __init__(self, words, offsets, targets, graph=None):
+        """
+        Parameters:
+            words: sequence of words; the position of a word is its id
+            offsets: int array of length len(words) + 1
+            targets: int array holding the neighbor ids of every word
+            graph: graph attributes, like networkx's G.graph (e.g. "variable_length")
+        """
+        self.words = words
+        self.index = {word: i for i, word in enumerate(words)}
+        self.offsets = offsets
+        self.targets = targets
+        self.graph = graph if graph is not None else {}
+
+    @classmethod
+    def from_adjacency(cls, words, adjacency, graph=None):
+        """
+        Builds a CompactGraph from a list of neighbor-id lists (one per word).
+        """
+        offsets = array("i", [0])
+        targets = array("i")
+        for neighbor_ids in adjacency:
+            targets.extend(sorted(neighbor_ids))
+            offsets.append(len(targets))
+        return cls(words, offsets, targets, graph)
+
+    @classmethod
+    def from_words(cls, words, variable_length=False):
+        """
+        Builds the one-letter-difference graph of a word list directly from the
+        wildcard pattern buckets, without going through networkx.
+
+        With variable_length=True, words of all lengths go into one graph and letter
+        insertions / deletions are edges too (see graph.build_variable_length_graph).
+        """
+        words = list(dict.fromkeys(words))  # drop duplicates, keep order
+        if not variable_length and len(words) >= VECTORIZE_MIN_WORDS:
+            try:
+                from vectorized import build_compact_graph
+            except ImportError:
+                pass  # numpy is not installed
+            else:
+                return build_compact_graph(words)
+        index = {word: i for i, word in enumerate(words)}
+        adjacency = [[] for _ in words]
+        # Patterns of different lengths never match, so the buckets are built one
+        # length at a time and only the largest length's buckets are ever in memory.
+        by_length = {}
+        for word in words:
+            by_length.setdefault(len(word), []).append(word)
+        for group in by_length.values():
+            for bucket in build_pattern_buckets(group).values():
+                if len(bucket) < 2:
+                    continue
+                ids = [index[word] for word in bucket]
+                for i in ids:
+                    neighbor_ids = adjacency[i]
+                    for j in ids:
+                        if i != j:
+                            neighbor_ids.append(j)
+        if not variable_length:
+            return cls.from_adjacency(words, adjacency)
+        for longer, shorter in insert_delete_edges(words):
+            adjacency[index[longer]].append(index[shorter])
+            adjacency[index[shorter]].append(index[longer])
+        return cls.from_adjacency(words, adjacency, {"variable_length": True})
+
+    @classmethod
+    def from_networkx(cls, graph):
+        """
+        Converts a networkx graph of words into a CompactGraph.
+        """
+        words = list(graph.nodes)
+        index = {word: i for i, word in enumerate(words)}
+        adjacency = [[index[neighbor] for neighbor in graph.neighbors(word)] for word in words]
+        return cls.from_adjacency(words, adjacency, dict(graph.graph))
+
+    # ----- id based access (used by the search algorithms) -----
+
+    def id_of(self, word):
+        """Returns the integer id of a word, or None if it is not in the graph."""
+        return self.index.get(word)
+
+    def neighbor_ids(self, node_id):
+        """Returns the neighbor ids of a word id as a slice of the targets array."""
+        return self.targets[self.offsets[node_id]:self.offsets[node_id + 1]]
+
+    def nbytes(self):
+        """Approximate size of the CSR arrays in bytes (words and index excluded)."""
+        return (len(self.offsets) * self.offsets.itemsize
+                + len(self.targets) * self.targets.itemsize)
+
+    # ----- networkx-compatible API -----
+
+    def neighbors(self, word):
+        """Iterates over the neighboring words of a word."""
+        words = self.words
+        return (words[j] for j in self.neighbor_ids(self.index[word]))
+
+    def degree(self, word):
+        node_id = self.index[word]
+        return self.offsets[node_id + 1] - self.offsets[node_id]
+
+    def has_node(self, word):
+        return word in self.index
+
+    def number_of_nodes(self):
+        return len(self.words)
+
+    def number_of_edges(self):
+        return len(self.targets) // 2
+
+    @property
+    def nodes(self):
+        return self.words
+
+    def __getitem__(self, word):
+        """Returns the set of neighboring words, so `other in graph[word]` works."""
+        return set(self.neighbors(word))
+
+    def __contains__(self, word):
+        return word in self.index
+
+    def __iter__(self):
+        return iter(self.words)
+
+    def __len__(self):
+        return len(self.words)
@@ -0,0 +1,271 @@
+# src/components.py
+
+import random
+from array import array
+from collections import deque
+from compact import CompactGraph
+
+class ComponentIndex:
+    """
+    Connected components of a word graph, computed once.
+
+    Every word gets an integer id (its position in self.words). For each id we
+    keep the component it belongs to and its position inside that component's
+    member list, so a start/goal pair that is guaranteed to be connected can be
+    sampled in O(1) without running any search.
+    """
+
+    def __init__(self, graph):
+        """
+        Parameters:
+            graph: a networkx graph or a CompactGraph of words
+        """
+        if isinstance(graph, CompactGraph):
+            self.words = graph.words
+            self.index = graph.index
+            neighbor_ids = graph.neighbor_ids
+        else:
+            self.words = list(graph.nodes)
+            self.index = {word: i for i, word in enumerate(self.words)}
+            index, words = self.index, self.words
+            neighbor_ids = lambda i: [index[neighbor] for neighbor in graph.neighbors(words[i])]
+
+        node_count = len(self.words)
+        self.component_of = array("i", [-1]) * node_count
+        self.position = array("i", [0]) * node_count
+        self.members = []
+        for root in range(node_count):
+            if self.component_of[root] != -1:
+                continue
+            component_id = len(self.members)
+            members = array("i", [root])
+            self.component_of[root] = component_id
+            queue = deque([root])
+            while queue:
+                current = queue.popleft()
+                for neighbor in neighbor_ids(current):
+                    if self.component_of[neighbor] == -1:
+                        self.component_of[neighbor] = component_id
+                        self.position[neighbor] = len(members)
+                        members.append(neighbor)
+                        queue.append(neighbor)
+            self.members.append(members)
+
+        # Words that have at least one other word in their component can start a puzzle.
+        self.eligible = array("i", [i for i in range(node_count)
+                                    if len(self.members[self.component_of[i]]) > 1])
+
+    def component_id(self, word):
+        """Returns the component id of a word (KeyError if the word is not in the graph)."""
+        return self.component_of[self.index[word]]
+
+    def component_size(self, word):
+        """Returns the number of words in the component of a word."""
+        return len(self.members[self.component_id(word)])
+
+    def component_words(self, component_id):
+        """Returns the words of a component."""
+        return [self.words[i] for i in self.members[component_id]]
+
+    def connected(self, word1, word2):
+        """Returns True if a ladder exists between the two words."""
+        if word1 not in self.index or word2 not in self.index:
+            return False
+        return self.component_id(word1) == self.component_id(word2)
+
+    def number_of_components(self):
+        return len(self.members)
+
+    def sample_pair(self, rng=random):
+        """
+        Picks a random start word among the words that belong to a component with at
+        least two words, then a different random goal word from the same component.
+
+        Parameters:
+            rng: a random.Random instance (defaults to the random module)
+
+        Returns:
+            A (start_word, goal_word) tuple.
+
+        Raises:
+            ValueError: If no two words of the graph are connected.
+        """
+        if not self.eligible:
+            raise ValueError("No two words of this length are connected by a ladder.")
+        start = self.eligible[rng.randrange(len(self.eligible))]
+        members = self.members[self.component_of[start]]
+        # Draw from every member except the start word itself.
+        j = rng.randrange(len(members) - 1)
+        if j >= self.position[start]:
+            j += 1
+        return self.words[start], self.words[members[j]]
+
+class DynamicComponents:
+    """
+    Connected components of a graph whose words change at runtime (see wordgraph.py).
+
+    Adding a word merges the components of its neighbors into the largest one, so
+    only the smaller components are relabelled. Removing a word cannot merge
+    anything, but it may split its component; that component is only marked for a
+    split, and the split (a BFS of that component alone) is done when it is next
+    queried. Offers the query methods of ComponentIndex.
+    """
+
+    # Random draws before sample_pair falls back to scanning for an eligible word.
+    SAMPLE_ATTEMPTS = 64
+
+    def __init__(self, graph):
+        """
+        Parameters:
+            graph: a networkx graph of words; it must call added() and removed()
+                on every change (WordGraph does)
+        """
+        self.graph = graph
+        self.component_of = {}
+        self.members = {}   # component id -> list of words
+        self.position = {}  # word -> position in its component's member list
+        self._dirty = set()
+        self._next_id = 0
+        # Every word, for uniform sampling with O(1) removal.
+        self._words = []
+        self._word_position = {}
+        for word in graph:
+            self._add_word(word)
+            if word not in self.component_of:
+                self._label(self._bfs(word))
+
+    def _add_word(self, word):
+        self._word_position[word] = len(self._words)
+        self._words.append(word)
+
+    def _discard(self, items, positions, item):
+        """Removes item from a list in O(1) by moving the last item into its slot."""
+        i = positions.pop(item)
+        last = items.pop()
+        if i < len(items):
+            items[i] = last
+            positions[last] = i
+
+    def _bfs(self, root, allowed=None):
+        seen = {root}
+        queue = deque([root])
+        while queue:
+            current = queue.popleft()
+            for neighbor in self.graph.neighbors(current):
+                if neighbor not in seen and (allowed is None or neighbor in allowed):
+                    seen.add(neighbor)
+                    queue.append(neighbor)
+        return seen
+
+    def _label(self, words, component_id=None):
+        if component_id is None:
+            component_id = self._next_id
+            self._next_id += 1
+        members = list(words)
+        self.members[component_id] = members
+        for i, word in enumerate(members):
+            self.component_of[word] = component_id
+            self.position[word] = i
+        return component_id
+
+    def _resolve(self, component_id):
+        """Splits a component marked by removed() into its actual components."""
+        if component_id not in self._dirty:
+            return
+        self._dirty.discard(component_id)
+        remaining = set(self.members[component_id])
+        first = True
+        while remaining:
+            part = self._bfs(next(iter(remaining)), remaining)
+            remaining -= part
+            self._label(part, component_id if first else None)
+            first = False
+
+    def added(self, word):
+        """Updates the components after word was inserted with its edges."""
+        self._add_word(word)
+        merged = {self.component_of[neighbor] for neighbor in self.graph.neighbors(word)}
+        if not merged:
+            self._label([word])
+            return
+        target = max(merged, key=lambda c: len(self.members[c]))
+        members = self.members[target]
+        for component_id in merged - {target}:
+            for member in self.members.pop(component_id):
+                self.component_of[member] = target
+                self.position[member] = len(members)
+                members.append(member)
+            if component_id in self._dirty:
+                self._dirty.discard(component_id)
+                self._dirty.add(target)
+        self.component_of[word] = target
+        self.position[word] = len(members)
+        members.append(word)
+
+    def removed(self, word, degree):
+        """
+        Updates the components after word was deleted.
+
+        Parameters:
+            degree: number of neighbors the word had; a word with at most one
+                neighbor cannot have held its component together
+        """
+        self._discard(self._words, self._word_position, word)
+        component_id = self.component_of.pop(word)
+        members = self.members[component_id]
+        self._discard(members, self.position, word)
+        if not members:
+            del self.members[component_id]
+            self._dirty.discard(component_id)
+        elif degree > 1:
+            self._dirty.add(component_id)
+
+    def component_id(self, word):
+        """Returns the component id of a word (KeyError if the word is not in the graph)."""
+        component_id = self.component_of[word]
+        if component_id in self._dirty:
+            self._resolve(component_id)
+            component_id = self.component_of[word]
+        return component_id
+
+    def component_size(self, word):
+        return len(self.members[self.component_id(word)])
+
+    def component_words(self, component_id):
+        self._resolve(component_id)
+        return list(self.members[component_id])
+
+    def connected(self, word1, word2):
+        if word1 not in self.component_of or word2 not in self.component_of:
+            return False
+        return self.component_id(word1) == self.component_id(word2)
+
+    def number_of_components(self):
+        for component_id in list(self._dirty):
+            self._resolve(component_id)
+        return len(self.members)
+
+    def sample_pair(self, rng=random):
+        """
+        Same contract as ComponentIndex.sample_pair: a random start word from a
+        component of at least two words and a different goal word from it.
+
+        Raises:
+            ValueError: If no two words of the graph are connected.
+        """
+        start = None
+        for _ in range(self.SAMPLE_ATTEMPTS if self._words else 0):
+            word = self._words[rng.randrange(len(self._words))]
+            if self.component_size(word) > 1:
+                start = word
+                break
+        if start is None:
+            eligible = [word for word in self._words if self.component_size(word) > 1]
+            if not eligible:
+                raise ValueError("No two words of this length are connected by a ladder.")
+            start = eligible[rng.randrange(len(eligible))]
+        members = self.members[self.component_of[start]]
+        j = rng.randrange(len(members) - 1)
+        if j >= self.position[start]:
+            j += 1
+        return start, members[j]
@@ -0,0 +1,140 @@
+# src/dictionary.py
+
+import os
+import random
+from collections.abc import Sequence
+from packed import is_packed_file, open_packed
+
+class WordBucket(Sequence):
+    """
+    The words of one length: a sorted tuple for indexing, slicing and random sampling,
+    plus a frozenset so `word in bucket` is O(1) instead of a list scan.
+    """
+
+    __slots__ = ("words", "_members")
+
+    def __init__(self, words):
+        self.words = tuple(sorted(words))
+        self._members = frozenset(self.words)
+
+    def __contains__(self, word):
+        return word in self._members
+
+    def __getitem__(self, i):
+        return self.words[i]
+
+    def __len__(self):
+        return len(self.words)
+
+    def __iter__(self):
+        return iter(self.words)
+
+    def __repr__(self):
+        return "WordBucket({} words)".format(len(self.words))
+
+class WordDictionary:
+    """
+    A word list loaded once and partitioned by word length.
+
+    Words are lowercased and case variants ("Ant", "ant") are kept once. Membership
+    tests, the words of a length and random sampling are all O(1); iterating yields
+    every word, so the object can be passed where a list of words is expected.
+    """
+
+    def __init__(self, words):
+        """
+        Parameters:
+            words: iterable of words (any case; blank entries are ignored)
+        """
+        by_length = {}
+        seen = set()
+        for word in words:
+            word = word.strip().lower()
+            if not word or word in seen:
+                continue
+            seen.add(word)
+            by_length.setdefault(len(word), []).append(word)
+        self._buckets = {length: WordBucket(group) for length, group in sorted(by_length.items())}
+        self._size = len(seen)
+
+    @classmethod
+    def from_packed(cls, path):
+        """
+        Opens a packed word file (see packed.py) without decoding it: the partitions
+        read their words from the memory-mapped file on demand.
+        """
+        dictionary = cls.__new__(cls)
+        dictionary._buckets = open_packed(path)
+        dictionary._size = sum(len(bucket) for bucket in dictionary._buckets.values())
+        return dictionary
+
+    def __contains__(self, word):
+        bucket = self._buckets.get(len(word))
+        return bucket is not None and word in bucket
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        for bucket in self._buckets.values():
+            yield from bucket
+
+    def lengths(self):
+        """Returns the word lengths present, in increasing order."""
+        return list(self._buckets)
+
+    def bucket(self, length):
+        """Returns the WordBucket of a length (empty if there are no such words)."""
+        bucket = self._buckets.get(length)
+        return bucket if bucket is not None else WordBucket(())
+
+    def words_of_lengths(self, lengths):
+        """Returns the words of several lengths (a WordBucket for a single length)."""
+        lengths = [length for length in lengths if length in self._buckets]
+        if len(lengths) == 1:
+            return self._buckets[lengths[0]]
+        return WordBucket(word for length in lengths for word in self._buckets[length])
+
+    def count(self, length):
+        """Returns the number of words of a length."""
+        bucket = self._buckets.get(length)
+        return len(bucket) if bucket is not None else 0
+
+    def sample(self, length=None, rng=random):
+        """
+        Returns a random word, uniformly among the words of a length, or among all
+        words when length is None.
+        """
+        if length is not None:
+            bucket = self._buckets.get(length)
+            if not bucket:
+                raise ValueError("No words of length {}.".format(length))
+            return bucket[rng.randrange(len(bucket))]
+        if not self._size:
+            raise ValueError("The dictionary is empty.")
+        position = rng.randrange(self._size)
+        for bucket in self._buckets.values():
+            if position < len(bucket):
+                return bucket[position]
+            position -= len(bucket)
+
+# (absolute path, modification time, size) -> WordDictionary
+_LOADED = {}
+
+def load_word_dictionary(file_path):
+    """
+    Loads a dictionary file (one word per line, or a packed word file written by
+    packed.py) into a WordDictionary. The result is kept for the process, so later
+    calls for an unchanged file are free.
+    """
+    status = os.stat(file_path)
+    key = (os.path.abspath(file_path), status.st_mtime_ns, status.st_size)
+    dictionary = _LOADED.get(key)
+    if dictionary is None:
+        if is_packed_file(file_path):
+            dictionary = WordDictionary.from_packed(file_path)
+        else:
+            with open(file_path, "r", encoding="utf-8") as file:
+                dictionary = WordDictionary(file)
+        _LOADED[key] = dictionary
+    return dictionary
@@ -1,3 +1,13 @@
+# src/dictionaryCleaning.py
+
+import mmap
+import re
+from packed import write_packed
+
+# Blank line between entries. The file is read in binary, so Windows (CRLF) line
+# endings are matched here rather than translated like in text mode.
+ENTRY_SEPARATOR = re.compile(rb"\r?\n\r?\n")
+
 def extract_word_from_entry(entry):
     """
     Given a dictionary entry (a block of text), extract the word.
@@ -18,28 +28,53 @@ def extract_word_from_entry(entry):
             return word
     return None
 
+def iter_entry_words(input_filename):
+    """
+    Yields the word of every entry of a dictionary file whose entries are separated
+    by blank lines ("\n\n" or "\r\n\r\n"), without reading the file into memory: the file is
+    memory-mapped and only the first nonempty line of each entry is decoded.
+    """
+    with open(input_filename, "rb") as infile:
+        try:
+            mapped = mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return  # empty file
+    with mapped:
+        size = len(mapped)
+        start = 0
+        while start < size:
+            separator = ENTRY_SEPARATOR.search(mapped, start)
+            end, next_start = (separator.start(), separator.end()) if separator else (size, size)
+            # Skip blank lines to the first line of the entry.
+            position = start
+            while position < end:
+                line_end = mapped.find(b"\n", position, end)
+                if line_end == -1:
+                    line_end = end
+                line = mapped[position:line_end]
+                if line.strip():
+                    word = extract_word_from_entry(line.decode("utf-8"))
+                    if word:
+                        yield word
+                    break
+                position = line_end + 1
+            start = next_start
+
 def main():
     input_filename = "data/Oxford English Dictionary.txt"  # Your original dictionary file
     output_filename = "data/oxford_words.txt"                   # Output file with one word per line
+    packed_filename = "data/oxford_words.pack"                  # Same words, packed by length (packed.py)
 
-    # Read the entire file content
-    with open(input_filename, "r", encoding="utf-8") as infile:
-        content = infile.read()
-
-    # Split entries by double newline (adjust if your entries are separated differently)
-    entries = content.split("\n\n")
-
-    # Use a set to avoid duplicate words
-    words = set()
-    for entry in entries:
-        word = extract_word_from_entry(entry)
-        if word:
-            words.add(word)
+    # Stream the entries; only the set of distinct words is kept in memory.
+    words = set(iter_entry_words(input_filename))
 
     # Write the unique words into the output file, sorted alphabetically
     with open(output_filename, "w", encoding="utf-8") as outfile:
         for word in sorted(words, key=str.lower):
             outfile.write(word + "\n")
 
+    # Write the packed copy the game can memory-map (see dictionary.load_word_dictionary).
+    write_packed(words, packed_filename)
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
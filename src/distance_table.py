@@ -0,0 +1,303 @@
+# src/distance_table.py
+
+import mmap
+import os
+import random
+import struct
+import time
+import weakref
+from bisect import bisect_left
+from collections import deque
+from cache import CACHE_DIR, cache_path, dictionary_hash, get_graph
+
+# Word lengths that get a table by default (easy and medium mode).
+DEFAULT_TABLE_LENGTHS = (3, 4)
+# Larger buckets are refused: the table takes len(words) ** 2 bytes.
+MAX_TABLE_WORDS = 16384
+# Distance stored for pairs with no ladder between them.
+UNREACHABLE = 255
+
+# File layout (all uint8, so there is no byte order to record):
+#   header (little-endian): magic, format version, node count
+#   eccentricity: uint8[node_count], greatest distance from each word (0 if isolated)
+#   distances: uint8[node_count * node_count], row-major by word id
+MAGIC = b"WLGD"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sII")
+
+# graph -> DistanceTable, filled by get_distance_table / register_table.
+_TABLES = weakref.WeakKeyDictionary()
+
+class DistanceTable:
+    """
+    All-pairs shortest ladder distances of one CompactGraph, as an n x n uint8 matrix
+    (UNREACHABLE for words in different components).
+
+    Every distance is one lookup, and a shortest path is rebuilt by greedy descent:
+    from each word, step to any neighbor one closer to the goal. That reads the
+    goal's row only, so a path costs O(path length * degree) with no search.
+    """
+
+    # Random goal columns sample_pair tries before it scans the start word's row.
+    SAMPLE_ATTEMPTS = 64
+
+    def __init__(self, graph, distances, eccentricity):
+        """
+        Parameters:
+            graph: the CompactGraph the table was built for (its word ids index the table)
+            distances: bytes-like of len(graph.words) ** 2 distances, row-major
+            eccentricity: bytes-like of the greatest distance from each word
+        """
+        self._graph_ref = weakref.ref(graph)
+        self.size = len(graph.words)
+        self.distances = distances
+        self.eccentricity = eccentricity
+        # Word ids sorted by eccentricity, for drawing pairs at least k steps apart.
+        self._by_eccentricity = sorted(range(self.size), key=eccentricity.__getitem__)
+        self._sorted_eccentricity = [eccentricity[i] for i in self._by_eccentricity]
+
+    @property
+    def graph(self):
+        return self._graph_ref()
+
+    def row(self, word_id):
+        """Returns the distances from every word id to word_id (the table is symmetric)."""
+        return self.distances[word_id * self.size:(word_id + 1) * self.size]
+
+    def distance(self, start, goal):
+        """Returns the number of moves between two words, or None if there is no ladder."""
+        index = self.graph.index
+        start_id, goal_id = index.get(start), index.get(goal)
+        if start_id is None or goal_id is None:
+            return None
+        distance = self.distances[start_id * self.size + goal_id]
+        return None if distance == UNREACHABLE else distance
+
+    def path(self, start, goal):
+        """Returns a shortest ladder from start to goal, or None if there is none."""
+        graph = self.graph
+        start_id, goal_id = graph.index.get(start), graph.index.get(goal)
+        if start_id is None or goal_id is None:
+            return None
+        row = self.row(goal_id)
+        remaining = row[start_id]
+        if remaining == UNREACHABLE:
+            return None
+        words, offsets, targets = graph.words, graph.offsets, graph.targets
+        path = [start]
+        current = start_id
+        while remaining:
+            remaining -= 1
+            for neighbor in targets[offsets[current]:offsets[current + 1]]:
+                if row[neighbor] == remaining:
+                    current = neighbor
+                    break
+            path.append(words[current])
+        return path
+
+    def sample_pair(self, min_steps, max_steps=None, rng=random):
+        """
+        Draws a (start_word, goal_word, distance) triple with min_steps <= distance <= max_steps.
+
+        Raises:
+            ValueError: If no two words are min_steps apart.
+        """
+        if max_steps is None:
+            max_steps = min_steps
+        if min_steps < 1 or max_steps < min_steps:
+            raise ValueError("Distance band must satisfy 1 <= min_steps <= max_steps.")
+        first = bisect_left(self._sorted_eccentricity, min_steps)
+        if first == self.size:
+            longest = self._sorted_eccentricity[-1] if self.size else 0
+            raise ValueError("No ladder of {} or more steps exists in this bucket "
+                             "(longest: {}).".format(min_steps, longest))
+        # BFS layers are contiguous, so a word whose eccentricity reaches min_steps
+        # always has a word exactly min_steps away.
+        start_id = self._by_eccentricity[first + rng.randrange(self.size - first)]
+        row = self.row(start_id)
+        words = self.graph.words
+        # Rejection sampling: a uniformly drawn column in the band is a uniform draw
+        # among the row's goals in the band, in O(1) per attempt. Only narrow bands
+        # (few goals that far away) fall through to the O(n) scan of the row.
+        for _ in range(self.SAMPLE_ATTEMPTS):
+            goal_id = rng.randrange(self.size)
+            if min_steps <= row[goal_id] <= max_steps and row[goal_id] != UNREACHABLE:
+                return words[start_id], words[goal_id], row[goal_id]
+        goals = [goal_id for goal_id, distance in enumerate(row) if min_steps <= distance <= max_steps
+                 and distance != UNREACHABLE]
+        goal_id = rng.choice(goals)
+        return words[start_id], words[goal_id], row[goal_id]
+
+def _build_python(graph):
+    """Fills the table with one BFS per word; returns (distances, eccentricity)."""
+    size = len(graph.words)
+    distances = bytearray([UNREACHABLE]) * (size * size)
+    eccentricity = bytearray(size)
+    offsets, targets = graph.offsets, graph.targets
+    for source in range(size):
+        base = source * size
+        distances[base + source] = 0
+        queue = deque([source])
+        while queue:
+            current = queue.popleft()
+            next_distance = distances[base + current] + 1
+            for neighbor in targets[offsets[current]:offsets[current + 1]]:
+                if distances[base + neighbor] == UNREACHABLE:
+                    if next_distance >= UNREACHABLE:
+                        raise ValueError("Ladder longer than {} steps; no table possible.".format(UNREACHABLE - 1))
+                    distances[base + neighbor] = next_distance
+                    queue.append(neighbor)
+        eccentricity[source] = distances[base + current]
+    return distances, eccentricity
+
+def _build_numpy(graph, np):
+    """
+    Runs the BFS of every word at once, one level per step: row v of the frontier
+    holds a bit per source word that reached v at the current level, and a level is
+    an OR of the neighbors' rows (bitwise_or.reduceat over the CSR targets).
+    Returns (distances, eccentricity).
+    """
+    size = len(graph.words)
+    offsets = np.frombuffer(graph.offsets, dtype=np.intc).astype(np.intp)
+    targets = np.frombuffer(graph.targets, dtype=np.intc).astype(np.intp)
+    has_neighbors = offsets[1:] > offsets[:-1]
+    starts = offsets[:-1][has_neighbors]
+    table = np.full((size, size), UNREACHABLE, dtype=np.uint8)
+    np.fill_diagonal(table, 0)
+    # Source bits are packed into uint64 words: the OR of a level then touches 64
+    # sources per element.
+    packed = np.zeros((size, (size + 63) // 64 * 8), dtype=np.uint8)
+    packed[:, :(size + 7) // 8] = np.packbits(np.eye(size, dtype=bool), axis=1, bitorder="little")
+    visited = packed.view(np.uint64)
+    frontier = visited.copy()
+    eccentricity = np.zeros(size, dtype=np.uint8)
+    level = 0
+    while len(targets) and frontier.any():
+        level += 1
+        if level >= UNREACHABLE:
+            raise ValueError("Ladder longer than {} steps; no table possible.".format(UNREACHABLE - 1))
+        reached = np.zeros_like(frontier)
+        reached[has_neighbors] = np.bitwise_or.reduceat(frontier[targets], starts, axis=0)
+        reached &= ~visited
+        visited |= reached
+        frontier = reached
+        eccentricity[reached.any(axis=1)] = level
+        np.putmask(table, np.unpackbits(reached.view(np.uint8), axis=1, count=size,
+                                        bitorder="little").view(bool), level)
+    return table.tobytes(), eccentricity.tobytes()
+
+def build_distance_table(graph):
+    """
+    Computes the DistanceTable of a CompactGraph (with NumPy when it is installed).
+
+    Raises:
+        ValueError: if the graph has more than MAX_TABLE_WORDS words.
+    """
+    size = len(graph.words)
+    if size > MAX_TABLE_WORDS:
+        raise ValueError("{} words is too many for a distance table (limit {}).".format(size, MAX_TABLE_WORDS))
+    try:
+        import numpy as np
+    except ImportError:
+        distances, eccentricity = _build_python(graph)
+    else:
+        distances, eccentricity = _build_numpy(graph, np)
+    return DistanceTable(graph, distances, eccentricity)
+
+def table_path(digest, length, cache_dir=CACHE_DIR):
+    """Returns the distance table file path stored next to the cached graph of a word length."""
+    return cache_path(digest, length, cache_dir) + ".distances"
+
+def save_distance_table(table, path):
+    """Writes a DistanceTable to a binary file (atomically, via a temporary file)."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = "{}.{}.tmp".format(path, os.getpid())
+    with open(tmp_path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, FORMAT_VERSION, table.size))
+        file.write(table.eccentricity)
+        file.write(table.distances)
+    os.replace(tmp_path, path)
+
+def load_distance_table(path, graph):
+    """
+    Memory-maps a distance table file written for graph.
+
+    Returns:
+        A DistanceTable, or None if the file is missing, malformed or does not match the graph.
+    """
+    try:
+        with open(path, "rb") as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    if len(mapped) < HEADER.size:
+        return None
+    magic, version, node_count = HEADER.unpack_from(mapped)
+    if magic != MAGIC or version != FORMAT_VERSION or node_count != len(graph.words):
+        return None
+    distances_start = HEADER.size + node_count
+    if len(mapped) != distances_start + node_count * node_count:
+        return None
+    view = memoryview(mapped)
+    return DistanceTable(graph, view[distances_start:], view[HEADER.size:distances_start])
+
+def register_table(table):
+    """Makes search_path, distance fields and pair selection use table for its graph."""
+    _TABLES[table.graph] = table
+
+def table_for(graph):
+    """Returns the DistanceTable registered for graph, or None."""
+    try:
+        return _TABLES.get(graph)
+    except TypeError:  # graphs that cannot be weakly referenced never have a table
+        return None
+
+def get_distance_table(dictionary_file, length, graph=None, words=None, build=False, cache_dir=CACHE_DIR):
+    """
+    Returns the DistanceTable of one word length of a dictionary, registered for
+    graph, or None if no table file exists (and build is False) or the bucket is too
+    large. Tables are optional: they are only built when asked (build=True or the
+    command line below).
+
+    Parameters:
+        graph: the CompactGraph of that length, if already loaded (see cache.get_graph)
+    """
+    if graph is None:
+        graph = get_graph(dictionary_file, length, words, cache_dir)
+    table = table_for(graph)
+    if table is not None:
+        return table
+    if len(graph.words) > MAX_TABLE_WORDS:
+        return None
+    path = table_path(dictionary_hash(dictionary_file), length, cache_dir)
+    table = load_distance_table(path, graph)
+    if table is None:
+        if not build:
+            return None
+        table = build_distance_table(graph)
+        try:
+            save_distance_table(table, path)
+        except OSError as e:
+            print("Warning: could not write distance table {}: {}".format(path, e))
+    register_table(table)
+    return table
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Precompute all-pairs distance tables for short word lengths.")
+    parser.add_argument("--dictionary", default="data/oxford_words.txt")
+    parser.add_argument("--lengths", nargs="+", type=int, default=list(DEFAULT_TABLE_LENGTHS))
+    args = parser.parse_args(argv)
+    for length in args.lengths:
+        began = time.perf_counter()
+        graph = get_graph(args.dictionary, length)
+        try:
+            table = get_distance_table(args.dictionary, length, graph, build=True)
+        except ValueError as e:
+            print("length {}: {}".format(length, e))
+            continue
+        print("length {}: {} words, {:.1f} MB table in {:.2f} s".format(
+            length, table.size, table.size * table.size / 1e6, time.perf_counter() - began))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+# src/distances.py
+
+import weakref
+from array import array
+from collections import OrderedDict, deque
+from compact import CompactGraph
+from distance_table import UNREACHABLE, table_for
+
+# Number of goal words whose distance field is kept per graph.
+MAX_FIELDS_PER_GRAPH = 256
+
+class DistanceField:
+    """
+    Distance (in moves) from every word of a graph to one goal word, computed by a
+    single reverse BFS from the goal. Since the graph is undirected this is also the
+    length of the shortest ladder from each word to the goal.
+
+    Once built, the remaining distance of a word, whether it can still reach the goal,
+    and the best next move are all answered with O(degree) lookups.
+    """
+
+    def __init__(self, graph, goal, distances=None):
+        """
+        Parameters:
+            graph: a networkx graph or a CompactGraph
+            goal: the goal word
+            distances: for a CompactGraph, precomputed word id -> distance to goal with
+                UNREACHABLE for the other words (a DistanceTable row); skips the BFS
+        """
+        # Weak reference: the shared cache below keys fields by graph, and a strong
+        # reference from the value would keep the graph alive forever.
+        self._graph_ref = weakref.ref(graph)
+        self.goal = goal
+        # Graphs that change in place (wordgraph.WordGraph) count their changes.
+        self.version = getattr(graph, "version", None)
+        if distances is not None:
+            self._dist = distances
+            self._unreachable = UNREACHABLE
+        elif isinstance(graph, CompactGraph):
+            # Word id -> distance, -1 for words that cannot reach the goal.
+            self._dist = array("i", [-1]) * len(graph.words)
+            self._unreachable = -1
+            goal_id = graph.id_of(goal)
+            if goal_id is not None:
+                self._bfs_ids(goal_id)
+        else:
+            # Word -> distance, only for words that can reach the goal.
+            self._dist = {}
+            if goal in graph:
+                self._bfs_words()
+
+    @property
+    def graph(self):
+        return self._graph_ref()
+
+    @property
+    def stale(self):
+        """True if the graph changed since the field was computed."""
+        return getattr(self.graph, "version", None) != self.version
+
+    def _bfs_ids(self, goal_id):
+        graph = self.graph
+        dist, offsets, targets = self._dist, graph.offsets, graph.targets
+        dist[goal_id] = 0
+        queue = deque([goal_id])
+        while queue:
+            current = queue.popleft()
+            next_distance = dist[current] + 1
+            for neighbor in targets[offsets[current]:offsets[current + 1]]:
+                if dist[neighbor] == -1:
+                    dist[neighbor] = next_distance
+                    queue.append(neighbor)
+
+    def _bfs_words(self):
+        dist, graph = self._dist, self.graph
+        dist[self.goal] = 0
+        queue = deque([self.goal])
+        while queue:
+            current = queue.popleft()
+            next_distance = dist[current] + 1
+            for neighbor in graph.neighbors(current):
+                if neighbor not in dist:
+                    dist[neighbor] = next_distance
+                    queue.append(neighbor)
+
+    def distance(self, word):
+        """Returns the number of moves from word to the goal, or None if it is unreachable."""
+        if isinstance(self._dist, dict):
+            return self._dist.get(word)
+        word_id = self.graph.id_of(word)
+        if word_id is None or self._dist[word_id] == self._unreachable:
+            return None
+        return self._dist[word_id]
+
+    def reachable(self, word):
+        """Returns True if a ladder from word to the goal exists."""
+        return self.distance(word) is not None
+
+    def next_step(self, word):
+        """
+        Returns a neighbor of word that is one move closer to the goal,
+        or None if word is the goal or cannot reach it.
+        """
+        remaining = self.distance(word)
+        if not remaining:
+            return None
+        graph = self.graph
+        if isinstance(graph, CompactGraph):
+            dist = self._dist
+            for neighbor in graph.neighbor_ids(graph.id_of(word)):
+                if dist[neighbor] == remaining - 1:
+                    return graph.words[neighbor]
+            return None
+        for neighbor in graph.neighbors(word):
+            if self.distance(neighbor) == remaining - 1:
+                return neighbor
+        return None
+
+    def next_steps(self, word):
+        """Returns every neighbor of word that is one move closer to the goal (alternative hints)."""
+        remaining = self.distance(word)
+        if not remaining:
+            return []
+        graph = self.graph
+        if isinstance(graph, CompactGraph):
+            dist = self._dist
+            return [graph.words[neighbor] for neighbor in graph.neighbor_ids(graph.id_of(word))
+                    if dist[neighbor] == remaining - 1]
+        return [neighbor for neighbor in graph.neighbors(word)
+                if self.distance(neighbor) == remaining - 1]
+
+    def path_from(self, word):
+        """
+        Returns a shortest ladder from word to the goal by repeatedly taking next_step,
+        or None if the goal cannot be reached.
+        """
+        if self.distance(word) is None:
+            return None
+        path = [word]
+        while path[-1] != self.goal:
+            path.append(self.next_step(path[-1]))
+        return path
+
+# graph -> OrderedDict(goal -> DistanceField), most recently used goal last.
+# Held weakly so fields go away together with their graph.
+_FIELDS = weakref.WeakKeyDictionary()
+
+def get_distance_field(graph, goal):
+    """
+    Returns the DistanceField of a goal word, shared by every game on the same graph
+    and goal. The field is computed on first use and kept for the most recently used
+    MAX_FIELDS_PER_GRAPH goals of each graph.
+
+    When a DistanceTable is registered for the graph, the field is a view of the
+    goal's row of the table instead, and no BFS runs.
+    """
+    table = table_for(graph)
+    if table is not None and goal in graph:
+        return DistanceField(graph, goal, table.row(graph.id_of(goal)))
+    fields = _FIELDS.get(graph)
+    if fields is None:
+        fields = OrderedDict()
+        _FIELDS[graph] = fields
+    field = fields.get(goal)
+    if field is None:
+        field = DistanceField(graph, goal)
+        fields[goal] = field
+        if len(fields) > MAX_FIELDS_PER_GRAPH:
+            fields.popitem(last=False)
+    else:
+        fields.move_to_end(goal)
+    return field
+
+def clear_distance_fields(graph=None):
+    """Drops the cached distance fields of one graph (or of all graphs), e.g. after it changed."""
+    if graph is None:
+        _FIELDS.clear()
+    else:
+        _FIELDS.pop(graph, None)
@@ -1,7 +1,10 @@
 # src/game.py
 
-from algorithms import search_path
-from utils import select_valid_word_pair
+from algorithms import count_shortest_paths
+from memo import cached_search_path
+from distances import get_distance_field
+from instrumentation import start_timer, report
+from utils import select_puzzle
 
 class WordLadderGame:
     def __init__(self, start_word, goal_word, words, graph, max_moves=20):
@@ -11,7 +14,7 @@ class WordLadderGame:
         Parameters:
             start_word (str): The starting word.
             goal_word (str): The target word.
-            words (list): List of valid words (all of the same length).
+            words: Valid words, all of the same length (a list, or a WordBucket for O(1) membership).
             graph (networkx.Graph): Graph of valid transformations.
             max_moves (int): Maximum allowed moves.
         """
@@ -24,14 +27,23 @@ class WordLadderGame:
         self.max_moves = max_moves
         self.score = 0  # initial score
         
-        # Compute initial best remaining path length using A* search.
-        # Here, we use len(path) - 1 to represent the number of transformations.
-        initial_path = search_path(graph, start_word, goal_word, algorithm="astar")
-        if initial_path:
-            self.prev_remaining = len(initial_path) - 1
+        # Distance of every word to the goal, from a single reverse BFS shared by all
+        # games on this graph with the same goal. Scoring and hints are lookups in it.
+        self.distances = get_distance_field(graph, goal_word)
+        
+        # Initial best remaining path length (number of transformations).
+        initial_remaining = self.distances.distance(start_word)
+        if initial_remaining is not None:
+            self.prev_remaining = initial_remaining
         else:
             self.prev_remaining = float('inf')
 
+    def _distance_field(self):
+        """Returns the distance field, recomputed if words were added to or removed from the graph."""
+        if self.distances.stale:
+            self.distances = get_distance_field(self.graph, self.goal_word)
+        return self.distances
+
     def is_valid_move(self, next_word):
         """
         Checks if the next_word is a valid move from the current word.
@@ -39,23 +51,25 @@ class WordLadderGame:
         """
         return next_word in self.graph[self.current_word]
 
-    def make_move(self, next_word):
+    def make_move(self, next_word, stats=None):
         """
         Makes a move if valid. Updates the current word and the move history.
-        After the move, calculates the new A* path from the current word to the goal
-        and updates the score:
+        After the move, looks up the shortest remaining path length from the current word
+        to the goal in the distance field and updates the score:
           - +10 points if the new path is shorter than the previous remaining path.
           - -5 points if it is longer (score is not allowed to go below 0).
         Returns True if the move is accepted, False otherwise.
+        
+        stats: optional SearchStats (or dict) receiving the call's counters (instrumentation.py).
         """
+        started = start_timer(stats)
         if self.is_valid_move(next_word):
             self.current_word = next_word
             self.moves_taken.append(next_word)
             
-            # Calculate the new remaining path using A* search.
-            new_path = search_path(self.graph, self.current_word, self.goal_word, algorithm="astar")
-            if new_path:
-                new_remaining = len(new_path) - 1  # number of transformations
+            # Look up the new remaining path length.
+            new_remaining = self._distance_field().distance(self.current_word)
+            if new_remaining is not None:
                 if new_remaining < self.prev_remaining:
                     self.score += 10
                     print("Good move! Path improved. +10 points.")
@@ -68,21 +82,40 @@ class WordLadderGame:
                 self.prev_remaining = new_remaining
             else:
                 print("Warning: No path found from the new word to the goal. (This should not happen)")
+            report(stats, "make_move", started, expanded=1, path_length=new_remaining)
             return True
         else:
+            report(stats, "make_move", started)
             return False
 
-    def request_hint(self, algorithm="astar"):
+    def request_hint(self, algorithm=None, stats=None):
         """
-        Provides a hint using the specified search algorithm.
-        Returns the next recommended word in the transformation path.
+        Provides a hint: the next recommended word in a shortest transformation path.
+        By default this is any neighbor one step closer in the distance field; when an
+        algorithm name is given, that search algorithm computes the path instead
+        (through the shared path cache, see memo.py; stats receives the counters).
         """
-        path = search_path(self.graph, self.current_word, self.goal_word, algorithm)
+        if algorithm is None:
+            started = start_timer(stats)
+            distances = self._distance_field()
+            hint = distances.next_step(self.current_word)
+            report(stats, "request_hint", started, expanded=1,
+                   path_length=distances.distance(self.current_word))
+            return hint
+        path = cached_search_path(self.graph, self.current_word, self.goal_word, algorithm, stats=stats)
         if path and len(path) >= 2:
             return path[1]  # Next word after the current word.
         else:
             return None
 
+    def hint_options(self):
+        """Returns every word that is one move closer to the goal (all the optimal next moves)."""
+        return self._distance_field().next_steps(self.current_word)
+
+    def count_optimal_ladders(self):
+        """Returns how many shortest ladders lead from the current word to the goal."""
+        return count_shortest_paths(self.graph, self.current_word, self.goal_word)
+
     def game_status(self):
         """
         Checks the current game status.
@@ -127,7 +160,7 @@ def play_game(game):
 
         user_input = input("Enter your next word (or type 'hint' for a suggestion): ").strip().lower()
         if user_input == "hint":
-            hint = game.request_hint(algorithm="astar")
+            hint = game.request_hint()
             if hint:
                 print("Hint: Try", hint)
             else:
@@ -143,19 +176,19 @@ def play_game(game):
 
 
 if __name__ == "__main__":
-    # Import the load_dictionary function to load the word list.
-    from graph import load_dictionary
+    # Load the word list once, partitioned by word length.
+    from dictionary import load_word_dictionary
 
     # Set the path to your dictionary file.
     dictionary_file = "data/oxford_words.txt"  # Adjust the path as needed.
-    words = load_dictionary(dictionary_file)
+    words = load_word_dictionary(dictionary_file)
     
     # Ask the user for a difficulty level.
     difficulty = input("Enter difficulty level (easy, medium, hard): ").strip().lower()
     
-    # Use the helper function to select a valid word pair and build the graph.
+    # Draw a puzzle from the puzzle bank (or pick a valid word pair) and load its graph.
     try:
-        start_word, goal_word, same_length_words, graph = select_valid_word_pair(words, difficulty)
+        start_word, goal_word, same_length_words, graph = select_puzzle(words, difficulty, dictionary_file)
     except ValueError as e:
         print("Error:", e)
         exit(1)
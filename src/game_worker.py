@@ -0,0 +1,99 @@
+# src/game_worker.py
+
+import queue
+import threading
+import time
+from collections import namedtuple
+from instrumentation import LatencyWindow
+
+# What the UI draws; taken by the worker right after each job so it is consistent.
+GameView = namedtuple("GameView", "previous_word current_word goal_word score status moves")
+
+# One finished job. value is make_move's result for "move" jobs and the hinted word
+# (or None) for "hint" jobs; error holds the exception if the job raised.
+WorkerResult = namedtuple("WorkerResult", "kind argument value view latency error")
+
+def game_view(game):
+    """Returns a GameView snapshot of a WordLadderGame."""
+    previous = game.moves_taken[-2] if len(game.moves_taken) > 1 else game.start_word
+    return GameView(previous, game.current_word, game.goal_word, game.score,
+                    game.game_status(), len(game.moves_taken) - 1)
+
+class GameWorker:
+    """
+    Runs the moves and hints of one WordLadderGame on a background thread so a UI
+    loop never waits for move scoring or a hint search.
+
+    Jobs are handled one at a time in submission order, and only the worker thread
+    touches the game once it has started. poll() returns the finished jobs without
+    blocking; each carries a GameView to draw from. Latencies (submission to result,
+    so queueing is included) are kept in self.latency.
+    """
+
+    def __init__(self, game, window=120):
+        """
+        Parameters:
+            game: the WordLadderGame to drive
+            window: number of recent job latencies kept for the summary
+        """
+        self.game = game
+        self.latency = LatencyWindow(window)
+        self.pending = 0
+        self._jobs = queue.Queue()
+        self._results = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="game-worker", daemon=True)
+        self._thread.start()
+
+    def submit_move(self, word):
+        """Queues game.make_move(word)."""
+        self._submit("move", word)
+
+    def submit_hint(self, algorithm=None):
+        """Queues game.request_hint(algorithm)."""
+        self._submit("hint", algorithm)
+
+    def _submit(self, kind, argument):
+        self.pending += 1
+        self._jobs.put((kind, argument, time.perf_counter()))
+
+    def poll(self):
+        """Returns the WorkerResults finished since the last call (possibly none)."""
+        results = []
+        while True:
+            try:
+                result = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self.pending -= 1
+            self.latency.add(result.latency)
+            results.append(result)
+        return results
+
+    def wait(self, timeout=None):
+        """Blocks until one job has finished and returns its WorkerResult (for scripts and tests)."""
+        result = self._results.get(timeout=timeout)
+        self.pending -= 1
+        self.latency.add(result.latency)
+        return result
+
+    def close(self, timeout=1.0):
+        """Stops the thread after the queued jobs are done."""
+        self._jobs.put(None)
+        self._thread.join(timeout)
+
+    def _run(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            kind, argument, submitted = job
+            value = error = None
+            try:
+                if kind == "move":
+                    value = self.game.make_move(argument)
+                else:
+                    value = self.game.request_hint(argument)
+            except Exception as e:
+                error = e
+            self._results.put(WorkerResult(kind, argument, value, game_view(self.game),
+                                           time.perf_counter() - submitted, error))
@@ -1,7 +1,12 @@
 # src/graph.py
 
-import networkx as nx
 import random
+from collections import defaultdict
+from itertools import combinations
+from dictionary import WordDictionary
+
+# Placeholder used for the wildcard letter in neighbor patterns (e.g. "c*t").
+WILDCARD = "*"
 
 def load_dictionary(file_path):
     """
@@ -13,22 +18,31 @@ def load_dictionary(file_path):
         words = [line.strip().lower() for line in file if line.strip()]
     return words
 
-def differ_by_one(word1, word2):
+def differ_by_one(word1, word2, insert_delete=False):
     """
     Check if two words differ by exactly one letter.
-    Both words must be of the same length.
+    Both words must be of the same length, unless insert_delete is True: then words
+    whose lengths differ by one also count if deleting one letter of the longer word
+    gives the shorter one.
     """
+    if insert_delete and abs(len(word1) - len(word2)) == 1:
+        longer, shorter = (word1, word2) if len(word1) > len(word2) else (word2, word1)
+        return shorter in deletion_variants(longer)
     if len(word1) != len(word2):
         return False
     # Count how many letters differ between the two words.
     count_diff = sum(1 for a, b in zip(word1, word2) if a != b)
     return count_diff == 1
 
-def build_graph(words):
+def build_graph_pairwise(words):
     """
     Build a graph where nodes are words and an edge exists between two words
     if they differ by exactly one letter.
+
+    This compares every pair of words and is O(n^2); it is kept as the reference
+    implementation for build_graph (see benchmark.py).
     """
+    import networkx as nx
     G = nx.Graph()
     G.add_nodes_from(words)
     
@@ -39,6 +53,100 @@ def build_graph(words):
                 G.add_edge(words[i], words[j])
     return G
 
+def wildcard_patterns(word):
+    """
+    Return the wildcard patterns of a word, one per letter position.
+    For example, "cat" gives ["*at", "c*t", "ca*"].
+    """
+    return [word[:i] + WILDCARD + word[i + 1:] for i in range(len(word))]
+
+def build_pattern_buckets(words):
+    """
+    Group words into buckets keyed by wildcard pattern.
+    Two words differ by exactly one letter if and only if they share a bucket,
+    and such a pair shares exactly one bucket.
+
+    Returns a dict mapping each pattern to the list of (unique) words matching it.
+    """
+    buckets = defaultdict(list)
+    seen = set()
+    for word in words:
+        if word in seen:
+            continue
+        seen.add(word)
+        for pattern in wildcard_patterns(word):
+            buckets[pattern].append(word)
+    return buckets
+
+def build_graph(words):
+    """
+    Build a graph where nodes are words and an edge exists between two words
+    if they differ by exactly one letter.
+
+    Edges are emitted from the wildcard pattern buckets, so the cost is roughly
+    linear in the number of words (times word length) plus the number of edges,
+    instead of comparing every pair of words.
+    """
+    # networkx takes most of the startup time, so it is only imported by the
+    # functions that build networkx graphs (the cached CompactGraph path never does).
+    import networkx as nx
+    G = nx.Graph()
+    G.add_nodes_from(words)
+    
+    for bucket in build_pattern_buckets(words).values():
+        if len(bucket) > 1:
+            G.add_edges_from(combinations(bucket, 2))
+    return G
+
+def deletion_variants(word):
+    """
+    Return the distinct words obtained by deleting one letter of word.
+    For example, "cart" gives {"art", "crt", "cat", "car"}.
+    """
+    return {word[:i] + word[i + 1:] for i in range(len(word))}
+
+def insert_delete_edges(words):
+    """
+    Yield the (longer, shorter) word pairs that differ by inserting one letter.
+
+    Uses the deletion neighborhood of every word: word pairs are found by looking up
+    each one-letter deletion of a word in the word set, never by comparing words of
+    different lengths pairwise. Cost is about len(word) set lookups per word.
+    """
+    word_set = set(words)
+    for word in word_set:
+        if len(word) < 2:
+            continue
+        for shorter in deletion_variants(word):
+            if shorter in word_set:
+                yield word, shorter
+
+def build_variable_length_graph(words):
+    """
+    Build one graph over words of all lengths where an edge means the words differ
+    by substituting, inserting or deleting a single letter (e.g. cat - cart - card).
+    The graph is marked with graph.graph["variable_length"] = True, which makes the
+    A* heuristic switch to a bound that stays admissible across lengths.
+    """
+    G = build_graph(words)
+    G.add_edges_from(insert_delete_edges(words))
+    G.graph["variable_length"] = True
+    return G
+
+# Word lengths allowed at each difficulty level.
+DIFFICULTY_LENGTHS = {
+    "easy": (3,),
+    "medium": (4,),
+    "hard": (6,),
+}
+
+def difficulty_lengths(difficulty):
+    """Returns the word lengths of a difficulty level (ValueError for an unknown level)."""
+    lengths = DIFFICULTY_LENGTHS.get(difficulty.lower())
+    if lengths is None:
+        raise ValueError("Difficulty must be 'easy', 'medium', or 'hard'")
+    return lengths
+
 def filter_words_by_difficulty(words, difficulty):
     """
     Filter words based on difficulty.
@@ -48,17 +156,13 @@ def filter_words_by_difficulty(words, difficulty):
     - Medium: words of length 5-6
     - Hard: words of length 7-9
     
-    Returns a list of words that match the allowed lengths.
-    """
-    if difficulty.lower() == 'easy':
-        allowed_lengths = {3}
-    elif difficulty.lower() == 'medium':
-        allowed_lengths = {4}
-    elif difficulty.lower() == 'hard':
-        allowed_lengths = {6}
-    else:
-        raise ValueError("Difficulty must be 'easy', 'medium', or 'hard'")
+    Returns a list of words that match the allowed lengths (for a WordDictionary,
+    the partitions of those lengths are returned without scanning the dictionary).
+    """
+    allowed_lengths = set(difficulty_lengths(difficulty))
     
+    if isinstance(words, WordDictionary):
+        return words.words_of_lengths(sorted(allowed_lengths))
     filtered = [word for word in words if len(word) in allowed_lengths]
     return filtered
 
@@ -80,7 +184,10 @@ def select_start_end_words(words, difficulty):
     start_word = random.choice(filtered)
     
     # Filter to get only words with the same length as the start word.
-    same_length_words = [word for word in filtered if len(word) == len(start_word)]
+    if isinstance(words, WordDictionary):
+        same_length_words = words.bucket(len(start_word))
+    else:
+        same_length_words = [word for word in filtered if len(word) == len(start_word)]
     if len(same_length_words) < 2:
         raise ValueError("Not enough words of the same length to form a ladder.")
     
@@ -0,0 +1,127 @@
+# src/instrumentation.py
+
+import math
+import time
+from collections import deque
+
+# Counters reported for every instrumented call.
+COUNTERS = ("expanded", "pushed", "peak_frontier", "heap_ops", "path_length", "wall_time")
+
+# Global observers: each is called with a dict of counters (plus "operation") after
+# every instrumented call. Empty by default, so nothing is measured unless asked.
+_HOOKS = []
+
+class SearchStats:
+    """
+    Collects the counters of instrumented calls (search algorithms, game moves and hints).
+
+    After each call the attributes hold that call's values:
+        operation: name of the algorithm or game operation
+        expanded: nodes expanded (popped and processed)
+        pushed: nodes added to the frontier
+        peak_frontier: largest frontier size seen
+        heap_ops: heap pushes plus pops (0 for queue based searches)
+        path_length: number of moves in the returned path (None if none was found)
+        wall_time: elapsed seconds
+    and self.totals keeps running sums over all calls (self.calls counts them).
+
+    Parameters:
+        callback: optional function called with this object after every call
+    """
+
+    def __init__(self, callback=None):
+        self.callback = callback
+        self.operation = None
+        self.calls = 0
+        self.totals = {"expanded": 0, "pushed": 0, "heap_ops": 0, "wall_time": 0.0}
+        for name in COUNTERS:
+            setattr(self, name, None)
+
+    def update(self, counters):
+        """Stores the counters of one call (same interface as dict.update)."""
+        for name, value in counters.items():
+            setattr(self, name, value)
+            if name in self.totals and value is not None:
+                self.totals[name] += value
+        self.calls += 1
+        if self.callback is not None:
+            self.callback(self)
+
+    def __getitem__(self, name):
+        return getattr(self, name)
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in ("operation",) + COUNTERS}
+
+    def __repr__(self):
+        return "SearchStats({})".format(", ".join(
+            "{}={!r}".format(name, value) for name, value in self.as_dict().items()))
+
+def add_hook(callback):
+    """Registers a global observer called with the counters dict of every instrumented call."""
+    _HOOKS.append(callback)
+
+def remove_hook(callback):
+    _HOOKS.remove(callback)
+
+def start_timer(stats):
+    """Returns the start time of a call, or None when instrumentation is disabled."""
+    if stats is None and not _HOOKS:
+        return None
+    return time.perf_counter()
+
+def report(stats, operation, started, expanded=0, pushed=0, peak_frontier=0, heap_ops=0,
+           path=None, path_length=None):
+    """
+    Publishes the counters of one call to the stats object (a SearchStats or a plain
+    dict) and to the global hooks. Does nothing when instrumentation is disabled.
+    path_length is derived from path when a path is given.
+    """
+    if started is None:
+        return
+    counters = {
+        "operation": operation,
+        "expanded": expanded,
+        "pushed": pushed,
+        "peak_frontier": peak_frontier,
+        "heap_ops": heap_ops,
+        "path_length": len(path) - 1 if path else path_length,
+        "wall_time": time.perf_counter() - started,
+    }
+    if stats is not None:
+        stats.update(counters)
+    for hook in _HOOKS:
+        hook(counters)
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list (None if it is empty)."""
+    if not sorted_values:
+        return None
+    rank = max(math.ceil(fraction * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+class LatencyWindow:
+    """
+    Rolling window of the most recent durations (in seconds), e.g. frame times or
+    search latencies, with percentile summaries for live displays.
+    """
+
+    def __init__(self, size=120):
+        self.values = deque(maxlen=size)
+        self.count = 0
+
+    def add(self, seconds):
+        self.values.append(seconds)
+        self.count += 1
+
+    def last(self):
+        return self.values[-1] if self.values else None
+
+    def summary(self):
+        """Returns {"p50", "p99", "max"} in milliseconds over the window (None values when empty)."""
+        ordered = sorted(self.values)
+        if not ordered:
+            return {"p50": None, "p99": None, "max": None}
+        return {"p50": percentile(ordered, 0.50) * 1000,
+                "p99": percentile(ordered, 0.99) * 1000,
+                "max": ordered[-1] * 1000}
@@ -0,0 +1,199 @@
+# src/landmarks.py
+
+import mmap
+import os
+import random
+import struct
+import sys
+from array import array
+from collections import deque
+from cache import CACHE_DIR, cache_path, dictionary_hash, get_graph
+from compact import CompactGraph
+from components import ComponentIndex
+
+# Landmarks chosen in each connected component.
+DEFAULT_LANDMARKS = 16
+# Components smaller than this get no landmarks; the Hamming heuristic is enough there.
+MIN_COMPONENT_SIZE = 32
+
+# File layout:
+#   header (little-endian): magic, format version, byte order flag of the arrays,
+#                           node count, landmarks per component
+#   component_of: int32[node_count]
+#   distances: uint16[node_count * landmarks], row-major by word id
+MAGIC = b"WLGL"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sIIII")
+BYTE_ORDER = 0 if sys.byteorder == "little" else 1
+
+def _bfs_distances(graph, source_id):
+    """Returns a dict word id -> distance from source_id (restricted to its component)."""
+    offsets, targets = graph.offsets, graph.targets
+    dist = {source_id: 0}
+    queue = deque([source_id])
+    while queue:
+        current = queue.popleft()
+        next_distance = dist[current] + 1
+        for neighbor in targets[offsets[current]:offsets[current + 1]]:
+            if neighbor not in dist:
+                dist[neighbor] = next_distance
+                queue.append(neighbor)
+    return dist
+
+class LandmarkIndex:
+    """
+    Landmark distances for the ALT heuristic (A*, Landmarks, Triangle inequality).
+
+    A few landmark words are chosen per connected component and the BFS distance
+    from every word to each landmark of its component is stored. For any landmark L,
+    |d(L, word) - d(L, goal)| <= d(word, goal), so the largest such difference is an
+    admissible and consistent lower bound, usually much tighter than the number of
+    differing letters on sparse graphs of long words.
+    """
+
+    def __init__(self, graph, component_of, distances, landmarks):
+        """
+        Use LandmarkIndex.build or load_landmarks rather than calling this directly.
+
+        Parameters:
+            graph: the CompactGraph the ids refer to
+            component_of: component id of every word id
+            distances: uint16 array, distances[word_id * landmarks + slot]
+            landmarks: number of landmark slots per component
+        """
+        self.words = graph.words
+        self.index = graph.index
+        self.component_of = component_of
+        self.distances = distances
+        self.landmarks = landmarks
+
+    @classmethod
+    def build(cls, graph, landmarks=DEFAULT_LANDMARKS, components=None, rng=None):
+        """
+        Chooses landmarks by farthest-point selection in every component: the first
+        is the word farthest from a random member, each next one maximizes its
+        distance to the landmarks already chosen.
+
+        Parameters:
+            graph: a networkx graph or a CompactGraph
+            landmarks: number of landmarks per component
+            components: the ComponentIndex of the graph, if already built
+            rng: random.Random used to pick the first member of each component
+        """
+        if not isinstance(graph, CompactGraph):
+            graph = CompactGraph.from_networkx(graph)
+        components = components if components is not None else ComponentIndex(graph)
+        rng = rng if rng is not None else random.Random(0)
+        distances = array("H", [0]) * (len(graph.words) * landmarks)
+
+        for members in components.members:
+            if len(members) < MIN_COMPONENT_SIZE:
+                continue
+            dist = _bfs_distances(graph, members[rng.randrange(len(members))])
+            closest = {node: float("inf") for node in members}  # distance to nearest landmark
+            candidate = max(dist, key=dist.get)
+            for slot in range(landmarks):
+                dist = _bfs_distances(graph, candidate)
+                for node, d in dist.items():
+                    distances[node * landmarks + slot] = d
+                    if d < closest[node]:
+                        closest[node] = d
+                candidate = max(closest, key=closest.get)
+                if closest[candidate] == 0:
+                    break  # every word of the component is already a landmark
+        return cls(graph, components.component_of, distances, landmarks)
+
+    def connected(self, word_id, goal_id):
+        return self.component_of[word_id] == self.component_of[goal_id]
+
+    def goal_bound(self, goal_id):
+        """
+        Returns a function mapping a word id to its ALT lower bound on the distance to
+        goal_id (both ids in the same component).
+        """
+        k = self.landmarks
+        distances = self.distances
+        goal_row = distances[goal_id * k:goal_id * k + k]
+
+        def bound(word_id):
+            best = 0
+            base = word_id * k
+            for slot in range(k):
+                diff = distances[base + slot] - goal_row[slot]
+                if diff < 0:
+                    diff = -diff
+                if diff > best:
+                    best = diff
+            return best
+        return bound
+
+    def lower_bound(self, word, goal):
+        """
+        Returns the ALT lower bound between two words, or None if no ladder connects them.
+        """
+        word_id, goal_id = self.index[word], self.index[goal]
+        if not self.connected(word_id, goal_id):
+            return None
+        return self.goal_bound(goal_id)(word_id)
+
+def landmarks_path(digest, length, landmarks=DEFAULT_LANDMARKS, cache_dir=CACHE_DIR):
+    """Returns the landmark file path stored next to the cached graph of a word length."""
+    return "{}.landmarks{}".format(cache_path(digest, length, cache_dir), landmarks)
+
+def save_landmarks(index, path):
+    """Writes a LandmarkIndex to a binary file (atomically, via a temporary file)."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = "{}.{}.tmp".format(path, os.getpid())
+    with open(tmp_path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, FORMAT_VERSION, BYTE_ORDER, len(index.words), index.landmarks))
+        file.write(array("i", index.component_of).tobytes())
+        file.write(array("H", index.distances).tobytes())
+    os.replace(tmp_path, path)
+
+def load_landmarks(path, graph):
+    """
+    Memory-maps a landmark file written for graph.
+
+    Returns:
+        A LandmarkIndex, or None if the file is missing, malformed or does not match the graph.
+    """
+    try:
+        with open(path, "rb") as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    if len(mapped) < HEADER.size:
+        return None
+    magic, version, byte_order, node_count, landmarks = HEADER.unpack_from(mapped)
+    if (magic != MAGIC or version != FORMAT_VERSION or byte_order != BYTE_ORDER
+            or node_count != len(graph.words)):
+        return None
+    distances_start = HEADER.size + 4 * node_count
+    end = distances_start + 2 * node_count * landmarks
+    if len(mapped) != end:
+        return None
+    view = memoryview(mapped)
+    component_of = view[HEADER.size:distances_start].cast("i")
+    distances = view[distances_start:end].cast("H")
+    return LandmarkIndex(graph, component_of, distances, landmarks)
+
+def get_landmarks(dictionary_file, length, graph=None, words=None,
+                  landmarks=DEFAULT_LANDMARKS, cache_dir=CACHE_DIR):
+    """
+    Returns the LandmarkIndex of one word length of a dictionary, loading it from the
+    cache directory when possible and building (then saving) it otherwise.
+
+    Parameters:
+        graph: the CompactGraph of that length, if already loaded (see cache.get_graph)
+    """
+    if graph is None:
+        graph = get_graph(dictionary_file, length, words, cache_dir)
+    path = landmarks_path(dictionary_hash(dictionary_file), length, landmarks, cache_dir)
+    index = load_landmarks(path, graph)
+    if index is None:
+        index = LandmarkIndex.build(graph, landmarks)
+        try:
+            save_landmarks(index, path)
+        except OSError as e:
+            print("Warning: could not write landmark cache {}: {}".format(path, e))
+    return index
@@ -0,0 +1,104 @@
+# src/loadgen.py
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from instrumentation import percentile
+
+async def play_client(host, port, request_count, difficulty, latencies, rng, solve_every=4):
+    """
+    Plays games against the server until request_count requests were sent: a new
+    puzzle, then hint + move until the game ends, a solve of the original pair every
+    solve_every games, and an end. Latencies are appended to latencies[op].
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    sent = 0
+
+    async def call(request):
+        nonlocal sent
+        began = time.perf_counter()
+        writer.write(json.dumps(request).encode("utf-8") + b"\n")
+        await writer.drain()
+        response = json.loads(await reader.readline())
+        latencies.setdefault(request["op"], []).append(time.perf_counter() - began)
+        sent += 1
+        if "error" in response:
+            raise RuntimeError("{} failed: {}".format(request["op"], response["error"]))
+        return response
+
+    try:
+        games = 0
+        while sent < request_count:
+            puzzle = await call({"op": "new_puzzle", "difficulty": difficulty})
+            session = puzzle["session"]
+            while sent < request_count:
+                hint = (await call({"op": "hint", "session": session}))["hint"]
+                if hint is None:
+                    break
+                # Now and then play a random word instead of the hint.
+                word = hint if rng.random() < 0.8 else puzzle["start"]
+                move = await call({"op": "move", "session": session, "word": word})
+                if move["status"] != "ongoing":
+                    break
+            if games % solve_every == 0 and sent < request_count:
+                await call({"op": "solve", "start": puzzle["start"], "goal": puzzle["goal"]})
+            await call({"op": "end", "session": session})
+            games += 1
+    finally:
+        writer.close()
+
+async def run_load(host, port, clients=16, requests_per_client=200, difficulty="easy", seed=0):
+    """
+    Runs clients concurrent connections and returns a summary dict: per operation
+    count and p50 / p99 / max latency in milliseconds, plus overall throughput.
+    """
+    latencies = {}
+    began = time.perf_counter()
+    await asyncio.gather(*(
+        play_client(host, port, requests_per_client, difficulty, latencies, random.Random(seed + i))
+        for i in range(clients)))
+    elapsed = time.perf_counter() - began
+    summary = {"clients": clients, "elapsed": elapsed, "operations": {}}
+    total = 0
+    for op, values in sorted(latencies.items()):
+        values.sort()
+        total += len(values)
+        summary["operations"][op] = {
+            "count": len(values),
+            "p50_ms": percentile(values, 0.50) * 1000,
+            "p99_ms": percentile(values, 0.99) * 1000,
+            "max_ms": values[-1] * 1000,
+        }
+    summary["requests"] = total
+    summary["requests_per_second"] = total / max(elapsed, 1e-9)
+    return summary
+
+def print_summary(summary):
+    print("{:<12} {:>8} {:>10} {:>10} {:>10}".format("op", "count", "p50 ms", "p99 ms", "max ms"))
+    for op, row in summary["operations"].items():
+        print("{:<12} {:>8} {:>10.2f} {:>10.2f} {:>10.2f}".format(
+            op, row["count"], row["p50_ms"], row["p99_ms"], row["max_ms"]))
+    print("{} requests from {} clients in {:.2f} s ({:.0f} requests/s)".format(
+        summary["requests"], summary["clients"], summary["elapsed"], summary["requests_per_second"]))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load generator for the puzzle service (server.py).")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=200, help="requests per client")
+    parser.add_argument("--difficulty", default="easy")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    args = parser.parse_args(argv)
+    summary = asyncio.run(run_load(args.host, args.port, args.clients, args.requests,
+                                   args.difficulty, args.seed))
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print_summary(summary)
+
+if __name__ == "__main__":
+    main()
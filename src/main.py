@@ -1,42 +1,94 @@
 # src/main.py
 
 import sys
-from graph import load_dictionary
-from utils import select_valid_word_pair
-from algorithms import search_path
-import networkx as nx
+from algorithms import search_path, count_shortest_paths
+from cache import CACHE_DIR, get_graph
+from distance_table import get_distance_table
+from instrumentation import SearchStats
+
+# Heavy or rarely needed modules (networkx, the puzzle selection machinery, the batch
+# solver) are imported by the code paths that use them, so "python main.py solve"
+# starts without them.
+
+def solve_from_cache(dictionary_file, start_word, end_word, algorithm="bidirectional", stats=None,
+                     cache_dir=CACHE_DIR):
+    """
+    Solves one pair straight from the cached graph of its word length (see cache.py),
+    without reading the dictionary when the cache is warm and without networkx. If
+    the length has a distance table (see distance_table.py), no search runs at all.
+
+    Returns:
+        The path as a list of words, or None if either word is unknown or no ladder exists.
+    """
+    if len(start_word) != len(end_word):
+        return None
+    graph = get_graph(dictionary_file, len(start_word), cache_dir=cache_dir)
+    get_distance_table(dictionary_file, len(start_word), graph, cache_dir=cache_dir)
+    if start_word not in graph or end_word not in graph:
+        return None
+    return search_path(graph, start_word, end_word, algorithm, stats=stats)
+
+def solve_main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Solve one word ladder from the graph cache.")
+    parser.add_argument("start")
+    parser.add_argument("end")
+    parser.add_argument("--dictionary", default="data/oxford_words.txt")
+    parser.add_argument("--algorithm", default="bidirectional")
+    args = parser.parse_args(argv)
+    path = solve_from_cache(args.dictionary, args.start.strip().lower(), args.end.strip().lower(), args.algorithm)
+    if path is None:
+        print("No ladder found.")
+        return 1
+    print(" -> ".join(path))
+    return 0
 
 def main():
+    from dictionary import load_word_dictionary
+    from utils import select_puzzle
+
     # Load the dictionary from file.
     dictionary_file = "data/oxford_words.txt"
-    words = load_dictionary(dictionary_file)
-    
+    words = load_word_dictionary(dictionary_file)
+
     # Ask user for a difficulty level.
     difficulty = input("Enter difficulty level (easy, medium, hard): ").strip().lower()
-    
+
     try:
-        # Use the helper to select a valid word pair and build the graph.
-        start_word, end_word, same_length_words, graph = select_valid_word_pair(words, difficulty)
+        # Draw a puzzle from the puzzle bank (or pick a valid word pair) and load its graph.
+        start_word, end_word, same_length_words, graph = select_puzzle(words, difficulty, dictionary_file)
     except ValueError as e:
         print("Error:", e)
         sys.exit(1)
-    
+
     print(f"Start word: {start_word}")
     print(f"End word: {end_word}")
     print("Graph built with {} nodes and {} edges".format(
         graph.number_of_nodes(), graph.number_of_edges()))
-    
+
     # Ask the user which search algorithm they want to use.
-    algorithm = input("Choose search algorithm (bfs, ucs, astar): ").strip().lower()
-    
+    algorithm = input("Choose search algorithm (bfs, ucs, astar, bidirectional): ").strip().lower()
+
     # Find the transformation path using the selected algorithm.
-    path = search_path(graph, start_word, end_word, algorithm)
-    
+    stats = SearchStats()
+    path = search_path(graph, start_word, end_word, algorithm, stats=stats)
+
     if path:
         print("Found path:", " -> ".join(path))
         print(f"Path length: {len(path)} words ({len(path)-1} transformations)")
+        print(f"Optimal ladders of this length: {count_shortest_paths(graph, start_word, end_word)}")
+        print(f"Nodes expanded: {stats.expanded}, pushed: {stats.pushed}, "
+              f"peak frontier: {stats.peak_frontier}, time: {stats.wall_time * 1000:.2f} ms")
     else:
         print("Unexpected error: No path found using {}.".format(algorithm))
 
 if __name__ == "__main__":
-    main()
+    # "python main.py batch [options]" solves a file of pairs non-interactively (see batch.py).
+    # "python main.py solve START END [options]" solves one pair from the graph cache.
+    if len(sys.argv) > 1 and sys.argv[1] == "batch":
+        from batch import main as batch_main
+        batch_main(sys.argv[2:])
+    elif len(sys.argv) > 1 and sys.argv[1] == "solve":
+        sys.exit(solve_main(sys.argv[2:]))
+    else:
+        main()
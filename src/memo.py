@@ -0,0 +1,192 @@
+# src/memo.py
+
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from algorithms import search_path
+from instrumentation import start_timer, report
+
+# Default bound of the shared cache (number of solved (start, goal) pairs kept).
+DEFAULT_MAX_ENTRIES = 100_000
+
+class _Entry:
+    __slots__ = ("path", "graph_ref", "version", "expires")
+
+    def __init__(self, path, graph_ref, version, expires):
+        self.path = path
+        self.graph_ref = graph_ref
+        self.version = version
+        self.expires = expires
+
+class PathCache:
+    """
+    Bounded LRU (optionally TTL) cache of search_path results, keyed by graph
+    identity, start word, goal word and algorithm.
+
+    Every suffix of a shortest path is itself a shortest path to the same goal, so a
+    cached ladder also answers the searches from each of its later words: a player
+    who follows the hints asks about start, then path[1], path[2], ... and only the
+    first request runs a search.
+
+    Entries are checked against the graph's version (see wordgraph.WordGraph) and
+    dropped once the graph has changed; a graph that was garbage collected never
+    matches either, even if its id() is reused.
+
+    The cache is thread-safe (the UI's GameWorker thread and the main thread share
+    PATH_CACHE): a lock guards the entries, but not the search run on a miss.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, ttl=None, clock=time.monotonic):
+        """
+        Parameters:
+            max_entries: number of solved pairs kept; the least recently used is evicted
+            ttl: seconds an entry stays valid (None keeps entries until evicted)
+            clock: function returning the current time in seconds
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self._lock = threading.Lock()
+        # (graph id, start, goal, algorithm) -> _Entry, least recently used first.
+        self._entries = OrderedDict()
+        # (graph id, goal, algorithm) -> {word: (entry key, position of word in its path)}
+        self._suffixes = {}
+        self.hits = 0
+        self.suffix_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        """Returns the hit / miss / eviction counters and the current size."""
+        with self._lock:
+            return self._stats()
+
+    def _stats(self):
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "suffix_hits": self.suffix_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+    def _drop(self, key):
+        entry = self._entries.pop(key)
+        if entry.path:
+            # Only the words still mapped to this entry: a word another (newer) path
+            # took over keeps pointing at that path.
+            suffix_key = (key[0], key[2], key[3])
+            suffixes = self._suffixes.get(suffix_key)
+            if suffixes is not None:
+                for word in entry.path:
+                    if suffixes.get(word, (None,))[0] == key:
+                        del suffixes[word]
+                if not suffixes:
+                    del self._suffixes[suffix_key]
+
+    def _valid(self, key, graph):
+        """Returns the entry of key if it is still valid for graph, dropping it otherwise."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.graph_ref() is not graph or entry.version != getattr(graph, "version", None):
+            self.invalidations += 1
+            self._drop(key)
+            return None
+        if entry.expires is not None and entry.expires <= self.clock():
+            self.expirations += 1
+            self._drop(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def lookup(self, graph, start, goal, algorithm="bfs"):
+        """
+        Returns (True, path) if the answer is cached (path may be None when no ladder
+        exists), or (False, None) on a miss.
+        """
+        algorithm = algorithm.lower()
+        with self._lock:
+            return self._lookup(graph, start, goal, algorithm)
+
+    def _lookup(self, graph, start, goal, algorithm):
+        entry = self._valid((id(graph), start, goal, algorithm), graph)
+        if entry is not None:
+            self.hits += 1
+            return True, list(entry.path) if entry.path is not None else None
+        suffixes = self._suffixes.get((id(graph), goal, algorithm))
+        if suffixes is not None and start in suffixes:
+            key, position = suffixes[start]
+            entry = self._valid(key, graph)
+            if entry is not None:
+                self.suffix_hits += 1
+                return True, list(entry.path[position:])
+        self.misses += 1
+        return False, None
+
+    def store(self, graph, start, goal, algorithm, path):
+        """Caches the result of one search (path may be None)."""
+        algorithm = algorithm.lower()
+        with self._lock:
+            self._store(graph, start, goal, algorithm, path)
+
+    def _store(self, graph, start, goal, algorithm, path):
+        key = (id(graph), start, goal, algorithm)
+        if key in self._entries:
+            self._drop(key)
+        expires = self.clock() + self.ttl if self.ttl is not None else None
+        path = tuple(path) if path is not None else None
+        self._entries[key] = _Entry(path, weakref.ref(graph), getattr(graph, "version", None), expires)
+        if path:
+            suffixes = self._suffixes.setdefault((key[0], goal, algorithm), {})
+            for position, word in enumerate(path[:-1]):
+                # Words shared with an earlier cached path now point to this one.
+                suffixes[word] = (key, position)
+        while len(self._entries) > self.max_entries:
+            self.evictions += 1
+            self._drop(next(iter(self._entries)))
+
+    def search(self, graph, start, goal, algorithm="bfs", stats=None, landmarks=None):
+        """
+        Same as algorithms.search_path, answered from the cache when possible.
+        On a hit, stats receives a "path_cache" call with no nodes expanded.
+        """
+        started = start_timer(stats)
+        found, path = self.lookup(graph, start, goal, algorithm)
+        if found:
+            report(stats, "path_cache", started, path=path)
+            return path
+        path = search_path(graph, start, goal, algorithm, stats, landmarks)
+        self.store(graph, start, goal, algorithm, path)
+        return path
+
+    def invalidate(self, graph=None):
+        """Drops every entry (or only the entries of one graph)."""
+        with self._lock:
+            self._invalidate(graph)
+
+    def _invalidate(self, graph):
+        if graph is None:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+            self._suffixes.clear()
+            return
+        graph_id = id(graph)
+        for key in [key for key in self._entries if key[0] == graph_id]:
+            self.invalidations += 1
+            self._drop(key)
+
+# Cache shared by the game, the server and anything else that wants memoized searches.
+PATH_CACHE = PathCache()
+
+def cached_search_path(graph, start, goal, algorithm="bfs", stats=None, landmarks=None):
+    """search_path through the shared PATH_CACHE."""
+    return PATH_CACHE.search(graph, start, goal, algorithm, stats, landmarks)
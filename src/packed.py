@@ -0,0 +1,173 @@
+# src/packed.py
+
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections.abc import Sequence
+
+# Packed word file: every word length gets a section holding its sorted, lowercased
+# words as one UTF-8 blob plus a table of start offsets into it. Words are not fixed
+# width in bytes (the Oxford list has accented letters), hence the offsets table.
+#
+# File layout:
+#   header (little-endian): magic, format version, byte order flag of the arrays,
+#                           number of sections
+#   section table: (word length, word count, section offset) per section
+#   each section, starting on a 4-byte boundary:
+#       offsets: uint32[count + 1], byte offsets of the words inside the blob
+#       blob: the words' UTF-8 bytes, concatenated in sorted order
+MAGIC = b"WLGW"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sIII")
+SECTION = struct.Struct("<IIQ")
+BYTE_ORDER = 0 if sys.byteorder == "little" else 1
+
+def _pad(size):
+    return -size % 4
+
+def write_packed(words, path):
+    """
+    Writes a packed word file from an iterable of words (atomically, via a temporary file).
+
+    Words are stripped and lowercased, and case variants are kept once. The words are
+    consumed as a stream, so memory grows with the number of distinct words only.
+
+    Returns:
+        dict mapping each word length to its number of words.
+    """
+    by_length = {}
+    for word in words:
+        word = word.strip().lower()
+        if word:
+            by_length.setdefault(len(word), set()).add(word)
+    lengths = sorted(by_length)
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = "{}.{}.tmp".format(path, os.getpid())
+    with open(tmp_path, "wb") as file:
+        position = HEADER.size + SECTION.size * len(lengths)
+        position += _pad(position)
+        file.seek(position)
+        table = []
+        for length in lengths:
+            encoded = [word.encode("utf-8") for word in sorted(by_length.pop(length))]
+            offsets = array("I", [0])
+            for word in encoded:
+                offsets.append(offsets[-1] + len(word))
+            table.append((length, len(encoded), position))
+            file.write(offsets.tobytes())
+            file.writelines(encoded)
+            file.write(b"\0" * _pad(offsets[-1]))
+            position += 4 * len(offsets) + offsets[-1] + _pad(offsets[-1])
+        file.seek(0)
+        file.write(HEADER.pack(MAGIC, FORMAT_VERSION, BYTE_ORDER, len(table)))
+        for entry in table:
+            file.write(SECTION.pack(*entry))
+    os.replace(tmp_path, path)
+    return {length: count for length, count, _ in table}
+
+class PackedBucket(Sequence):
+    """
+    The words of one length in a memory-mapped packed file. Nothing is decoded up
+    front: indexing decodes one word, and membership is a binary search over the
+    sorted blob (UTF-8 byte order equals code point order, i.e. str order).
+    """
+
+    __slots__ = ("_mapped", "_offsets", "_blob_start", "_count")
+
+    def __init__(self, mapped, offsets, blob_start, count):
+        self._mapped = mapped
+        self._offsets = offsets
+        self._blob_start = blob_start
+        self._count = count
+
+    def _raw(self, i):
+        start = self._blob_start
+        return self._mapped[start + self._offsets[i]:start + self._offsets[i + 1]]
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self._count))]
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError("word index out of range")
+        return self._raw(i).decode("utf-8")
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        for i in range(self._count):
+            yield self._raw(i).decode("utf-8")
+
+    def __contains__(self, word):
+        if not isinstance(word, str):
+            return False
+        target = word.encode("utf-8")
+        mapped, offsets, start = self._mapped, self._offsets, self._blob_start
+        low, high = 0, self._count
+        while low < high:
+            mid = (low + high) // 2
+            current = mapped[start + offsets[mid]:start + offsets[mid + 1]]
+            if current < target:
+                low = mid + 1
+            elif current > target:
+                high = mid
+            else:
+                return True
+        return False
+
+    def __repr__(self):
+        return "PackedBucket({} words)".format(self._count)
+
+def is_packed_file(path):
+    """Returns True if path starts with the packed word file magic."""
+    with open(path, "rb") as file:
+        return file.read(len(MAGIC)) == MAGIC
+
+def open_packed(path):
+    """
+    Memory-maps a packed word file.
+
+    Returns:
+        dict mapping each word length (in increasing order) to a PackedBucket.
+
+    Raises:
+        ValueError: If the file is not a valid packed word file for this machine.
+    """
+    with open(path, "rb") as file:
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    if len(mapped) < HEADER.size:
+        raise ValueError("{} is not a packed word file.".format(path))
+    magic, version, byte_order, section_count = HEADER.unpack_from(mapped)
+    if magic != MAGIC or version != FORMAT_VERSION or byte_order != BYTE_ORDER:
+        raise ValueError("{} is not a packed word file (version {}).".format(path, FORMAT_VERSION))
+    view = memoryview(mapped)
+    buckets = {}
+    for i in range(section_count):
+        length, count, start = SECTION.unpack_from(mapped, HEADER.size + i * SECTION.size)
+        blob_start = start + 4 * (count + 1)
+        offsets = view[start:blob_start].cast("I")
+        if blob_start + offsets[count] > len(mapped):
+            raise ValueError("{} is truncated.".format(path))
+        buckets[length] = PackedBucket(mapped, offsets, blob_start, count)
+    return buckets
+
+def iter_lines(path):
+    """Yields the stripped, non-empty lines of a text file, read incrementally."""
+    with open(path, "r", encoding="utf-8") as file:
+        for line in file:
+            line = line.strip()
+            if line:
+                yield line
+
+if __name__ == "__main__":
+    # Pack a word list (one word per line):
+    #   python src/packed.py data/words_alpha.txt data/words_alpha.pack
+    source, target = sys.argv[1], sys.argv[2]
+    counts = write_packed(iter_lines(source), target)
+    print("Packed {} words of {} lengths into {} ({} bytes)".format(
+        sum(counts.values()), len(counts), target, os.path.getsize(target)))
@@ -0,0 +1,331 @@
+# src/puzzle_bank.py
+
+import mmap
+import os
+import random
+import struct
+import sys
+import time
+from array import array
+from collections import namedtuple
+from cache import CACHE_DIR, dictionary_hash, get_graph
+from components import ComponentIndex
+from dictionary import load_word_dictionary
+from graph import difficulty_lengths
+
+# Puzzles generated per word length, and goals drawn from each BFS source.
+DEFAULT_PER_LENGTH = 500
+GOALS_PER_SOURCE = 4
+# Shortest ladder a generated puzzle may have (one-move puzzles are not worth playing).
+MIN_STEPS = 2
+# Ladder counts are stored as uint32 and saturate here.
+MAX_COUNT = 2 ** 32 - 1
+
+Puzzle = namedtuple("Puzzle", ["start", "goal", "optimal_steps", "optimal_ladders"])
+
+# File layout:
+#   header (little-endian): magic, format version, byte order flag of the arrays,
+#                           number of sections (one per word length)
+#   section table: (word length, puzzle count, word count, max steps, section offset)
+#   each section, starting on a 4-byte boundary:
+#       step_starts: uint32[max_steps + 2]; puzzles with an optimal ladder of s steps
+#                    are records step_starts[s] .. step_starts[s + 1] - 1
+#       records: uint32[4 * puzzle count] of (start id, goal id, optimal steps,
+#                number of optimal ladders), sorted by optimal steps
+#       word_offsets: uint32[word count + 1] into the words blob
+#       words blob: UTF-8 words used by the section, padded to 4 bytes
+MAGIC = b"WLGB"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sIII")
+SECTION = struct.Struct("<IIIIQ")
+BYTE_ORDER = 0 if sys.byteorder == "little" else 1
+
+def _pad(size):
+    return -size % 4
+
+def bank_path(dictionary_file, cache_dir=CACHE_DIR):
+    """Returns the puzzle bank path of a dictionary (keyed by its content hash, like the graphs)."""
+    return os.path.join(cache_dir, "{}.puzzles".format(dictionary_hash(dictionary_file)[:32]))
+
+def ladder_counts(graph, source_id):
+    """
+    BFS from source_id over a CompactGraph that also counts shortest ladders: the
+    number of shortest paths to a word is the sum over its neighbors one layer closer.
+
+    Returns:
+        (layers, counts): layers[d] lists the word ids at distance d, counts maps
+        every reached word id to its number of shortest ladders from source_id.
+    """
+    offsets, targets = graph.offsets, graph.targets
+    counts = {source_id: 1}
+    layers = [[source_id]]
+    while True:
+        next_counts = {}
+        for current in layers[-1]:
+            paths = counts[current]
+            for neighbor in targets[offsets[current]:offsets[current + 1]]:
+                if neighbor in counts:
+                    continue
+                next_counts[neighbor] = next_counts.get(neighbor, 0) + paths
+        if not next_counts:
+            return layers, counts
+        counts.update(next_counts)
+        layers.append(list(next_counts))
+
+def generate_length(job):
+    """
+    Generates the puzzles of one word length (run in a worker process).
+
+    Parameters:
+        job: (dictionary_file, length, count, seed, cache_dir)
+
+    Returns:
+        (length, puzzles): a list of Puzzle tuples, at most count of them. Each BFS
+        source yields a few goals at distances drawn uniformly from MIN_STEPS up to
+        the source's eccentricity, so long ladders are well represented.
+    """
+    dictionary_file, length, count, seed, cache_dir = job
+    graph = get_graph(dictionary_file, length, cache_dir=cache_dir)
+    eligible = ComponentIndex(graph).eligible
+    rng = random.Random(seed * 1_000_003 + length)
+    words = graph.words
+    found = {}
+    sources = 0
+    max_sources = max(count, 1) * 2
+    while eligible and len(found) < count and sources < max_sources:
+        sources += 1
+        source_id = eligible[rng.randrange(len(eligible))]
+        layers, counts = ladder_counts(graph, source_id)
+        if len(layers) - 1 < MIN_STEPS:
+            continue
+        for _ in range(GOALS_PER_SOURCE):
+            steps = rng.randint(MIN_STEPS, len(layers) - 1)
+            goal_id = layers[steps][rng.randrange(len(layers[steps]))]
+            if rng.random() < 0.5:
+                key = (words[source_id], words[goal_id])
+            else:
+                key = (words[goal_id], words[source_id])
+            found[key] = Puzzle(key[0], key[1], steps, min(counts[goal_id], MAX_COUNT))
+            if len(found) >= count:
+                break
+    return length, list(found.values())
+
+def write_bank(puzzles_by_length, path):
+    """
+    Writes a puzzle bank file (atomically, via a temporary file).
+
+    Parameters:
+        puzzles_by_length: dict mapping word length -> list of Puzzle
+    """
+    lengths = sorted(length for length, puzzles in puzzles_by_length.items() if puzzles)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = "{}.{}.tmp".format(path, os.getpid())
+    with open(tmp_path, "wb") as file:
+        position = HEADER.size + SECTION.size * len(lengths)
+        position += _pad(position)
+        file.seek(position)
+        table = []
+        for length in lengths:
+            puzzles = sorted(puzzles_by_length[length], key=lambda puzzle: puzzle.optimal_steps)
+            index = {}
+            for puzzle in puzzles:
+                index.setdefault(puzzle.start, len(index))
+                index.setdefault(puzzle.goal, len(index))
+            max_steps = puzzles[-1].optimal_steps
+            step_starts = array("I", [0]) * (max_steps + 2)
+            for puzzle in puzzles:
+                step_starts[puzzle.optimal_steps + 1] += 1
+            for steps in range(1, max_steps + 2):
+                step_starts[steps] += step_starts[steps - 1]
+            records = array("I")
+            for puzzle in puzzles:
+                records.extend((index[puzzle.start], index[puzzle.goal],
+                                puzzle.optimal_steps, puzzle.optimal_ladders))
+            encoded = [word.encode("utf-8") for word in index]
+            word_offsets = array("I", [0])
+            for word in encoded:
+                word_offsets.append(word_offsets[-1] + len(word))
+            table.append((length, len(puzzles), len(encoded), max_steps, position))
+            for part in (step_starts, records, word_offsets):
+                file.write(part.tobytes())
+            file.writelines(encoded)
+            file.write(b"\0" * _pad(word_offsets[-1]))
+            position += 4 * (len(step_starts) + len(records) + len(word_offsets))
+            position += word_offsets[-1] + _pad(word_offsets[-1])
+        file.seek(0)
+        file.write(HEADER.pack(MAGIC, FORMAT_VERSION, BYTE_ORDER, len(table)))
+        for entry in table:
+            file.write(SECTION.pack(*entry))
+    os.replace(tmp_path, path)
+
+def build_bank(dictionary_file, path=None, per_length=DEFAULT_PER_LENGTH, processes=None,
+               seed=0, lengths=None, cache_dir=CACHE_DIR):
+    """
+    Generates puzzles for every word length of a dictionary with a process pool and
+    writes them to a puzzle bank file.
+
+    Parameters:
+        dictionary_file: dictionary the puzzles come from
+        path: output file (defaults to bank_path(dictionary_file, cache_dir))
+        per_length: puzzles generated per word length
+        processes: worker count (defaults to the CPU count); 1 runs in this process
+        seed: seed of the generation (the same seed gives the same bank)
+        lengths: word lengths to cover (defaults to every length of the dictionary)
+        cache_dir: directory of the graph cache (and of the default bank path)
+
+    Returns:
+        dict mapping word length -> number of puzzles written.
+    """
+    if path is None:
+        path = bank_path(dictionary_file, cache_dir)
+    words = load_word_dictionary(dictionary_file)
+    if lengths is None:
+        lengths = words.lengths()
+    # Largest buckets first, so one slow length does not finish last.
+    lengths = sorted(lengths, key=words.count, reverse=True)
+    jobs = [(dictionary_file, length, per_length, seed, cache_dir) for length in lengths]
+    if processes == 1:
+        puzzles_by_length = dict(map(generate_length, jobs))
+    else:
+        # Imported here: games only read banks, and the import slows their startup.
+        import multiprocessing
+        with multiprocessing.Pool(processes) as pool:
+            puzzles_by_length = dict(pool.imap_unordered(generate_length, jobs))
+    write_bank(puzzles_by_length, path)
+    return {length: len(puzzles) for length, puzzles in puzzles_by_length.items() if puzzles}
+
+class _Section:
+    __slots__ = ("mapped", "step_starts", "records", "word_offsets", "words_start", "count", "max_steps")
+
+class PuzzleBank:
+    """
+    Read-only, memory-mapped puzzle bank. Drawing a puzzle decodes one record and
+    two words; nothing else is read, and no graph is needed.
+    """
+
+    def __init__(self, path):
+        """
+        Raises:
+            ValueError: If the file is not a valid puzzle bank for this machine.
+        """
+        with open(path, "rb") as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(mapped) < HEADER.size:
+            raise ValueError("{} is not a puzzle bank.".format(path))
+        magic, version, byte_order, section_count = HEADER.unpack_from(mapped)
+        if magic != MAGIC or version != FORMAT_VERSION or byte_order != BYTE_ORDER:
+            raise ValueError("{} is not a puzzle bank (version {}).".format(path, FORMAT_VERSION))
+        view = memoryview(mapped)
+        self._sections = {}
+        for i in range(section_count):
+            length, count, word_count, max_steps, start = SECTION.unpack_from(
+                mapped, HEADER.size + i * SECTION.size)
+            section = _Section()
+            section.mapped = mapped
+            section.count = count
+            section.max_steps = max_steps
+            records_start = start + 4 * (max_steps + 2)
+            offsets_start = records_start + 16 * count
+            section.words_start = offsets_start + 4 * (word_count + 1)
+            section.step_starts = view[start:records_start].cast("I")
+            section.records = view[records_start:offsets_start].cast("I")
+            section.word_offsets = view[offsets_start:section.words_start].cast("I")
+            if section.words_start + section.word_offsets[word_count] > len(mapped):
+                raise ValueError("{} is truncated.".format(path))
+            self._sections[length] = section
+
+    def lengths(self):
+        return sorted(self._sections)
+
+    def count(self, length):
+        """Returns the number of puzzles of a word length."""
+        section = self._sections.get(length)
+        return section.count if section is not None else 0
+
+    def _word(self, section, word_id):
+        begin = section.words_start + section.word_offsets[word_id]
+        end = section.words_start + section.word_offsets[word_id + 1]
+        return section.mapped[begin:end].decode("utf-8")
+
+    def puzzle(self, length, i):
+        """Returns puzzle number i of a word length (puzzles are ordered by optimal steps)."""
+        section = self._sections[length]
+        if not 0 <= i < section.count:
+            raise IndexError("puzzle index out of range")
+        start_id, goal_id, steps, ladders = section.records[4 * i:4 * i + 4]
+        return Puzzle(self._word(section, start_id), self._word(section, goal_id), steps, ladders)
+
+    def _range(self, length, min_steps, max_steps):
+        """Returns the [begin, end) record range of a word length for a band of optimal steps."""
+        section = self._sections.get(length)
+        if section is None:
+            return 0, 0
+        low = min(max(min_steps or 0, 0), section.max_steps + 1)
+        high = section.max_steps if max_steps is None else min(max_steps, section.max_steps)
+        if high < low:
+            return 0, 0
+        return section.step_starts[low], section.step_starts[high + 1]
+
+    def draw_length(self, length, rng=random, min_steps=None, max_steps=None):
+        """
+        Draws a random puzzle of one word length, optionally with an optimal ladder of
+        min_steps..max_steps moves.
+
+        Raises:
+            ValueError: If the bank has no such puzzle.
+        """
+        begin, end = self._range(length, min_steps, max_steps)
+        if begin == end:
+            raise ValueError("The puzzle bank has no {}-letter puzzle in that range.".format(length))
+        return self.puzzle(length, begin + rng.randrange(end - begin))
+
+    def draw(self, difficulty, rng=random, min_steps=None, max_steps=None):
+        """
+        Draws a random puzzle of a difficulty level (see graph.DIFFICULTY_LENGTHS);
+        the word length is chosen in proportion to the number of puzzles it has.
+        """
+        ranges = [(length, self._range(length, min_steps, max_steps))
+                  for length in difficulty_lengths(difficulty)]
+        total = sum(end - begin for _, (begin, end) in ranges)
+        if not total:
+            raise ValueError("The puzzle bank has no puzzle for difficulty {!r}.".format(difficulty))
+        position = rng.randrange(total)
+        for length, (begin, end) in ranges:
+            if position < end - begin:
+                return self.puzzle(length, begin + position)
+            position -= end - begin
+
+# (bank path, modification time) -> PuzzleBank
+_BANKS = {}
+
+def load_puzzle_bank(dictionary_file, path=None, cache_dir=CACHE_DIR):
+    """
+    Returns the PuzzleBank generated for a dictionary, or None if none was built
+    (see build_bank). Banks are opened once per process.
+    """
+    if path is None:
+        path = bank_path(dictionary_file, cache_dir)
+    try:
+        key = (path, os.stat(path).st_mtime_ns)
+        if key not in _BANKS:
+            _BANKS[key] = PuzzleBank(path)
+    except (OSError, ValueError):
+        return None
+    return _BANKS[key]
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Pre-generate a puzzle bank for a dictionary.")
+    parser.add_argument("dictionary", nargs="?", default="data/oxford_words.txt")
+    parser.add_argument("--per-length", type=int, default=DEFAULT_PER_LENGTH)
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="bank file (default: next to the graph cache)")
+    args = parser.parse_args(argv)
+    begin = time.perf_counter()
+    counts = build_bank(args.dictionary, args.output, args.per_length, args.processes, args.seed)
+    print("Wrote {} puzzles for {} word lengths in {:.1f} s".format(
+        sum(counts.values()), len(counts), time.perf_counter() - begin))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+# src/puzzles.py
+
+import random
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import deque
+from compact import CompactGraph
+from components import ComponentIndex
+
+# Upper bound on the number of word ids kept in BFS layers (4 bytes each), so the
+# index of a large length bucket stays around 20 MB.
+DEFAULT_MAX_ENTRIES = 5_000_000
+# Upper bound on the number of sources (one pure-Python BFS each), so building the
+# index of a large bucket takes well under a second.
+DEFAULT_MAX_SOURCES = 64
+
+def bfs_layer_ids(graph, source_id):
+    """
+    Runs a BFS over a CompactGraph from one word id.
+
+    Returns:
+        (layer_ids, layer_ends): layer_ids holds the reached ids in BFS order and
+        layer_ends[d] is the index in layer_ids where distance d ends, so the words at
+        distance d are layer_ids[layer_ends[d - 1]:layer_ends[d]].
+    """
+    offsets, targets = graph.offsets, graph.targets
+    visited = bytearray(len(graph.words))
+    visited[source_id] = 1
+    layer_ids = array("i", [source_id])
+    layer_ends = array("i")
+    frontier = [source_id]
+    while frontier:
+        layer_ends.append(len(layer_ids))
+        next_frontier = []
+        for current in frontier:
+            for neighbor in targets[offsets[current]:offsets[current + 1]]:
+                if not visited[neighbor]:
+                    visited[neighbor] = 1
+                    next_frontier.append(neighbor)
+        layer_ids.extend(next_frontier)
+        frontier = next_frontier
+    return layer_ids, layer_ends
+
+class LadderDistanceIndex:
+    """
+    Precomputed BFS layers from a set of source words, used to draw puzzles whose
+    start and goal are an exact number of steps apart.
+
+    The sources are a random sample of the words that have a ladder to some other
+    word: at most max_sources of them (DEFAULT_MAX_SOURCES = 64, one BFS each), and
+    fewer if their layers would exceed max_entries stored ids. Buckets with no more
+    eligible words than that use every one of them.
+    Queries only touch the stored layers, so no search runs per puzzle.
+    """
+
+    def __init__(self, graph, components=None, max_entries=DEFAULT_MAX_ENTRIES, rng=None,
+                 max_sources=DEFAULT_MAX_SOURCES):
+        """
+        Parameters:
+            graph: a networkx graph or a CompactGraph of words (all of one length)
+            components: the ComponentIndex of the graph, if already built
+            max_entries: budget for the total number of stored word ids
+            rng: random.Random used to choose the sources (seeded for reproducibility)
+            max_sources: greatest number of sources
+        """
+        if not isinstance(graph, CompactGraph):
+            graph = CompactGraph.from_networkx(graph)
+        self.graph = graph
+        self.components = components if components is not None else ComponentIndex(graph)
+        rng = rng if rng is not None else random.Random(0)
+
+        candidates = list(self.components.eligible)
+        rng.shuffle(candidates)
+        self.sources = []        # source word ids
+        self.layer_ids = []      # per source: reached ids in BFS order
+        self.layer_ends = []     # per source: end index of each distance layer
+        self.eccentricity = []   # per source: greatest distance from the source
+        stored = 0
+        for source_id in candidates:
+            if len(self.sources) >= max_sources or stored >= max_entries:
+                break
+            component_size = len(self.components.members[self.components.component_of[source_id]])
+            if self.sources and stored + component_size > max_entries:
+                continue
+            layer_ids, layer_ends = bfs_layer_ids(graph, source_id)
+            self.sources.append(source_id)
+            self.layer_ids.append(layer_ids)
+            self.layer_ends.append(layer_ends)
+            self.eccentricity.append(len(layer_ends) - 1)
+            stored += len(layer_ids)
+
+        # Lower bound on the diameter of each component (exact when all its words are sources).
+        self.component_diameter = {}
+        for source, eccentricity in zip(self.sources, self.eccentricity):
+            component_id = self.components.component_of[source]
+            if eccentricity > self.component_diameter.get(component_id, 0):
+                self.component_diameter[component_id] = eccentricity
+
+        # Sources sorted by eccentricity, so the sources that reach a distance are a suffix.
+        self._by_eccentricity = sorted(range(len(self.sources)), key=self.eccentricity.__getitem__)
+        self._sorted_eccentricity = [self.eccentricity[i] for i in self._by_eccentricity]
+        # (min_steps, max_steps) -> (source indexes, cumulative band sizes), see sample_pair.
+        self._band_weights = {}
+
+    def max_distance(self):
+        """Returns the longest ladder distance known to the index."""
+        return self._sorted_eccentricity[-1] if self._sorted_eccentricity else 0
+
+    def _band(self, source_index, min_steps, max_steps):
+        """Returns the [begin, end) range of layer_ids at distance min_steps..max_steps."""
+        layer_ends = self.layer_ends[source_index]
+        last = min(max_steps, len(layer_ends) - 1)
+        if last < min_steps:
+            return 0, 0
+        return layer_ends[min_steps - 1], layer_ends[last]
+
+    def band_size(self, min_steps, max_steps):
+        """Returns how many distinct (source, goal) pairs the index holds for a distance band."""
+        cumulative = self._weights(min_steps, max_steps)[1]
+        return cumulative[-1] if cumulative else 0
+
+    def _weights(self, min_steps, max_steps):
+        weights = self._band_weights.get((min_steps, max_steps))
+        if weights is None:
+            indexes, cumulative, total = [], [], 0
+            for i in self._by_eccentricity[bisect_left(self._sorted_eccentricity, min_steps):]:
+                begin, end = self._band(i, min_steps, max_steps)
+                if end > begin:
+                    total += end - begin
+                    indexes.append(i)
+                    cumulative.append(total)
+            weights = self._band_weights[(min_steps, max_steps)] = (indexes, cumulative)
+        return weights
+
+    def sample_pair(self, min_steps, max_steps=None, rng=random):
+        """
+        Draws a (start_word, goal_word, distance) triple with min_steps <= distance <= max_steps.
+
+        Every stored (source, goal) pair in the band is equally likely: the source is
+        chosen in proportion to the size of its band, then the goal uniformly within
+        it. Pairs are only uniform over the sampled sources, not over every pair of
+        the bucket.
+
+        Raises:
+            ValueError: If no stored source reaches min_steps.
+        """
+        if max_steps is None:
+            max_steps = min_steps
+        if min_steps < 1 or max_steps < min_steps:
+            raise ValueError("Distance band must satisfy 1 <= min_steps <= max_steps.")
+        indexes, cumulative = self._weights(min_steps, max_steps)
+        if not indexes:
+            raise ValueError("No ladder of {} or more steps exists in this bucket "
+                             "(longest known: {}).".format(min_steps, self.max_distance()))
+        pick = rng.randrange(cumulative[-1])
+        slot = bisect_right(cumulative, pick)
+        source_index = indexes[slot]
+        begin, _ = self._band(source_index, min_steps, max_steps)
+        position = begin + pick - (cumulative[slot - 1] if slot else 0)
+        distance = bisect_right(self.layer_ends[source_index], position)
+        words = self.graph.words
+        start, goal = words[self.sources[source_index]], words[self.layer_ids[source_index][position]]
+        # Ladders are symmetric, so randomly swap which end is the start word.
+        if rng.random() < 0.5:
+            start, goal = goal, start
+        return start, goal, distance
+
+    def pairs(self, min_steps, max_steps=None, count=1, rng=random):
+        """Yields count random (start_word, goal_word, distance) triples from a distance band."""
+        for _ in range(count):
+            yield self.sample_pair(min_steps, max_steps, rng)
+
+if __name__ == "__main__":
+    # Usage: python src/puzzles.py <dictionary_file> <length> <min_steps> <max_steps> [count] [seed]
+    # Prints "start,goal,distance" lines, e.g. 6-letter puzzles exactly 5-7 steps apart.
+    from dictionary import load_word_dictionary
+    from utils import get_distance_index
+
+    dictionary_file, length, min_steps, max_steps = sys.argv[1], int(sys.argv[2]), int(sys.argv[3]), int(sys.argv[4])
+    count = int(sys.argv[5]) if len(sys.argv) > 5 else 10
+    rng = random.Random(int(sys.argv[6])) if len(sys.argv) > 6 else random.Random()
+    index = get_distance_index(load_word_dictionary(dictionary_file), length, dictionary_file)
+    for start, goal, distance in index.pairs(min_steps, max_steps, count, rng):
+        print("{},{},{}".format(start, goal, distance))
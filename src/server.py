@@ -0,0 +1,265 @@
+# src/server.py
+
+import argparse
+import asyncio
+import json
+import random
+from concurrent.futures import ProcessPoolExecutor
+from algorithms import ALGORITHMS, search_path
+from batch import _init_worker, load_graphs, solve_chunk
+from cache import CACHE_DIR
+from dictionary import load_word_dictionary
+from graph import DIFFICULTY_LENGTHS
+from session import GameContext, GameSession, SessionStore, MOVE_MESSAGES
+from memo import PATH_CACHE
+from utils import get_length_index, select_valid_word_pair
+
+# Sessions kept at once; the least recently used one is dropped beyond this.
+MAX_SESSIONS = 100_000
+MAX_MOVES = 20
+
+def _text(request, field, default=""):
+    """
+    Returns a string field of a request (default if absent).
+
+    Raises:
+        ValueError: if the field is present but not a string.
+    """
+    value = request.get(field, default)
+    if value is not default and not isinstance(value, str):
+        raise ValueError("{!r} must be a string.".format(field))
+    return value
+
+class PuzzleService:
+    """
+    Serves many word ladder games at once over a JSON line protocol (see serve).
+
+    There is one shared graph per word length (loaded through the on-disk cache and
+    shared by every session of that length), and sessions are compact GameSession
+    objects (session.py) whose distance fields are shared per goal word. Beyond
+    max_sessions, the least recently used sessions are paged out to spill_file, or
+    dropped if there is none. Full searches (the "solve" op and
+    hints with an explicit algorithm) run in a process pool whose workers memory-map
+    the same cached graphs, so they never block the event loop.
+
+    Requests are JSON objects with an "op" field:
+        new_puzzle {difficulty}           -> {session, start, goal, length, optimal, max_moves}
+        hint       {session, algorithm?}  -> {hint}
+        validate   {session, word}        -> {valid}  (the game is not changed)
+        move       {session, word}        -> {accepted, current, score, status, message}
+        solve      {start, goal, algorithm?} -> {path}
+        end        {session}              -> {ended}
+        stats      {}                     -> {sessions, paged_sessions, path_cache}
+    An "id" field is echoed back. Errors are answered with {"error": message}, and
+    the connection stays open.
+    """
+
+    def __init__(self, dictionary_file, processes=None, max_sessions=MAX_SESSIONS,
+                 max_moves=MAX_MOVES, rng=None, spill_file=None, cache_dir=CACHE_DIR):
+        """
+        Parameters:
+            dictionary_file: dictionary the puzzles and graphs come from
+            processes: size of the search process pool (defaults to the CPU count);
+                0 runs searches in the event loop's thread instead
+            max_sessions: number of games kept in memory
+            max_moves: move limit of new games
+            rng: random.Random used to draw puzzles
+            spill_file: file the sessions beyond max_sessions are paged out to
+            cache_dir: directory of the on-disk graph cache
+        """
+        self.dictionary_file = dictionary_file
+        self.cache_dir = cache_dir
+        self.words = load_word_dictionary(dictionary_file)
+        self.max_sessions = max_sessions
+        self.max_moves = max_moves
+        self.rng = rng if rng is not None else random.Random()
+        # One GameContext (shared graph and rules) per word length.
+        self.contexts = {}
+        self.sessions = SessionStore(spill_file, self.contexts, max_sessions)
+        lengths = self.words.lengths()
+        # Build the graph and component index of every length (and the game context of
+        # the puzzle lengths) now: built on first use, they would block the event loop,
+        # and with it every connected client.
+        for length in lengths:
+            self.graph(length)
+        for length in set().union(*DIFFICULTY_LENGTHS.values()).intersection(lengths):
+            self.context(length)
+        self.executor = None
+        if processes != 0:
+            # Build any missing cache files here, once, so the workers only map them
+            # (rather than each building the same graphs and racing to write them).
+            load_graphs(dictionary_file, lengths, self.words, cache_dir=cache_dir)
+            self.executor = ProcessPoolExecutor(
+                processes, initializer=_init_worker,
+                initargs=(dictionary_file, lengths, False, cache_dir))
+
+    def close(self):
+        self.sessions.close()
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+
+    def graph(self, length):
+        """Returns the shared graph of a word length."""
+        return get_length_index(self.words, length, self.dictionary_file, self.cache_dir)[1]
+
+    def context(self, length):
+        """Returns the shared GameContext of a word length."""
+        context = self.contexts.get(length)
+        if context is None:
+            context = self.contexts[length] = GameContext(self.graph(length), self.max_moves, length)
+        return context
+
+    def session(self, request):
+        try:
+            return self.sessions.get(int(request.get("session")))
+        except (KeyError, TypeError, ValueError):
+            raise ValueError("Unknown session {!r}.".format(request.get("session")))
+
+    async def solve(self, start, goal, algorithm="bidirectional"):
+        """
+        Returns a shortest ladder between two words, or None. Answers come from the
+        shared path cache (memo.py) when possible and are searched in the pool otherwise.
+        """
+        if algorithm not in ALGORITHMS:
+            raise ValueError("Unknown algorithm {!r}.".format(algorithm))
+        if len(start) != len(goal) or start not in self.words or goal not in self.words:
+            return None
+        graph = self.graph(len(start))
+        found, path = PATH_CACHE.lookup(graph, start, goal, algorithm)
+        if found:
+            return path
+        if self.executor is None:
+            path = search_path(graph, start, goal, algorithm)
+        else:
+            loop = asyncio.get_running_loop()
+            results = await loop.run_in_executor(
+                self.executor, solve_chunk, (len(start), algorithm, [(start, goal)]))
+            path = results[0][2]
+        PATH_CACHE.store(graph, start, goal, algorithm, path)
+        return path
+
+    async def new_puzzle(self, request):
+        start, goal, _, _ = select_valid_word_pair(
+            self.words, _text(request, "difficulty", "easy"), dictionary_file=self.dictionary_file,
+            rng=self.rng, cache_dir=self.cache_dir)
+        game = GameSession(self.context(len(start)), start, goal)
+        session = str(self.sessions.add(game))
+        return {"session": session, "start": start, "goal": goal, "length": len(start),
+                "optimal": game.remaining, "max_moves": game.context.max_moves}
+
+    async def hint(self, request):
+        game = self.session(request)
+        algorithm = _text(request, "algorithm", None)
+        if algorithm is None:
+            return {"hint": game.request_hint()}
+        path = await self.solve(game.current_word, game.goal_word, algorithm)
+        return {"hint": path[1] if path and len(path) >= 2 else None}
+
+    async def validate(self, request):
+        game = self.session(request)
+        word = _text(request, "word").strip().lower()
+        return {"valid": game.is_valid_move(word)}
+
+    async def move(self, request):
+        game = self.session(request)
+        word = _text(request, "word").strip().lower()
+        outcome = None
+        if game.game_status() == "ongoing":
+            outcome = game.make_move(word)
+        return {"accepted": bool(outcome), "current": game.current_word, "score": game.score,
+                "status": game.game_status(), "message": MOVE_MESSAGES[outcome] if outcome else ""}
+
+    async def solve_request(self, request):
+        start = _text(request, "start").strip().lower()
+        goal = _text(request, "goal").strip().lower()
+        return {"path": await self.solve(start, goal, _text(request, "algorithm", "bidirectional"))}
+
+    async def end(self, request):
+        try:
+            return {"ended": self.sessions.remove(int(request.get("session")))}
+        except (TypeError, ValueError):
+            return {"ended": False}
+
+    async def stats(self, request):
+        return {"sessions": len(self.sessions), "paged_sessions": self.sessions.paged_count,
+                "path_cache": PATH_CACHE.stats()}
+
+    OPERATIONS = {
+        "new_puzzle": new_puzzle,
+        "hint": hint,
+        "validate": validate,
+        "move": move,
+        "solve": solve_request,
+        "end": end,
+        "stats": stats,
+    }
+
+    async def handle(self, request):
+        """Answers one request object (see the class docstring)."""
+        if not isinstance(request, dict):
+            raise ValueError("A request must be a JSON object.")
+        operation = self.OPERATIONS.get(request.get("op"))
+        if operation is None:
+            raise ValueError("Unknown op {!r}.".format(request.get("op")))
+        return await operation(self, request)
+
+    async def serve_client(self, reader, writer):
+        """Reads request lines from one connection and writes one response line per request."""
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                request = None
+                try:
+                    request = json.loads(line)
+                    response = await self.handle(request)
+                except (ValueError, TypeError) as e:
+                    response = {"error": str(e)}
+                except Exception as e:
+                    # A bug in one op must not drop the connection (and its other requests).
+                    response = {"error": "Internal error: {}: {}".format(type(e).__name__, e)}
+                if isinstance(request, dict) and "id" in request:
+                    response["id"] = request["id"]
+                writer.write(json.dumps(response).encode("utf-8") + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+async def serve(service, host="127.0.0.1", port=8765):
+    """Starts listening; returns the asyncio server (port 0 picks a free port)."""
+    return await asyncio.start_server(service.serve_client, host, port)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Word ladder puzzle service (JSON lines over TCP).")
+    parser.add_argument("--dictionary", default="data/oxford_words.txt")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--processes", type=int, default=None,
+                        help="search worker processes (0 searches in the server process)")
+    parser.add_argument("--max-sessions", type=int, default=MAX_SESSIONS,
+                        help="sessions kept in memory")
+    parser.add_argument("--spill-file", default=None,
+                        help="page idle sessions beyond --max-sessions out to this file instead of dropping them")
+    args = parser.parse_args(argv)
+
+    async def run():
+        service = PuzzleService(args.dictionary, args.processes, args.max_sessions,
+                                spill_file=args.spill_file)
+        server = await serve(service, args.host, args.port)
+        print("Listening on {}:{}".format(*server.sockets[0].getsockname()[:2]))
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            service.close()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
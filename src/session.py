@@ -0,0 +1,374 @@
+# src/session.py
+
+import itertools
+import os
+import struct
+import sys
+from array import array
+from collections import OrderedDict
+from compact import CompactGraph
+from distances import get_distance_field
+
+# Outcomes of GameSession.make_move. MOVE_INVALID is 0, so a rejected move is falsy
+# like WordLadderGame.make_move's False.
+MOVE_INVALID = 0
+MOVE_IMPROVED = 1
+MOVE_WORSENED = 2
+MOVE_UNCHANGED = 3
+MOVE_UNREACHABLE = 4
+
+# What WordLadderGame (and play_game, for rejected moves) prints for each outcome;
+# sessions never print.
+MOVE_MESSAGES = {
+    MOVE_INVALID: "Invalid move. Ensure you change only one letter from the current word.",
+    MOVE_IMPROVED: "Good move! Path improved. +10 points.",
+    MOVE_WORSENED: "Not optimal move. -5 points.",
+    MOVE_UNCHANGED: "Move did not change the estimated path length. No points.",
+    MOVE_UNREACHABLE: "Warning: No path found from the new word to the goal. (This should not happen)",
+}
+
+MAX_MOVES = 20
+# remaining value of a session whose current word cannot reach the goal.
+NO_PATH = -1
+
+# Snapshot layout (little-endian throughout): magic, context key, node count of the
+# context's graph, score, remaining, goal id, move count, then the move ids (uint16
+# or int32, as chosen by the context).
+MAGIC = b"WLSS"
+SNAPSHOT = struct.Struct("<4sIIiiII")
+
+# Sessions kept in memory by a SessionStore before the least recently used are paged out.
+DEFAULT_MAX_RESIDENT = 10_000
+
+class GameContext:
+    """
+    State shared by every session of one word length: the CompactGraph (which also
+    holds the word list and word -> id index), the game rules, and the distance
+    fields of the goals of live sessions.
+
+    get_distance_field only keeps MAX_FIELDS_PER_GRAPH goals, far fewer than a
+    server has sessions, so the context holds the field of every goal a session
+    was acquired for (see SessionStore) until the last such session is released.
+    """
+
+    __slots__ = ("graph", "key", "max_moves", "typecode", "fields")
+
+    def __init__(self, graph, max_moves=MAX_MOVES, key=None):
+        """
+        Parameters:
+            graph: a CompactGraph (a networkx graph is converted once)
+            max_moves: move limit of the sessions
+            key: number identifying the context in snapshots (defaults to the word length)
+        """
+        if not isinstance(graph, CompactGraph):
+            graph = CompactGraph.from_networkx(graph)
+        self.graph = graph
+        self.key = key if key is not None else (len(graph.words[0]) if graph.words else 0)
+        self.max_moves = max_moves
+        # Move histories use 2 bytes per move whenever the word ids fit.
+        self.typecode = "H" if len(graph.words) <= 0xFFFF else "i"
+        # goal id -> [DistanceField, number of sessions holding it]
+        self.fields = {}
+
+    def distances(self, goal_id):
+        """Returns the shared DistanceField of a goal (a table row when a distance table is registered)."""
+        entry = self.fields.get(goal_id)
+        if entry is not None:
+            return entry[0]
+        return get_distance_field(self.graph, self.graph.words[goal_id])
+
+    def acquire(self, goal_id):
+        """Keeps the distance field of a goal until a matching release(goal_id)."""
+        entry = self.fields.get(goal_id)
+        if entry is None:
+            entry = self.fields[goal_id] = [self.distances(goal_id), 0]
+        entry[1] += 1
+
+    def release(self, goal_id):
+        """Undoes one acquire(goal_id); the field is dropped with its last holder."""
+        entry = self.fields.get(goal_id)
+        if entry is not None:
+            entry[1] -= 1
+            if entry[1] <= 0:
+                del self.fields[goal_id]
+
+class GameSession:
+    """
+    The state of one word ladder game in a few dozen bytes: word ids instead of
+    strings, an array of move ids instead of a list, no per-session reference to
+    the word list or a distance field, and __slots__ instead of a __dict__.
+
+    Scoring and hints follow WordLadderGame, but nothing is printed: make_move
+    returns an outcome (see MOVE_MESSAGES). snapshot() and GameSession.restore()
+    convert a session to and from bytes, e.g. to page idle games out to disk.
+    """
+
+    __slots__ = ("context", "goal", "moves", "score", "remaining")
+
+    def __init__(self, context, start_word, goal_word):
+        """
+        Raises:
+            ValueError: if a word is not in the context's graph.
+        """
+        index = context.graph.index
+        if start_word not in index or goal_word not in index:
+            raise ValueError("Start and goal words must be in the graph.")
+        self.context = context
+        self.goal = index[goal_word]
+        self.moves = array(context.typecode, [index[start_word]])
+        self.score = 0
+        remaining = context.distances(self.goal).distance(start_word)
+        self.remaining = remaining if remaining is not None else NO_PATH
+
+    @property
+    def start_word(self):
+        return self.context.graph.words[self.moves[0]]
+
+    @property
+    def current_word(self):
+        return self.context.graph.words[self.moves[-1]]
+
+    @property
+    def goal_word(self):
+        return self.context.graph.words[self.goal]
+
+    @property
+    def moves_taken(self):
+        """The words played so far, starting with the start word."""
+        words = self.context.graph.words
+        return [words[word_id] for word_id in self.moves]
+
+    def is_valid_move(self, next_word):
+        """Returns True if next_word is one letter away from the current word."""
+        graph = self.context.graph
+        next_id = graph.index.get(next_word)
+        return next_id is not None and next_id in graph.neighbor_ids(self.moves[-1])
+
+    def make_move(self, next_word):
+        """
+        Plays next_word if it is a valid move and scores it like WordLadderGame:
+        +10 if the remaining distance shrank, -5 (not below 0) if it grew.
+
+        Returns:
+            MOVE_INVALID (0) if the move was rejected, otherwise MOVE_IMPROVED,
+            MOVE_WORSENED, MOVE_UNCHANGED or MOVE_UNREACHABLE.
+        """
+        if not self.is_valid_move(next_word):
+            return MOVE_INVALID
+        self.moves.append(self.context.graph.index[next_word])
+        remaining = self.context.distances(self.goal).distance(next_word)
+        if remaining is None:
+            return MOVE_UNREACHABLE
+        previous = self.remaining
+        self.remaining = remaining
+        if previous == NO_PATH or remaining < previous:
+            self.score += 10
+            return MOVE_IMPROVED
+        if remaining > previous:
+            self.score = max(self.score - 5, 0)
+            return MOVE_WORSENED
+        return MOVE_UNCHANGED
+
+    def request_hint(self):
+        """Returns a word one move closer to the goal, or None."""
+        return self.context.distances(self.goal).next_step(self.current_word)
+
+    def hint_options(self):
+        """Returns every word that is one move closer to the goal."""
+        return self.context.distances(self.goal).next_steps(self.current_word)
+
+    def game_status(self):
+        """Returns "win", "lose" (out of moves) or "ongoing"."""
+        if self.moves[-1] == self.goal:
+            return "win"
+        if len(self.moves) - 1 >= self.context.max_moves:
+            return "lose"
+        return "ongoing"
+
+    def snapshot(self):
+        """Returns the session as bytes (see GameSession.restore)."""
+        moves = self.moves
+        if sys.byteorder == "big":
+            moves = array(moves.typecode, moves)
+            moves.byteswap()
+        return SNAPSHOT.pack(MAGIC, self.context.key, len(self.context.graph.words), self.score,
+                             self.remaining, self.goal, len(moves)) + moves.tobytes()
+
+    @classmethod
+    def restore(cls, data, contexts):
+        """
+        Rebuilds a session from snapshot() bytes.
+
+        Parameters:
+            data: the snapshot
+            contexts: the GameContext of the session, or a dict of contexts by key
+
+        Raises:
+            ValueError: if the data is not a snapshot, was taken with another context
+                or holds word ids outside the context's graph.
+        """
+        if len(data) < SNAPSHOT.size:
+            raise ValueError("Truncated session snapshot.")
+        magic, key, node_count, score, remaining, goal, move_count = SNAPSHOT.unpack_from(data)
+        context = contexts if isinstance(contexts, GameContext) else contexts.get(key)
+        if magic != MAGIC or context is None or context.key != key or len(context.graph.words) != node_count:
+            raise ValueError("Snapshot does not belong to a known game context.")
+        moves = array(context.typecode)
+        body = data[SNAPSHOT.size:]
+        if len(body) % moves.itemsize:
+            raise ValueError("Truncated session snapshot.")
+        moves.frombytes(body)
+        if len(moves) != move_count or not moves:
+            raise ValueError("Truncated session snapshot.")
+        if sys.byteorder == "big":
+            moves.byteswap()
+        if goal >= node_count or min(moves) < 0 or max(moves) >= node_count:
+            raise ValueError("Session snapshot holds word ids outside the graph.")
+        session = cls.__new__(cls)
+        session.context = context
+        session.goal = goal
+        session.moves = moves
+        session.score = score
+        session.remaining = remaining
+        return session
+
+class SessionStore:
+    """
+    Holds many GameSessions by integer id, keeping the most recently used
+    max_resident in memory and the rest as snapshots in one spill file on disk
+    (or, without a spill file, dropping the least recently used).
+
+    The spill file is append-only with an in-memory (offset, size) index; it is
+    rewritten without the dead records once they outweigh the live ones.
+
+    Every stored session, resident or paged out, holds its goal's distance field in
+    its GameContext (GameContext.acquire), so moves and hints never wait for a BFS
+    however many goals are in play.
+    """
+
+    def __init__(self, path, contexts, max_resident=DEFAULT_MAX_RESIDENT):
+        """
+        Parameters:
+            path: spill file (created, and truncated if it exists), or None
+            contexts: dict of GameContext by key, used to restore sessions
+            max_resident: sessions kept in memory
+        """
+        self.path = path
+        self.contexts = contexts
+        self.max_resident = max_resident
+        self._resident = OrderedDict()  # session id -> GameSession, least recently used first
+        # session id -> (offset, size) in the spill file, context key, goal id
+        self._paged = {}
+        self._ids = itertools.count(1)
+        self._file = open(path, "w+b") if path is not None else None
+        self._dead_bytes = 0
+        self.page_outs = 0
+        self.page_ins = 0
+
+    def __len__(self):
+        return len(self._resident) + len(self._paged)
+
+    def __contains__(self, session_id):
+        return session_id in self._resident or session_id in self._paged
+
+    @property
+    def resident_count(self):
+        return len(self._resident)
+
+    @property
+    def paged_count(self):
+        return len(self._paged)
+
+    def add(self, session):
+        """Stores a session and returns its id."""
+        session_id = next(self._ids)
+        session.context.acquire(session.goal)
+        self._resident[session_id] = session
+        self._trim()
+        return session_id
+
+    def get(self, session_id):
+        """
+        Returns a session, reading it back from the spill file if it was paged out.
+
+        Raises:
+            KeyError: if there is no such session.
+        """
+        session = self._resident.get(session_id)
+        if session is not None:
+            self._resident.move_to_end(session_id)
+            return session
+        offset, size, key, goal = self._paged.pop(session_id)
+        self._dead_bytes += size
+        self._file.seek(offset)
+        try:
+            session = GameSession.restore(self._file.read(size), self.contexts)
+        except ValueError:
+            self.contexts[key].release(goal)
+            raise
+        self.page_ins += 1
+        self._resident[session_id] = session
+        self._trim()
+        return session
+
+    def remove(self, session_id):
+        """Drops a session; returns False if there was none."""
+        session = self._resident.pop(session_id, None)
+        if session is not None:
+            session.context.release(session.goal)
+            return True
+        record = self._paged.pop(session_id, None)
+        if record is None:
+            return False
+        offset, size, key, goal = record
+        self._dead_bytes += size
+        self.contexts[key].release(goal)
+        return True
+
+    def _trim(self):
+        if len(self._resident) <= self.max_resident:
+            return
+        if self._file is None:
+            while len(self._resident) > self.max_resident:
+                session = self._resident.popitem(last=False)[1]
+                session.context.release(session.goal)
+            return
+        self._file.seek(0, os.SEEK_END)
+        while len(self._resident) > self.max_resident:
+            session_id, session = self._resident.popitem(last=False)
+            data = session.snapshot()
+            self._paged[session_id] = (self._file.tell(), len(data), session.context.key, session.goal)
+            self._file.write(data)
+            self.page_outs += 1
+        self._file.flush()
+        if self._dead_bytes > (1 << 20) and self._dead_bytes > self._file.tell() - self._dead_bytes:
+            self._compact()
+
+    def _compact(self):
+        """Rewrites the spill file with the live records only."""
+        tmp_path = "{}.{}.tmp".format(self.path, os.getpid())
+        with open(tmp_path, "wb") as out:
+            for session_id, (offset, size, key, goal) in self._paged.items():
+                self._file.seek(offset)
+                self._paged[session_id] = (out.tell(), size, key, goal)
+                out.write(self._file.read(size))
+        self._file.close()
+        os.replace(tmp_path, self.path)
+        self._file = open(self.path, "r+b")
+        self._dead_bytes = 0
+
+    def close(self):
+        """Drops every session and closes and deletes the spill file."""
+        for session in self._resident.values():
+            session.context.release(session.goal)
+        for offset, size, key, goal in self._paged.values():
+            self.contexts[key].release(goal)
+        self._resident.clear()
+        self._paged.clear()
+        if self._file is None:
+            return
+        self._file.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
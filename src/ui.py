@@ -2,21 +2,32 @@
 
 import pygame
 import sys
-from graph import load_dictionary
-from utils import select_valid_word_pair
+import time
+from collections import OrderedDict
+from dictionary import load_word_dictionary
+from utils import select_puzzle
 from game import WordLadderGame
+from game_worker import GameWorker, game_view
+from instrumentation import LatencyWindow
 
 # ----- UI Configuration and Color Scheme -----
 
 # Window dimensions
 WINDOW_WIDTH, WINDOW_HEIGHT = 800, 600
 
+# Frames per second the loop is paced to
+FPS = 30
+
 # Colors (using neutral tones and high contrast for text)
 BG_COLOR      = (245, 245, 245)   # very light grey background
 GRID_COLOR    = (220, 220, 220)   # subtle grid lines for a "graph" look
 TEXT_COLOR    = (50, 50, 50)      # dark grey for text
 INPUT_BG      = (255, 255, 255)   # white input box
 BORDER_COLOR  = (200, 200, 200)   # light grey border
+DEBUG_COLOR   = (180, 40, 40)     # debug overlay text
+
+# Rendered text surfaces kept by TextCache (typed input produces many strings).
+TEXT_CACHE_SIZE = 256
 
 # ----- Helper Drawing Functions -----
 
@@ -30,11 +41,122 @@ def draw_background(surface):
     for y in range(0, WINDOW_HEIGHT, 50):
         pygame.draw.line(surface, GRID_COLOR, (0, y), (WINDOW_WIDTH, y))
 
-def render_text_center(surface, text, font, color, center):
+def make_background(input_box):
+    """Pre-renders the grid and the (empty) input box once; frames copy from it."""
+    background = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
+    draw_background(background)
+    pygame.draw.rect(background, INPUT_BG, input_box)
+    pygame.draw.rect(background, BORDER_COLOR, input_box, 2)
+    if pygame.display.get_surface() is not None:
+        background = background.convert()
+    return background
+
+class TextCache:
+    """
+    Rendered text surfaces keyed by (text, font, color), least recently used
+    dropped beyond max_entries. The score, instructions and words only change after
+    a move, so almost every frame is served without calling font.render.
+    """
+
+    def __init__(self, max_entries=TEXT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, text, font, color):
+        key = (text, font, color)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self._surfaces.move_to_end(key)
+            return surface
+        self.misses += 1
+        surface = font.render(text, True, color)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)
+        return surface
+
+TEXT_CACHE = TextCache()
+
+def render_text_center(surface, text, font, color, center, cache=TEXT_CACHE):
     """Renders text centered on a given coordinate."""
-    text_surface = font.render(text, True, color)
+    text_surface = cache.render(text, font, color)
     text_rect = text_surface.get_rect(center=center)
     surface.blit(text_surface, text_rect)
+    return text_rect
+
+class Scene:
+    """
+    Draws named text items over a pre-rendered background and only repaints what
+    changed since the previous frame.
+
+    Items are name -> (text, font, color, anchor, position), where anchor is a Rect
+    attribute such as "center" or "topleft". draw() restores the background under
+    every item that was removed, moved or changed, redraws the items touching those
+    areas and returns the dirty rectangles for pygame.display.update.
+    """
+
+    def __init__(self, screen, background, cache=TEXT_CACHE):
+        self.screen = screen
+        self.background = background
+        self.cache = cache
+        self._drawn = {}  # name -> (item, rect) of the last frame
+        self._full = True
+
+    def invalidate(self):
+        """Repaints the whole window on the next draw (e.g. after an expose event)."""
+        self._full = True
+
+    def draw(self, items):
+        placed = {}
+        for name, item in items.items():
+            text, font, color, anchor, position = item
+            surface = self.cache.render(text, font, color)
+            placed[name] = (item, surface, surface.get_rect(**{anchor: position}))
+
+        if self._full:
+            dirty = [self.screen.get_rect()]
+            self._full = False
+        else:
+            dirty = []
+            for name, (item, rect) in self._drawn.items():
+                if name not in placed or placed[name][0] != item:
+                    dirty.append(rect)
+            for name, (item, surface, rect) in placed.items():
+                previous = self._drawn.get(name)
+                if previous is None or previous[0] != item:
+                    dirty.append(rect)
+
+        self._drawn = {name: (item, rect) for name, (item, surface, rect) in placed.items()}
+        if not dirty:
+            return []
+        for rect in dirty:
+            self.screen.blit(self.background, rect, rect)
+        # Unchanged items overlapping a repainted area are drawn again on top of it.
+        for item, surface, rect in placed.values():
+            if rect.collidelist(dirty) != -1:
+                self.screen.blit(surface, rect)
+        return dirty
+
+def debug_overlay_items(font, clock, frame_times, worker):
+    """Scene items showing FPS, frame time and search latency (toggled with F3)."""
+    frame = frame_times.summary()
+    search = worker.latency.summary()
+    last = worker.latency.last()
+    lines = [
+        "FPS {:.1f}".format(clock.get_fps()),
+        "frame p50 {} p99 {} max {} ms".format(*(_ms(frame[k]) for k in ("p50", "p99", "max"))),
+        "search last {} p50 {} p99 {} ms".format(
+            _ms(last * 1000 if last is not None else None), _ms(search["p50"]), _ms(search["p99"])),
+        "pending jobs {}".format(worker.pending),
+    ]
+    return {"debug{}".format(i): (line, font, DEBUG_COLOR, "topleft", (10, 60 + i * 20))
+            for i, line in enumerate(lines)}
+
+def _ms(value):
+    return "-" if value is None else "{:.1f}".format(value)
 
 # ----- UI Main Loop -----
 
@@ -47,76 +169,100 @@ def ui_loop(game):
     # Define fonts
     main_font = pygame.font.SysFont("Arial", 48)
     small_font = pygame.font.SysFont("Arial", 32)
+    debug_font = pygame.font.SysFont("Courier", 16)
     
     input_text = ""  # User input field
+    message = ""     # Result of the last move or hint
+    show_debug = False
+    
+    # Moves and hints run on a worker thread; the loop only draws the latest view
+    # it reported, so a slow search never stalls a frame.
+    worker = GameWorker(game)
+    view = game_view(game)
+    frame_times = LatencyWindow(FPS * 4)
     
     # Define row positions: top, middle, bottom.
     # The current word will always appear in the middle row.
     top_y    = WINDOW_HEIGHT // 3 - 50
     middle_y = WINDOW_HEIGHT // 2
     bottom_y = 2 * WINDOW_HEIGHT // 3 + 50
+    # The input box for the middle row is part of the pre-rendered background.
+    input_box = pygame.Rect(WINDOW_WIDTH//2 - 200, middle_y - 30, 400, 60)
+    scene = Scene(screen, make_background(input_box))
     
     running = True
     while running:
+        frame_started = time.perf_counter()
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
                 break
+            elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                scene.invalidate()
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_BACKSPACE:
                     input_text = input_text[:-1]
+                elif event.key == pygame.K_F3:
+                    show_debug = not show_debug
+                elif event.key == pygame.K_TAB:
+                    worker.submit_hint()
+                    message = "Searching for a hint..."
                 elif event.key == pygame.K_RETURN:
                     # Process the input as a guess when Enter is pressed.
                     guess = input_text.strip().lower()
                     input_text = ""
                     if guess != "":
                         if guess not in game.words:
-                            print("Invalid word (not in dictionary or wrong length).")
+                            message = "Invalid word (not in dictionary or wrong length)."
                         else:
-                            if game.make_move(guess):
-                                # After a valid move, check game status.
-                                if game.game_status() == "win":
-                                    print("You win!")
-                                    running = False
-                            else:
-                                print("Invalid move. Must change exactly one letter.")
+                            worker.submit_move(guess)
                 else:
                     # Only accept alphabetic input
                     if event.unicode.isalpha():
                         input_text += event.unicode
         
-        # Draw the background and grid.
-        draw_background(screen)
+        for result in worker.poll():
+            view = result.view
+            if result.error is not None:
+                message = "Error: {}".format(result.error)
+            elif result.kind == "hint":
+                message = "Hint: try {}".format(result.value) if result.value else "No hint available."
+            elif not result.value:
+                message = "Invalid move. Must change exactly one letter."
+            else:
+                message = "Move accepted."
+            if view.status == "win":
+                print("You win!")
+                running = False
+            elif view.status == "lose":
+                message = "Out of moves!"
         
-        # Determine the words to display:
-        # Top row: previous word (or start word if no move has been made yet)
-        if len(game.moves_taken) > 1:
-            top_word = game.moves_taken[-2]
-        else:
-            top_word = game.start_word
         # Middle row: if input_text is empty, show the current word (centered).
-        current_display = input_text if input_text != "" else game.current_word
-        # Bottom row: always show the goal word.
-        goal_word = game.goal_word
-        
-        # Draw the rows centered horizontally.
-        render_text_center(screen, top_word, main_font, TEXT_COLOR, (WINDOW_WIDTH//2, top_y))
-        
-        # Draw the input box for the middle row.
-        input_box = pygame.Rect(WINDOW_WIDTH//2 - 200, middle_y - 30, 400, 60)
-        pygame.draw.rect(screen, INPUT_BG, input_box)
-        pygame.draw.rect(screen, BORDER_COLOR, input_box, 2)
-        render_text_center(screen, current_display, main_font, TEXT_COLOR, input_box.center)
-        
-        render_text_center(screen, goal_word, main_font, TEXT_COLOR, (WINDOW_WIDTH//2, bottom_y))
-        
-        # Display score and instructions at the top and bottom.
-        render_text_center(screen, f"Score: {game.score}", small_font, TEXT_COLOR, (WINDOW_WIDTH//2, 30))
-        render_text_center(screen, "Type your guess and press Enter. BACKSPACE to delete.", small_font, TEXT_COLOR, (WINDOW_WIDTH//2, WINDOW_HEIGHT - 30))
+        current_display = input_text if input_text != "" else view.current_word
+        items = {
+            # Top row: previous word (or start word if no move has been made yet)
+            "top": (view.previous_word, main_font, TEXT_COLOR, "center", (WINDOW_WIDTH//2, top_y)),
+            "middle": (current_display, main_font, TEXT_COLOR, "center", input_box.center),
+            # Bottom row: always show the goal word.
+            "goal": (view.goal_word, main_font, TEXT_COLOR, "center", (WINDOW_WIDTH//2, bottom_y)),
+            # Score, the last message and instructions at the top and bottom.
+            "score": (f"Score: {view.score}", small_font, TEXT_COLOR, "center", (WINDOW_WIDTH//2, 30)),
+            "message": (message, small_font, TEXT_COLOR, "center", (WINDOW_WIDTH//2, WINDOW_HEIGHT - 75)),
+            "help": ("Enter: guess  TAB: hint  F3: stats", small_font, TEXT_COLOR, "center", (WINDOW_WIDTH//2, WINDOW_HEIGHT - 30)),
+        }
+        if show_debug:
+            items.update(debug_overlay_items(debug_font, clock, frame_times, worker))
         
-        pygame.display.flip()
-        clock.tick(30)
+        # Only the rectangles that changed are sent to the display; an idle frame
+        # neither draws nor updates anything.
+        dirty = scene.draw(items)
+        if dirty:
+            pygame.display.update(dirty)
+        # Time spent on this frame's work, excluding the wait for the next tick.
+        frame_times.add(time.perf_counter() - frame_started)
+        clock.tick(FPS)
     
+    worker.close()
     pygame.quit()
 
 # ----- Main Function to Launch the UI -----
@@ -124,10 +270,10 @@ def ui_loop(game):
 def main():
     # Load the dictionary and select a valid word pair.
     dictionary_file = "data/oxford_words.txt"  # Adjust path as needed.
-    words = load_dictionary(dictionary_file)
+    words = load_word_dictionary(dictionary_file)
     difficulty = input("Enter difficulty level (easy, medium, hard): ").strip().lower()
     try:
-        start_word, goal_word, same_length_words, graph = select_valid_word_pair(words, difficulty)
+        start_word, goal_word, same_length_words, graph = select_puzzle(words, difficulty, dictionary_file)
     except ValueError as e:
         print("Error:", e)
         sys.exit(1)
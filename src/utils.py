@@ -1,38 +1,158 @@
 # src/utils.py
 
-import networkx as nx
-from graph import select_start_end_words, build_graph
+import random
+from graph import filter_words_by_difficulty, build_graph, difficulty_lengths
+from cache import CACHE_DIR, get_graph
+from dictionary import WordDictionary
+from distance_table import get_distance_table, table_for
+from components import ComponentIndex
+from puzzles import LadderDistanceIndex
+from puzzle_bank import load_puzzle_bank
 
-def select_valid_word_pair(words, difficulty, max_attempts=10):
+# (dictionary file, word length) or (None, id(words), word length) -> (words, same_length_words, graph, component_index)
+# so the graph and component index of a length are built only once per process.
+_LENGTH_INDEXES = {}
+# Same keys -> (words, LadderDistanceIndex)
+_DISTANCE_INDEXES = {}
+
+def _index_key(words, length, dictionary_file):
+    if dictionary_file is None:
+        return (None, id(words), length)
+    return (dictionary_file, length)
+
+def _store_index(indexes, key, entry):
+    """
+    Adds an entry to one of the caches above. Entries of callers without a
+    dictionary_file are keyed by id(words) and hold the words object itself, so
+    only those of the most recent such object are kept: a caller passing fresh
+    lists would otherwise keep every list, and its graphs, alive.
+    """
+    if key[0] is None:
+        for other in [k for k, v in indexes.items() if k[0] is None and v[0] is not entry[0]]:
+            del indexes[other]
+    indexes[key] = entry
+
+def get_length_index(words, length, dictionary_file=None, cache_dir=CACHE_DIR):
+    """
+    Returns the words, graph and component index for one word length, building them
+    on the first call and reusing them afterwards.
+
+    Parameters:
+        words (list): The full dictionary of words (a list or a WordDictionary).
+        length (int): The word length.
+        dictionary_file (str): Path the words were loaded from. When given, the graph is
+            loaded from (or saved to) the on-disk cache.
+        cache_dir (str): Directory of the on-disk cache.
+
+    Returns:
+        tuple: (same_length_words, graph, component_index)
+    """
+    key = _index_key(words, length, dictionary_file)
+    entry = _LENGTH_INDEXES.get(key)
+    # The words object itself is kept in the entry so a recycled id() never matches.
+    if entry is None or entry[0] is not words:
+        if isinstance(words, WordDictionary):
+            same_length_words = words.bucket(length)
+        else:
+            same_length_words = [word for word in words if len(word) == length]
+        if dictionary_file is not None:
+            graph = get_graph(dictionary_file, length, words, cache_dir)
+            # Registers the all-pairs distance table of the length, if one was built.
+            get_distance_table(dictionary_file, length, graph, cache_dir=cache_dir)
+        else:
+            graph = build_graph(same_length_words)
+        entry = (words, same_length_words, graph, ComponentIndex(graph))
+        _store_index(_LENGTH_INDEXES, key, entry)
+    return entry[1:]
+
+def get_distance_index(words, length, dictionary_file=None, cache_dir=CACHE_DIR):
     """
-    Attempts to select a valid word pair (start and end words) based on the chosen difficulty,
+    Returns the LadderDistanceIndex (precomputed BFS layers) for one word length,
+    building it on the first call and reusing it afterwards.
+    """
+    key = _index_key(words, length, dictionary_file)
+    entry = _DISTANCE_INDEXES.get(key)
+    if entry is None or entry[0] is not words:
+        _, graph, components = get_length_index(words, length, dictionary_file, cache_dir)
+        entry = (words, LadderDistanceIndex(graph, components))
+        _store_index(_DISTANCE_INDEXES, key, entry)
+    return entry[1]
+
+def select_word_pair_by_distance(words, length, min_steps, max_steps=None, dictionary_file=None, rng=random,
+                                 cache_dir=CACHE_DIR):
+    """
+    Selects a word pair whose shortest ladder is between min_steps and max_steps moves
+    (for example 6-letter words 5-7 steps apart), using the length's distance table
+    when one exists (see distance_table.py) and the precomputed BFS layers otherwise.
+
+    Returns:
+        tuple: (start_word, end_word, same_length_words, graph)
+
+    Raises:
+        ValueError: If no pair of that length is that far apart.
+    """
+    same_length_words, graph, _ = get_length_index(words, length, dictionary_file, cache_dir)
+    table = table_for(graph)
+    if table is not None:
+        start_word, end_word, _ = table.sample_pair(min_steps, max_steps, rng)
+    else:
+        start_word, end_word, _ = get_distance_index(words, length, dictionary_file, cache_dir).sample_pair(
+            min_steps, max_steps, rng)
+    return start_word, end_word, same_length_words, graph
+
+def select_valid_word_pair(words, difficulty, max_attempts=10, dictionary_file=None, rng=random,
+                           cache_dir=CACHE_DIR):
+    """
+    Selects a valid word pair (start and end words) based on the chosen difficulty,
     ensuring that there exists a valid transformation path between them in the generated graph.
 
+    Both words are drawn from the same connected component of the word graph, so the
+    pair is always solvable and no search or retry is needed.
+
     Parameters:
         words (list): The full dictionary of words.
         difficulty (str): The chosen difficulty level ('easy', 'medium', 'hard').
-        max_attempts (int): Maximum number of attempts to find a valid pair.
+        max_attempts (int): Kept for compatibility; pairs never need to be retried.
+        dictionary_file (str): Path the words were loaded from. When given, the graph of
+            each word length is loaded from (or saved to) the on-disk cache.
+        rng: a random.Random instance (defaults to the random module).
+        cache_dir (str): Directory of the on-disk cache.
 
     Returns:
         tuple: (start_word, end_word, same_length_words, graph) if a valid pair is found.
 
     Raises:
-        ValueError: If no valid pair is found after max_attempts.
-    """
-    attempts = 0
-    while attempts < max_attempts:
-        attempts += 1
-        # Select a random start and end word based on difficulty.
-        start_word, end_word, same_length_words = select_start_end_words(words, difficulty)
-        # Build the graph using only words of the same length.
-        graph = build_graph(same_length_words)
-        print(f"Attempt {attempts}: Testing word pair {start_word} -> {end_word}")
-        
-        # Verify if a transformation path exists between start and end words.
-        if nx.has_path(graph, start_word, end_word):
-            print("✓ A path exists between these words!")
-            return start_word, end_word, same_length_words, graph
-        else:
-            print("✗ No path exists between these words. Retrying...")
+        ValueError: If the difficulty has no words, or no two of its words are connected.
+    """
+    filtered = filter_words_by_difficulty(words, difficulty)
+    if not filtered:
+        raise ValueError("No words available for the chosen difficulty.")
+    # Pick the length the same way a random start word would.
+    length = len(rng.choice(filtered))
+    same_length_words, graph, components = get_length_index(words, length, dictionary_file, cache_dir)
+    start_word, end_word = components.sample_pair(rng)
+    return start_word, end_word, same_length_words, graph
 
-    raise ValueError(f"Failed to find a valid word pair after {max_attempts} attempts.")
+def select_puzzle(words, difficulty, dictionary_file, rng=random, cache_dir=CACHE_DIR):
+    """
+    Draws a puzzle of the chosen difficulty from the dictionary's puzzle bank in O(1)
+    (see puzzle_bank.py), falling back to select_valid_word_pair when no bank was
+    generated or the bank has no puzzle of the difficulty's word lengths. Only the
+    graph of the drawn word length is loaded, from the cache.
+
+    Returns:
+        tuple: (start_word, end_word, same_length_words, graph)
+    """
+    bank = load_puzzle_bank(dictionary_file, cache_dir=cache_dir)
+    if bank is None or not any(bank.count(length) for length in difficulty_lengths(difficulty)):
+        return select_valid_word_pair(words, difficulty, dictionary_file=dictionary_file, rng=rng,
+                                      cache_dir=cache_dir)
+    puzzle = bank.draw(difficulty, rng)
+    length = len(puzzle.start)
+    if isinstance(words, WordDictionary):
+        same_length_words = words.bucket(length)
+    else:
+        same_length_words = [word for word in words if len(word) == length]
+    graph = get_graph(dictionary_file, length, words, cache_dir)
+    get_distance_table(dictionary_file, length, graph, cache_dir=cache_dir)
+    return puzzle.start, puzzle.goal, same_length_words, graph
@@ -0,0 +1,150 @@
+# src/vectorized.py
+
+import weakref
+from array import array
+import numpy as np
+from compact import CompactGraph
+
+# NumPy versions of the letter-by-letter loops (differ_by_one, algorithms.heuristic).
+# A bucket of N words of length L is encoded as an (N, L) array of letter codes, so
+# comparing a word with a whole bucket is one array operation instead of N Python
+# generator expressions. numpy is optional: compact.py and algorithms.py import this
+# module only for large graphs, and fall back to the pure-Python code without numpy.
+
+# Encoded letters of a CompactGraph, computed on first use.
+_CODES = weakref.WeakKeyDictionary()
+
+def encode_words(words):
+    """
+    Encodes words of one length as an (N, L) array: uint8 bytes when every word is
+    ASCII, uint32 code points otherwise.
+
+    Raises:
+        ValueError: if the words do not all have the same length.
+    """
+    words = list(words)
+    if not words:
+        return np.zeros((0, 0), dtype=np.uint8)
+    length = len(words[0])
+    if any(len(word) != length for word in words):
+        raise ValueError("encode_words needs words of a single length.")
+    joined = "".join(words)
+    data = joined.encode("utf-8")
+    if len(data) == len(joined):
+        codes = np.frombuffer(data, dtype=np.uint8)
+    else:
+        codes = np.frombuffer(joined.encode("utf-32-le"), dtype=np.uint32)
+    return codes.reshape(len(words), length)
+
+def _column_distances(columns, target):
+    """
+    Hamming distances (uint8) of words stored as L columns of N letters to target.
+    Adding up one column comparison at a time is several times faster than reducing
+    an (N, L) boolean array along its short axis.
+    """
+    distances = np.zeros(columns.shape[1], dtype=np.uint8)
+    for column, letter in zip(columns, target):
+        distances += (column != letter).view(np.uint8)
+    return distances
+
+def hamming_distances(codes, target):
+    """
+    Returns the number of differing letters between every row of codes and target
+    (a row of codes, or a word of the same length), as a uint8 array of length N.
+    """
+    if isinstance(target, str):
+        target = encode_words([target])[0]
+    return _column_distances(codes.T, target)
+
+def block_hamming(codes_a, codes_b, block=256):
+    """
+    Returns the (A, B) matrix of Hamming distances between two blocks of encoded
+    words, computed block rows at a time to bound the temporary (block, B, L) array.
+    """
+    distances = np.empty((len(codes_a), len(codes_b)), dtype=np.intp)
+    for first in range(0, len(codes_a), block):
+        rows = codes_a[first:first + block]
+        distances[first:first + block] = np.count_nonzero(rows[:, None, :] != codes_b[None, :, :], axis=2)
+    return distances
+
+def neighbor_pairs(codes):
+    """
+    Returns (i, j) index arrays of every pair of rows at Hamming distance one
+    (each pair once). The rows must be distinct.
+
+    This is build_pattern_buckets without strings: for each position, the rows are
+    sorted with that column masked out, so words sharing a wildcard pattern become
+    runs of equal keys. Pairs inside the runs are taken in whole-array steps (all
+    pairs d rows apart for d = 1, 2, ... until no run is longer than d).
+    """
+    count, length = codes.shape
+    sources, targets = [], []
+    for position in range(length):
+        keys = np.delete(codes, position, axis=1)
+        if length > 1:
+            # lexsort sorts by its last key first.
+            order = np.lexsort(keys.T[::-1])
+            sorted_keys = keys[order]
+            starts = np.any(sorted_keys[1:] != sorted_keys[:-1], axis=1)
+        else:
+            order = np.arange(count)
+            starts = np.zeros(max(count - 1, 0), dtype=bool)
+        run = np.concatenate(([0], np.cumsum(starts)))
+        for offset in range(1, count):
+            same = run[offset:] == run[:-offset]
+            if not same.any():
+                break
+            sources.append(order[:-offset][same])
+            targets.append(order[offset:][same])
+    if not sources:
+        empty = np.zeros(0, dtype=np.intp)
+        return empty, empty
+    return np.concatenate(sources), np.concatenate(targets)
+
+def build_compact_graph(words):
+    """
+    Same graph as CompactGraph.from_words(words) (including neighbor order), with
+    the edges of each length found by neighbor_pairs.
+    """
+    words = list(dict.fromkeys(words))  # drop duplicates, keep order
+    by_length = {}
+    for i, word in enumerate(words):
+        by_length.setdefault(len(word), []).append(i)
+    sources, targets = [np.zeros(0, dtype=np.intp)], [np.zeros(0, dtype=np.intp)]
+    for ids in by_length.values():
+        i, j = neighbor_pairs(encode_words([words[k] for k in ids]))
+        ids = np.asarray(ids, dtype=np.intp)
+        sources += [ids[i], ids[j]]
+        targets += [ids[j], ids[i]]
+    sources = np.concatenate(sources)
+    targets = np.concatenate(targets)
+    order = np.lexsort((targets, sources))
+    offsets = np.zeros(len(words) + 1, dtype=np.intc)
+    np.cumsum(np.bincount(sources, minlength=len(words)), out=offsets[1:])
+    return CompactGraph(words, array("i", offsets.tobytes()),
+                        array("i", targets[order].astype(np.intc).tobytes()))
+
+def graph_codes(graph):
+    """
+    Returns the encoded words of a CompactGraph (cached per graph) in column-major
+    (L, N) form, or None if its words do not all have the same length.
+    """
+    codes = _CODES.get(graph)
+    if codes is None:
+        try:
+            codes = np.ascontiguousarray(encode_words(graph.words).T)
+        except ValueError:
+            codes = False
+        _CODES[graph] = codes
+    return codes if codes is not False else None
+
+def goal_distances(graph, goal_id):
+    """
+    Returns the Hamming distance of every word of a CompactGraph to the word goal_id
+    as bytes indexed by word id (the A* heuristic for that goal, in one pass), or
+    None if the graph mixes word lengths.
+    """
+    columns = graph_codes(graph)
+    if columns is None:
+        return None
+    return _column_distances(columns, columns[:, goal_id]).tobytes()
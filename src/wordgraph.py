@@ -0,0 +1,89 @@
+# src/wordgraph.py
+
+import networkx as nx
+from itertools import combinations
+from components import DynamicComponents
+from distances import clear_distance_fields
+from graph import build_pattern_buckets, wildcard_patterns
+
+class WordGraph(nx.Graph):
+    """
+    A networkx graph of words that can be changed in place, e.g. to add new slang or
+    ban a word on a running server without rebuilding the graph.
+
+    The wildcard pattern buckets used by build_graph are kept, so add_word and
+    remove_word only touch the word's own len(word) buckets and edges. Each change
+    bumps self.version, patches the connected components (see DynamicComponents)
+    and drops the cached distance fields of the graph.
+
+    Use add_word and remove_word rather than add_node / remove_node, which do not
+    update the buckets.
+    """
+
+    def __init__(self, words=(), **attr):
+        """
+        Parameters:
+            words: initial words (duplicates are ignored)
+            attr: graph attributes, as for nx.Graph
+        """
+        super().__init__(**attr)
+        self.buckets = {}
+        self.version = 0
+        self._components = None
+        for pattern, bucket in build_pattern_buckets(words).items():
+            self.buckets[pattern] = set(bucket)
+            self.add_nodes_from(bucket)
+            if len(bucket) > 1:
+                self.add_edges_from(combinations(bucket, 2))
+
+    @property
+    def components(self):
+        """The DynamicComponents of the graph, computed on first use and patched afterwards."""
+        if self._components is None:
+            self._components = DynamicComponents(self)
+        return self._components
+
+    def _changed(self):
+        self.version += 1
+        clear_distance_fields(self)
+
+    def add_word(self, word):
+        """
+        Inserts a word and its edges to every word one letter away.
+
+        Returns:
+            True if the word was added, False if it was already in the graph.
+        """
+        if word in self:
+            return False
+        self.add_node(word)
+        for pattern in wildcard_patterns(word):
+            bucket = self.buckets.setdefault(pattern, set())
+            for neighbor in bucket:
+                self.add_edge(word, neighbor)
+            bucket.add(word)
+        if self._components is not None:
+            self._components.added(word)
+        self._changed()
+        return True
+
+    def remove_word(self, word):
+        """
+        Removes a word and its edges.
+
+        Returns:
+            True if the word was removed, False if it was not in the graph.
+        """
+        if word not in self:
+            return False
+        degree = self.degree(word)
+        for pattern in wildcard_patterns(word):
+            bucket = self.buckets[pattern]
+            bucket.discard(word)
+            if not bucket:
+                del self.buckets[pattern]
+        self.remove_node(word)
+        if self._components is not None:
+            self._components.removed(word, degree)
+        self._changed()
+        return True
@@ -0,0 +1,110 @@
+import itertools
+import random
+
+import networkx as nx
+import pytest
+
+from graph import build_graph
+from compact import CompactGraph
+from algorithms import (search_path, shortest_path_dag, count_shortest_paths,
+                        all_shortest_paths, k_shortest_paths)
+from instrumentation import SearchStats, add_hook, remove_hook
+
+WORDS = ["cat", "bat", "bet", "bed", "bad", "cad", "dog", "dot"]
+
+@pytest.fixture(params=["networkx", "compact"])
+def graph(request):
+    if request.param == "networkx":
+        return build_graph(WORDS)
+    return CompactGraph.from_words(WORDS)
+
+@pytest.mark.parametrize("algorithm", ["bfs", "ucs", "astar", "bidirectional"])
+def test_shortest_path_length(graph, algorithm):
+    path = search_path(graph, "cat", "bed", algorithm)
+    assert path[0] == "cat" and path[-1] == "bed"
+    assert len(path) == 4
+
+@pytest.mark.parametrize("algorithm", ["bfs", "ucs", "astar", "bidirectional"])
+def test_no_path(graph, algorithm):
+    assert search_path(graph, "cat", "dog", algorithm) is None
+
+def test_compact_graph_matches_networkx():
+    graph = build_graph(WORDS)
+    compact = CompactGraph.from_words(WORDS)
+    assert compact.number_of_nodes() == graph.number_of_nodes()
+    assert compact.number_of_edges() == graph.number_of_edges()
+    for word in WORDS:
+        assert compact[word] == set(graph[word])
+    assert CompactGraph.from_networkx(graph)["bat"] == compact["bat"]
+
+@pytest.mark.parametrize("algorithm", ["bfs", "ucs", "astar", "bidirectional"])
+def test_start_is_goal(graph, algorithm):
+    assert search_path(graph, "bat", "bat", algorithm) == ["bat"]
+
+def test_expanded_count_reported(graph):
+    bfs_stats, bidirectional_stats = {}, {}
+    search_path(graph, "cat", "bed", "bfs", stats=bfs_stats)
+    search_path(graph, "cat", "bed", "bidirectional", stats=bidirectional_stats)
+    assert 0 < bidirectional_stats["expanded"] <= bfs_stats["expanded"]
+
+@pytest.mark.parametrize("algorithm", ["bfs", "ucs", "astar", "bidirectional"])
+def test_search_stats(graph, algorithm):
+    calls = []
+    stats = SearchStats(callback=calls.append)
+    search_path(graph, "cat", "bed", algorithm, stats=stats)
+    search_path(graph, "cat", "dog", algorithm, stats=stats)
+    assert stats.calls == 2 and len(calls) == 2
+    assert stats.operation == algorithm
+    assert stats.path_length is None
+    assert stats.totals["expanded"] >= 4
+    assert stats.pushed >= 1 and stats.peak_frontier >= 1
+    assert (stats.heap_ops > 0) == (algorithm in ("ucs", "astar"))
+    assert stats.wall_time >= 0
+
+def test_hooks_receive_counters(graph):
+    seen = []
+    add_hook(seen.append)
+    try:
+        search_path(graph, "cat", "bed", "bfs")
+    finally:
+        remove_hook(seen.append)
+    search_path(graph, "cat", "bed", "bfs")
+    assert len(seen) == 1
+    assert seen[0]["operation"] == "bfs" and seen[0]["path_length"] == 3
+
+def test_shortest_path_dag(graph):
+    dag = shortest_path_dag(graph, "cat", "bed")
+    assert sorted(dag["cat"]) == ["bat", "cad"] and dag["bed"] == []
+    assert "dog" not in dag
+    assert shortest_path_dag(graph, "cat", "dog") is None
+
+def test_all_shortest_paths(graph):
+    paths = sorted(all_shortest_paths(graph, "cat", "bed"))
+    assert paths == [["cat", "bat", "bad", "bed"], ["cat", "bat", "bet", "bed"],
+                     ["cat", "cad", "bad", "bed"]]
+    assert count_shortest_paths(graph, "cat", "bed") == 3
+    assert count_shortest_paths(graph, "cat", "dog") == 0
+    assert list(all_shortest_paths(graph, "cat", "cat")) == [["cat"]]
+
+def test_k_shortest_paths(graph):
+    paths = list(k_shortest_paths(graph, "cat", "bed"))
+    assert [len(path) for path in paths] == [4, 4, 4, 6]
+    assert len({tuple(path) for path in paths}) == 4
+    assert len(list(k_shortest_paths(graph, "cat", "bed", k=2))) == 2
+    assert list(k_shortest_paths(graph, "cat", "dog")) == []
+
+def test_enumeration_matches_networkx():
+    words = [line.strip().lower() for line in open("data/oxford_words.txt") if len(line.strip()) == 4]
+    graph = CompactGraph.from_words(words)
+    reference = build_graph(words)
+    rng = random.Random(3)
+    for _ in range(5):
+        start, goal = rng.sample(sorted(reference.nodes), 2)
+        if not nx.has_path(reference, start, goal):
+            continue
+        expected = sorted(nx.all_shortest_paths(reference, start, goal))
+        assert sorted(all_shortest_paths(graph, start, goal)) == expected
+        assert count_shortest_paths(graph, start, goal) == len(expected)
+        lengths = [len(p) for p in itertools.islice(k_shortest_paths(graph, start, goal), 20)]
+        expected_lengths = [len(p) for p in itertools.islice(nx.shortest_simple_paths(reference, start, goal), 20)]
+        assert lengths == expected_lengths
@@ -0,0 +1,16 @@
+import io
+import json
+
+from batch import read_pairs, run_batch
+
+def test_run_batch_jsonl(tmp_path):
+    dictionary = tmp_path / "words.txt"
+    dictionary.write_text("\n".join(["cat", "bat", "bet", "bed", "dog", "tree"]))
+    pairs = read_pairs(io.StringIO("start,goal\ncat,bed\n\nCat,dog\ncat,tree\n"))
+    out = io.StringIO()
+    solved = run_batch(pairs, str(dictionary), out, output_format="jsonl", processes=1)
+    rows = {(row["start"], row["goal"]): row for row in map(json.loads, out.getvalue().splitlines())}
+    assert solved == 3
+    assert rows[("cat", "bed")]["path"] == ["cat", "bat", "bet", "bed"]
+    assert rows[("cat", "dog")]["steps"] == -1
+    assert rows[("cat", "tree")]["path"] is None
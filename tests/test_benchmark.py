@@ -0,0 +1,27 @@
+from benchmark import run_suite, compare_to_baseline, measure_import
+
+WORDS = ["cat", "bat", "bet", "bed", "tree", "free", "fret", "planet", "placet", "places"]
+
+def test_suite_is_reproducible(tmp_path):
+    dictionary = tmp_path / "words.txt"
+    dictionary.write_text("\n".join(WORDS))
+    first = run_suite([str(dictionary)], pair_count=3, seed=7)
+    second = run_suite([str(dictionary)], pair_count=3, seed=7)
+    cases = {row["case"] for row in first}
+    assert {"load_dictionary", "build_graph", "search:bfs", "search:bidirectional"} <= cases
+    assert {"select_valid_word_pair:easy:cold", "select_valid_word_pair:easy"} <= cases
+    assert [row["expanded"] for row in first] == [row["expanded"] for row in second]
+    assert compare_to_baseline(second, first, tolerance=100) == []
+
+def test_regressions_are_reported():
+    baseline = [{"dictionary": "d", "length": 3, "case": "search:bfs",
+                 "wall_s": 0.1, "peak_bytes": 1000, "expanded": 10, "steps": 4}]
+    slower = [dict(baseline[0], wall_s=0.5, expanded=12)]
+    regressions = compare_to_baseline(slower, baseline)
+    assert len(regressions) == 2
+    assert compare_to_baseline(baseline, baseline) == []
+
+def test_main_imports_no_heavy_modules():
+    row = measure_import("main", runs=1)
+    assert row["heavy_modules"] == []
+    assert row["median_ms"] > 0
@@ -0,0 +1,51 @@
+import cache
+from cache import get_graph, get_variable_length_graph, load_graph, save_graph, cache_path, dictionary_hash
+from compact import CompactGraph
+from main import solve_from_cache
+
+WORDS = ["cat", "bat", "bet", "bed", "dog"]
+
+def test_save_and_load_round_trip(tmp_path):
+    graph = CompactGraph.from_words(WORDS)
+    path = str(tmp_path / "words.graph")
+    save_graph(graph, path)
+    loaded = load_graph(path)
+    assert list(loaded.words) == WORDS
+    assert list(loaded.offsets) == list(graph.offsets)
+    assert list(loaded.targets) == list(graph.targets)
+    assert loaded["bat"] == {"cat", "bet"}
+
+def test_cache_invalidated_when_dictionary_changes(tmp_path):
+    dictionary = tmp_path / "words.txt"
+    dictionary.write_text("\n".join(WORDS))
+    cache_dir = str(tmp_path / "cache")
+    assert get_graph(str(dictionary), 3, cache_dir=cache_dir).number_of_nodes() == 5
+
+    dictionary.write_text("\n".join(WORDS + ["cot"]))
+    assert load_graph(cache_path(dictionary_hash(str(dictionary)), 3, cache_dir)) is None
+    assert get_graph(str(dictionary), 3, cache_dir=cache_dir).number_of_nodes() == 6
+
+def test_dictionary_hash_is_memoized(tmp_path, monkeypatch):
+    dictionary = tmp_path / "words.txt"
+    dictionary.write_text("\n".join(WORDS))
+    digest = dictionary_hash(str(dictionary))
+    monkeypatch.setattr(cache.hashlib, "sha256", None)  # any re-hash would fail
+    assert dictionary_hash(str(dictionary)) == digest
+    monkeypatch.undo()
+    dictionary.write_text("\n".join(WORDS + ["cot"]))
+    assert dictionary_hash(str(dictionary)) != digest
+
+def test_variable_length_graph_cache(tmp_path):
+    dictionary = tmp_path / "words.txt"
+    dictionary.write_text("cat\ncart\ncard\ndog\n")
+    built = get_variable_length_graph(str(dictionary), cache_dir=str(tmp_path))
+    loaded = get_variable_length_graph(str(dictionary), cache_dir=str(tmp_path))
+    assert loaded is not built and loaded.graph["variable_length"]
+    assert sorted(loaded.neighbors("cart")) == ["card", "cat"]
+
+def test_solve_from_cache(tmp_path):
+    dictionary = tmp_path / "words.txt"
+    dictionary.write_text("\n".join(["cat", "bat", "bet", "bed", "dog"]))
+    assert solve_from_cache(str(dictionary), "cat", "bed", cache_dir=str(tmp_path)) == ["cat", "bat", "bet", "bed"]
+    assert solve_from_cache(str(dictionary), "cat", "dog", cache_dir=str(tmp_path)) is None
+    assert solve_from_cache(str(dictionary), "cat", "zzz", cache_dir=str(tmp_path)) is None
@@ -0,0 +1,52 @@
+import gc
+import random
+import weakref
+
+import pytest
+
+from graph import build_graph
+from compact import CompactGraph
+from components import ComponentIndex
+from utils import get_distance_index, select_valid_word_pair
+from algorithms import search_path
+
+WORDS = ["cat", "bat", "bet", "bed", "dog", "dot", "fig"]
+
+@pytest.mark.parametrize("builder", [build_graph, CompactGraph.from_words])
+def test_components(builder):
+    index = ComponentIndex(builder(WORDS))
+    assert index.number_of_components() == 3
+    assert index.connected("cat", "bed")
+    assert not index.connected("cat", "dog")
+    assert index.component_size("fig") == 1
+    assert "fig" not in {index.words[i] for i in index.eligible}
+
+def test_sample_pair_is_connected():
+    graph = build_graph(WORDS)
+    index = ComponentIndex(graph)
+    rng = random.Random(1)
+    for _ in range(50):
+        start, goal = index.sample_pair(rng)
+        assert start != goal
+        assert search_path(graph, start, goal) is not None
+
+def test_select_valid_word_pair_never_fails():
+    words = WORDS + ["tree", "free", "fret"]
+    for _ in range(20):
+        start, goal, same_length_words, graph = select_valid_word_pair(words, "easy")
+        assert len(start) == 3 and start in same_length_words
+        assert search_path(graph, start, goal) is not None
+
+def test_index_caches_do_not_keep_old_word_lists():
+    class Words(list):  # a list that can be weakly referenced
+        pass
+    first = Words(WORDS)
+    select_valid_word_pair(first, "easy", rng=random.Random(0))
+    get_distance_index(first, 3)
+    first_ref = weakref.ref(first)
+    del first
+    second = Words(WORDS)
+    select_valid_word_pair(second, "easy", rng=random.Random(0))
+    get_distance_index(second, 3)
+    gc.collect()
+    assert first_ref() is None
@@ -0,0 +1,38 @@
+import random
+
+from dictionary import WordDictionary, WordBucket, load_word_dictionary
+from graph import filter_words_by_difficulty
+from utils import select_valid_word_pair
+
+WORDS = ["Cat", "cat", "bat", " bet ", "", "bed", "dog", "cold", "CORD"]
+
+def test_partitions_and_membership():
+    words = WordDictionary(WORDS)
+    assert len(words) == 7
+    assert words.lengths() == [3, 4]
+    assert list(words.bucket(3)) == ["bat", "bed", "bet", "cat", "dog"]
+    assert "cat" in words and "cord" in words
+    assert "Cat" not in words and "cow" not in words
+    assert "cold" in words.bucket(4) and "cat" not in words.bucket(4)
+    assert len(words.bucket(7)) == 0
+
+def test_sampling():
+    words = WordDictionary(WORDS)
+    rng = random.Random(0)
+    assert {words.sample(4, rng) for _ in range(50)} == {"cold", "cord"}
+    assert all(words.sample(rng=rng) in words for _ in range(50))
+
+def test_difficulty_fast_path():
+    words = WordDictionary(WORDS)
+    easy = filter_words_by_difficulty(words, "easy")
+    assert isinstance(easy, WordBucket)
+    assert list(easy) == sorted(filter_words_by_difficulty(list(words), "easy"))
+    start, goal, same_length_words, graph = select_valid_word_pair(words, "easy", rng=random.Random(2))
+    assert "bat" in same_length_words and start in graph and goal in graph
+
+def test_load_is_memoized(tmp_path):
+    path = tmp_path / "words.txt"
+    path.write_text("Ant\nant\nbee\n")
+    first = load_word_dictionary(str(path))
+    assert load_word_dictionary(str(path)) is first
+    assert list(first) == ["ant", "bee"]
@@ -0,0 +1,60 @@
+import random
+
+import pytest
+
+import distance_table
+from algorithms import search_path
+from cache import get_graph
+from compact import CompactGraph
+from distance_table import UNREACHABLE, build_distance_table, get_distance_table, table_for
+from game import WordLadderGame
+from instrumentation import SearchStats
+
+WORDS = ["cat", "bat", "bet", "bed", "bad", "cad", "dog", "dot", "cot", "zzz"]
+
+def test_table_matches_bfs():
+    graph = CompactGraph.from_words(WORDS)
+    table = build_distance_table(graph)
+    for start in WORDS:
+        for goal in WORDS:
+            path = search_path(graph, start, goal, "bfs")
+            assert table.distance(start, goal) == (len(path) - 1 if path else None)
+            ladder = table.path(start, goal)
+            assert (ladder is None) == (path is None)
+            if ladder:
+                assert len(ladder) == len(path) and ladder[0] == start and ladder[-1] == goal
+                assert all(b in graph[a] for a, b in zip(ladder, ladder[1:]))
+    assert table.row(graph.id_of("zzz")).count(UNREACHABLE) == len(WORDS) - 1
+    assert table.eccentricity[graph.id_of("zzz")] == 0
+
+def test_python_and_numpy_builds_agree():
+    np = pytest.importorskip("numpy")
+    rng = random.Random(3)
+    words = list({"".join(rng.choice("abcd") for _ in range(4)) for _ in range(120)})
+    graph = CompactGraph.from_words(words)
+    assert distance_table._build_numpy(graph, np) == tuple(map(bytes, distance_table._build_python(graph)))
+
+def test_registered_table_answers_queries(tmp_path):
+    dictionary = tmp_path / "words.txt"
+    dictionary.write_text("\n".join(WORDS))
+    graph = get_graph(str(dictionary), 3, cache_dir=str(tmp_path))
+    assert get_distance_table(str(dictionary), 3, graph, cache_dir=str(tmp_path)) is None
+    get_distance_table(str(dictionary), 3, graph, build=True, cache_dir=str(tmp_path))
+
+    # A fresh graph loads (memory-maps) the saved table.
+    graph = get_graph(str(dictionary), 3, cache_dir=str(tmp_path))
+    table = get_distance_table(str(dictionary), 3, graph, cache_dir=str(tmp_path))
+    assert table is not None and table_for(graph) is table
+    stats = SearchStats()
+    assert search_path(graph, "cat", "dog", "astar", stats=stats) == ["cat", "cot", "dot", "dog"]
+    assert stats.operation == "distance_table"
+    game = WordLadderGame("cat", "bed", WORDS, graph)
+    assert game.prev_remaining == 3 and game.request_hint() in ("bat", "cad")
+    assert game.make_move("bat") and game.score == 10
+    for attempts in (table.SAMPLE_ATTEMPTS, 0):  # column sampling, then the row scan
+        table.SAMPLE_ATTEMPTS = attempts
+        for _ in range(20):
+            start, goal, steps = table.sample_pair(2, 3, random.Random(_))
+            assert 2 <= steps <= 3 and table.distance(start, goal) == steps
+    with pytest.raises(ValueError):
+        table.sample_pair(9)
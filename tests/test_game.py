@@ -0,0 +1,72 @@
+import pytest
+
+from graph import build_graph
+from compact import CompactGraph
+from game import WordLadderGame
+from game_worker import GameWorker
+from distances import get_distance_field
+from instrumentation import SearchStats
+
+WORDS = ["cat", "bat", "bet", "bed", "bad", "cad", "dog", "dot"]
+
+@pytest.fixture(params=["networkx", "compact"])
+def graph(request):
+    if request.param == "networkx":
+        return build_graph(WORDS)
+    return CompactGraph.from_words(WORDS)
+
+def test_distance_field(graph):
+    field = get_distance_field(graph, "bed")
+    assert field.distance("bed") == 0
+    assert field.distance("cat") == 3
+    assert field.distance("dog") is None
+    assert field.path_from("cat")[-1] == "bed"
+    assert len(field.path_from("cat")) == 4
+    assert get_distance_field(graph, "bed") is field
+
+def test_scoring_and_hints(graph):
+    game = WordLadderGame("cat", "bed", WORDS, graph)
+    assert game.prev_remaining == 3
+    hint = game.request_hint()
+    assert hint in ("bat", "cad")
+    assert game.make_move("bat")
+    assert game.score == 10
+    assert game.make_move("cat")
+    assert game.score == 5
+    assert not game.make_move("dog")
+    assert game.request_hint(algorithm="bfs") in ("bat", "cad")
+
+def test_game_stats(graph):
+    game = WordLadderGame("cat", "bed", WORDS, graph)
+    stats = SearchStats()
+    game.request_hint(stats=stats)
+    assert stats.operation == "request_hint" and stats.path_length == 3
+    game.make_move("bat", stats=stats)
+    assert stats.operation == "make_move" and stats.path_length == 2
+    game.request_hint(algorithm="astar", stats=stats)
+    assert stats.operation == "astar" and stats.expanded >= 1
+
+def test_alternative_hints(graph):
+    game = WordLadderGame("cat", "bed", WORDS, graph)
+    assert sorted(game.hint_options()) == ["bat", "cad"]
+    assert game.count_optimal_ladders() == 3
+    game.make_move("bat")
+    assert sorted(game.hint_options()) == ["bad", "bet"]
+    assert game.count_optimal_ladders() == 2
+
+def test_game_worker(graph, capsys):
+    game = WordLadderGame("cat", "bed", WORDS, graph)
+    worker = GameWorker(game)
+    try:
+        worker.submit_hint()
+        worker.submit_move("bat")
+        worker.submit_move("dog")
+        hint, move, bad = (worker.wait(timeout=5) for _ in range(3))
+        assert hint.kind == "hint" and hint.value in ("bat", "cad")
+        assert move.value and move.view.current_word == "bat"
+        assert move.view.previous_word == "cat" and move.view.score == 10
+        assert bad.value is False and bad.error is None
+        assert worker.pending == 0 and worker.poll() == []
+        assert worker.latency.count == 3 and worker.latency.summary()["max"] >= 0
+    finally:
+        worker.close()
@@ -0,0 +1,36 @@
+from algorithms import search_path, edit_heuristic
+from compact import CompactGraph
+from graph import (build_graph, build_graph_pairwise, wildcard_patterns,
+                   build_variable_length_graph, differ_by_one)
+
+WORDS = ["cat", "bat", "bet", "bed", "bad", "cad", "cot", "dog", "cat"]
+
+def edge_set(graph):
+    return {frozenset(edge) for edge in graph.edges}
+
+def test_wildcard_patterns():
+    assert wildcard_patterns("cat") == ["*at", "c*t", "ca*"]
+
+def test_build_graph_matches_pairwise():
+    graph = build_graph(WORDS)
+    reference = build_graph_pairwise(WORDS)
+    assert set(graph.nodes) == set(reference.nodes)
+    assert edge_set(graph) == edge_set(reference)
+    assert not any(u == v for u, v in graph.edges)
+
+def test_variable_length_graph():
+    words = ["cat", "cart", "card", "care", "are", "ate", "rate", "at", "a", "dog"]
+    graph = build_variable_length_graph(words)
+    compact = CompactGraph.from_words(words, variable_length=True)
+    assert graph.graph["variable_length"] and compact.graph["variable_length"]
+    assert set(map(frozenset, graph.edges)) == {
+        frozenset((w1, w2)) for w1 in words for w2 in words
+        if w1 < w2 and differ_by_one(w1, w2, insert_delete=True)}
+    assert sorted(compact.neighbors("cart")) == sorted(graph.neighbors("cart"))
+    assert not differ_by_one("cat", "cart")
+    assert edit_heuristic("rate", "ate") == 1 and edit_heuristic("cat", "card") == 2
+    for g in (graph, compact):
+        for algorithm in ["bfs", "ucs", "astar", "bidirectional"]:
+            assert len(search_path(g, "cat", "card", algorithm)) == 3
+            assert len(search_path(g, "a", "rate", algorithm)) == 4
+            assert search_path(g, "cat", "dog", algorithm) is None
@@ -0,0 +1,44 @@
+import os
+import random
+
+import pytest
+
+from graph import load_dictionary, build_graph
+from compact import CompactGraph
+from components import ComponentIndex
+from distances import DistanceField
+from landmarks import LandmarkIndex, save_landmarks, load_landmarks
+from algorithms import search_path
+
+DICTIONARY = os.path.join(os.path.dirname(__file__), "..", "data", "oxford_words.txt")
+
+@pytest.fixture(scope="module")
+def graph():
+    words = [word for word in load_dictionary(DICTIONARY) if len(word) == 3]
+    return CompactGraph.from_words(words)
+
+def test_bound_is_admissible(graph):
+    landmarks = LandmarkIndex.build(graph, landmarks=4)
+    rng = random.Random(0)
+    pairs = [ComponentIndex(graph).sample_pair(rng) for _ in range(20)]
+    for start, goal in pairs:
+        field = DistanceField(graph, goal)
+        for word in graph.words[:200]:
+            bound = landmarks.lower_bound(word, goal)
+            if field.distance(word) is None:
+                assert bound is None
+            else:
+                assert bound <= field.distance(word)
+
+def test_astar_with_landmarks_is_optimal(graph, tmp_path):
+    path = str(tmp_path / "graph.landmarks")
+    save_landmarks(LandmarkIndex.build(graph, landmarks=4), path)
+    landmarks = load_landmarks(path, graph)
+    networkx_graph = build_graph(graph.words)
+    rng = random.Random(1)
+    components = ComponentIndex(graph)
+    for _ in range(20):
+        start, goal = components.sample_pair(rng)
+        expected = len(search_path(graph, start, goal, "bfs"))
+        assert len(search_path(graph, start, goal, "astar", landmarks=landmarks)) == expected
+        assert len(search_path(networkx_graph, start, goal, "astar", landmarks=landmarks)) == expected
@@ -0,0 +1,85 @@
+import threading
+
+from algorithms import search_path
+from graph import build_graph
+from instrumentation import SearchStats
+from memo import PathCache
+from wordgraph import WordGraph
+
+WORDS = ["cat", "bat", "bet", "bed", "bad", "cad", "dog"]
+
+def test_hits_and_suffix_hits():
+    graph = build_graph(WORDS)
+    cache = PathCache()
+    path = cache.search(graph, "cat", "bed", "bfs")
+    assert path == search_path(graph, "cat", "bed", "bfs")
+    assert cache.search(graph, "cat", "bed", "bfs") == path
+    assert cache.search(graph, path[1], "bed", "bfs") == path[1:]
+    assert cache.search(graph, "cat", "dog", "bfs") is None
+    assert cache.search(graph, "cat", "dog", "bfs") is None
+    assert cache.stats() == {"entries": 2, "hits": 2, "suffix_hits": 1, "misses": 2,
+                             "evictions": 0, "expirations": 0, "invalidations": 0}
+    # Another algorithm or graph is a separate key.
+    assert cache.lookup(graph, "cat", "bed", "astar") == (False, None)
+    assert cache.lookup(build_graph(WORDS), "cat", "bed", "bfs") == (False, None)
+
+def test_lru_eviction_and_ttl():
+    now = [0.0]
+    graph = build_graph(WORDS)
+    cache = PathCache(max_entries=2, ttl=10, clock=lambda: now[0])
+    for goal in ["bed", "bad", "cad"]:
+        cache.search(graph, "cat", goal)
+    assert len(cache) == 2 and cache.evictions == 1
+    assert cache.lookup(graph, "cat", "bed") == (False, None)
+    assert cache.lookup(graph, "bat", "bed") == (False, None)  # suffixes went with the entry
+    now[0] = 11
+    assert cache.lookup(graph, "cat", "cad") == (False, None)
+    assert cache.expirations == 1
+
+def test_invalidated_when_graph_changes():
+    graph = WordGraph(WORDS)
+    cache = PathCache()
+    assert cache.search(graph, "cat", "dog") is None
+    graph.add_word("cog")
+    graph.add_word("cot")
+    assert cache.search(graph, "cat", "dog") == ["cat", "cot", "cog", "dog"]
+    assert cache.invalidations == 1
+    cache.invalidate(graph)
+    assert len(cache) == 0
+
+def test_stats_on_hit():
+    graph = build_graph(WORDS)
+    cache = PathCache()
+    stats = SearchStats()
+    cache.search(graph, "cat", "bed", "ucs", stats)
+    assert stats.operation == "ucs"
+    cache.search(graph, "cat", "bed", "ucs", stats)
+    assert stats.operation == "path_cache" and stats.path_length == 3
+
+def test_eviction_keeps_suffixes_taken_over_by_newer_paths():
+    graph = build_graph(WORDS)
+    cache = PathCache(max_entries=2)
+    cache.store(graph, "cat", "bed", "bfs", ["cat", "bat", "bet", "bed"])
+    cache.store(graph, "dog", "bed", "bfs", ["dog", "bat", "bet", "bed"])  # made-up path sharing bat, bet
+    cache.store(graph, "cat", "cad", "bfs", ["cat", "cad"])  # evicts cat -> bed
+    assert cache.lookup(graph, "bat", "bed", "bfs") == (True, ["bat", "bet", "bed"])
+
+def test_shared_between_threads():
+    graph = build_graph(WORDS)
+    cache = PathCache(max_entries=3)
+    pairs = [(start, goal) for start in WORDS for goal in WORDS]
+    errors = []
+
+    def worker(offset):
+        try:
+            for i in range(2000):
+                start, goal = pairs[(i * 7 + offset) % len(pairs)]
+                cache.search(graph, start, goal, "bfs")
+        except Exception as e:
+            errors.append(e)
+    threads = [threading.Thread(target=worker, args=(offset,)) for offset in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == [] and len(cache) <= 3
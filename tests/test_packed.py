@@ -0,0 +1,43 @@
+import random
+
+from dictionary import WordDictionary, load_word_dictionary
+from dictionaryCleaning import iter_entry_words
+from packed import open_packed, write_packed
+from utils import select_valid_word_pair
+
+WORDS = ["Cat", "cat", "bat", "bet", "bed", "dog", "Abbé", "abbey", "able"]
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "words.pack")
+    assert write_packed(iter(WORDS), path) == {3: 5, 4: 2, 5: 1}
+    buckets = open_packed(path)
+    assert list(buckets[3]) == ["bat", "bed", "bet", "cat", "dog"]
+    assert list(buckets[4]) == ["abbé", "able"]
+    assert buckets[3][-1] == "dog" and buckets[3][1:3] == ["bed", "bet"]
+    for word in WORDS:
+        assert word.lower() in buckets[len(word)]
+    assert "cot" not in buckets[3] and "aaa" not in buckets[3] and "zzz" not in buckets[3]
+    assert "abbe" not in buckets[4]
+
+def test_packed_dictionary(tmp_path):
+    path = str(tmp_path / "words.pack")
+    write_packed(WORDS, path)
+    packed = load_word_dictionary(path)
+    plain = WordDictionary(WORDS)
+    assert len(packed) == len(plain)
+    assert list(packed) == list(plain)
+    assert "abbé" in packed and "Cat" not in packed
+    start, goal, same_length_words, graph = select_valid_word_pair(packed, "easy", rng=random.Random(0))
+    assert start in same_length_words and goal in graph
+
+def test_iter_entry_words(tmp_path):
+    path = tmp_path / "source.txt"
+    source = "Abbé n. head of an abbey\n\n\nAble adj. capable\n\nX-ray n. \n\nCat n.\n"
+    path.write_text(source, encoding="utf-8")
+    assert list(iter_entry_words(str(path))) == ["Abbé", "Able", "Cat"]
+    crlf = tmp_path / "crlf.txt"
+    crlf.write_bytes(source.replace("\n", "\r\n").encode("utf-8"))
+    assert list(iter_entry_words(str(crlf))) == ["Abbé", "Able", "Cat"]
+    empty = tmp_path / "empty.txt"
+    empty.write_text("")
+    assert list(iter_entry_words(str(empty))) == []
@@ -0,0 +1,57 @@
+import random
+
+import pytest
+
+from algorithms import bfs, count_shortest_paths
+from cache import get_graph
+from puzzle_bank import PuzzleBank, bank_path, build_bank, load_puzzle_bank, MIN_STEPS
+from utils import select_puzzle
+
+WORDS = ["cat", "cot", "cog", "dog", "dot", "bat", "bet", "bed", "bad", "cad", "fig",
+         "cold", "cord", "card", "ward", "word", "worm", "warm"]
+
+@pytest.fixture
+def dictionary(tmp_path):
+    path = tmp_path / "words.txt"
+    path.write_text("\n".join(WORDS) + "\n")
+    return str(path)
+
+def test_bank_records_are_optimal(dictionary, tmp_path):
+    cache_dir = str(tmp_path)
+    counts = build_bank(dictionary, per_length=20, processes=1, cache_dir=cache_dir)
+    assert set(counts) == {3, 4} and all(count > 0 for count in counts.values())
+    bank = PuzzleBank(bank_path(dictionary, cache_dir))
+    for length in bank.lengths():
+        graph = get_graph(dictionary, length, cache_dir=cache_dir)
+        previous = 0
+        for i in range(bank.count(length)):
+            puzzle = bank.puzzle(length, i)
+            assert puzzle.optimal_steps >= max(MIN_STEPS, previous)
+            assert len(bfs(graph, puzzle.start, puzzle.goal)) - 1 == puzzle.optimal_steps
+            assert count_shortest_paths(graph, puzzle.start, puzzle.goal) == puzzle.optimal_ladders
+            previous = puzzle.optimal_steps
+
+def test_draw(dictionary, tmp_path):
+    cache_dir = str(tmp_path)
+    build_bank(dictionary, per_length=20, processes=1, cache_dir=cache_dir)
+    bank = load_puzzle_bank(dictionary, cache_dir=cache_dir)
+    rng = random.Random(0)
+    assert len(bank.draw("easy", rng).start) == 3
+    assert len(bank.draw("medium", rng).goal) == 4
+    assert bank.draw_length(3, rng, min_steps=4).optimal_steps >= 4
+    with pytest.raises(ValueError):
+        bank.draw("hard", rng)
+    with pytest.raises(ValueError):
+        bank.draw_length(3, rng, min_steps=50)
+
+def test_select_puzzle_without_bank(dictionary):
+    start, goal, same_length_words, graph = select_puzzle(WORDS, "easy", dictionary, random.Random(1))
+    assert start in same_length_words and goal in graph
+
+def test_select_puzzle_falls_back_without_bank_section(dictionary, tmp_path):
+    cache_dir = str(tmp_path)
+    build_bank(dictionary, per_length=20, processes=1, lengths=[3], cache_dir=cache_dir)
+    start, goal, _, graph = select_puzzle(WORDS, "easy", dictionary, random.Random(0), cache_dir)
+    assert len(start) == 3 and goal in graph
+    start, goal, _, graph = select_puzzle(WORDS, "medium", dictionary, random.Random(0), cache_dir)
+    assert len(start) == 4 and goal in graph
@@ -0,0 +1,43 @@
+import itertools
+import random
+
+import pytest
+
+from compact import CompactGraph
+from puzzles import LadderDistanceIndex
+from algorithms import search_path
+
+# cat-bat-bet-bed-bad-cad form a cycle; dog-dot is a separate pair.
+WORDS = ["cat", "bat", "bet", "bed", "bad", "cad", "dog", "dot"]
+
+def test_sampled_distance_matches_bfs():
+    graph = CompactGraph.from_words(WORDS)
+    index = LadderDistanceIndex(graph)
+    rng = random.Random(3)
+    for start, goal, distance in index.pairs(2, 3, count=50, rng=rng):
+        assert 2 <= distance <= 3
+        assert len(search_path(graph, start, goal)) - 1 == distance
+
+def test_band_out_of_range():
+    index = LadderDistanceIndex(CompactGraph.from_words(WORDS))
+    assert index.max_distance() == 3
+    assert index.band_size(4, 9) == 0
+    with pytest.raises(ValueError):
+        index.sample_pair(4, 9)
+
+def test_source_cap():
+    words = ["".join(letters) for letters in itertools.product("abcdefg", repeat=3)]
+    graph = CompactGraph.from_words(words)
+    index = LadderDistanceIndex(graph, max_sources=10)
+    assert len(index.sources) == 10
+    assert len(LadderDistanceIndex(graph, max_entries=len(words)).sources) == 1
+    assert len(LadderDistanceIndex(CompactGraph.from_words(WORDS)).sources) == len(WORDS)
+
+def test_pairs_are_uniform_over_the_band():
+    # A star (bat with cat, bit, bad) and a separate pair (dog, dot): 4 edges. Drawing
+    # the source uniformly would give dog-dot 1/3 of the draws instead of 1/4.
+    index = LadderDistanceIndex(CompactGraph.from_words(["bat", "cat", "bit", "bad", "dog", "dot"]))
+    assert index.band_size(1, 1) == 8
+    rng = random.Random(5)
+    draws = [frozenset(pair[:2]) for pair in index.pairs(1, 1, count=4000, rng=rng)]
+    assert 0.21 < draws.count(frozenset(["dog", "dot"])) / len(draws) < 0.29
@@ -0,0 +1,124 @@
+import asyncio
+import json
+import random
+
+from instrumentation import percentile
+from loadgen import run_load
+import utils
+from server import PuzzleService, serve
+
+DICTIONARY = "data/oxford_words.txt"
+
+async def exchange(port, requests):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    responses = []
+    for request in requests:
+        writer.write((request if isinstance(request, str) else json.dumps(request)).encode() + b"\n")
+        await writer.drain()
+        responses.append(json.loads(await reader.readline()))
+    writer.close()
+    return responses
+
+def run_with_server(service, client):
+    async def run():
+        server = await serve(service, port=0)
+        try:
+            return await client(server.sockets[0].getsockname()[1])
+        finally:
+            server.close()
+            await server.wait_closed()
+            service.close()
+    return asyncio.run(run())
+
+def test_protocol(tmp_path):
+    service = PuzzleService(DICTIONARY, processes=0, rng=random.Random(0), cache_dir=str(tmp_path))
+
+    async def client(port):
+        puzzle, = await exchange(port, [{"op": "new_puzzle", "difficulty": "easy", "id": 7}])
+        assert puzzle["id"] == 7 and puzzle["length"] == 3
+        session = puzzle["session"]
+        hint, = await exchange(port, [{"op": "hint", "session": session}])
+        valid, bad, move, solved, errors, unknown, ended = await exchange(port, [
+            {"op": "validate", "session": session, "word": hint["hint"]},
+            {"op": "validate", "session": session, "word": "zzz"},
+            {"op": "move", "session": session, "word": hint["hint"]},
+            {"op": "solve", "start": puzzle["start"], "goal": puzzle["goal"]},
+            "not json",
+            {"op": "hint", "session": "missing"},
+            {"op": "end", "session": session},
+        ])
+        assert valid["valid"] and not bad["valid"]
+        assert move["accepted"] and move["current"] == hint["hint"] and move["score"] == 10
+        assert len(solved["path"]) - 1 == puzzle["optimal"]
+        assert "error" in errors and "error" in unknown
+        assert ended["ended"]
+    run_with_server(service, client)
+
+def test_bad_requests_keep_the_connection(tmp_path):
+    service = PuzzleService(DICTIONARY, processes=0, rng=random.Random(0), cache_dir=str(tmp_path))
+
+    async def boom(self, request):
+        raise RuntimeError("boom")
+    service.OPERATIONS = dict(PuzzleService.OPERATIONS, boom=boom)
+
+    async def client(port):
+        responses = await exchange(port, [
+            {"op": "new_puzzle", "difficulty": None},
+            {"op": "new_puzzle", "difficulty": 5},
+            {"op": "solve", "start": ["cat"], "goal": "dog"},
+            {"op": "boom"},
+            {"op": "stats"},
+        ])
+        assert all("error" in response for response in responses[:4])
+        assert "RuntimeError" in responses[3]["error"]
+        assert responses[4]["sessions"] == 0
+    run_with_server(service, client)
+
+def test_indexes_are_built_before_serving(tmp_path, monkeypatch):
+    monkeypatch.setattr(utils, "_LENGTH_INDEXES", {})
+    service = PuzzleService(DICTIONARY, processes=0, rng=random.Random(3), cache_dir=str(tmp_path))
+
+    def no_build(graph):
+        raise AssertionError("component index built while serving")
+    monkeypatch.setattr(utils, "ComponentIndex", no_build)
+
+    async def client():
+        for difficulty in ("easy", "medium", "hard"):
+            assert "session" in await service.handle({"op": "new_puzzle", "difficulty": difficulty})
+    try:
+        asyncio.run(client())
+    finally:
+        service.close()
+
+def test_sessions_page_out_to_spill_file(tmp_path):
+    service = PuzzleService(DICTIONARY, processes=0, max_sessions=1, rng=random.Random(2),
+                            spill_file=str(tmp_path / "sessions.spill"), cache_dir=str(tmp_path))
+
+    async def client():
+        first = await service.handle({"op": "new_puzzle"})
+        await service.handle({"op": "new_puzzle"})
+        stats = await service.handle({"op": "stats"})
+        assert stats["sessions"] == 2 and stats["paged_sessions"] == 1
+        hint = await service.handle({"op": "hint", "session": first["session"]})
+        move = await service.handle({"op": "move", "session": first["session"], "word": hint["hint"]})
+        assert move["accepted"] and move["score"] == 10 and move["message"].startswith("Good move")
+    try:
+        asyncio.run(client())
+    finally:
+        service.close()
+
+def test_pool_solve_and_load(tmp_path):
+    service = PuzzleService(DICTIONARY, processes=1, rng=random.Random(1), cache_dir=str(tmp_path))
+
+    async def client(port):
+        solved, = await exchange(port, [{"op": "solve", "start": "cat", "goal": "dog", "algorithm": "astar"}])
+        assert solved["path"][0] == "cat" and solved["path"][-1] == "dog"
+        summary = await run_load("127.0.0.1", port, clients=4, requests_per_client=30)
+        assert summary["requests"] >= 120
+        assert summary["operations"]["hint"]["p99_ms"] >= summary["operations"]["hint"]["p50_ms"]
+    run_with_server(service, client)
+
+def test_percentile():
+    values = list(range(1, 101))
+    assert percentile(values, 0.5) == 50 and percentile(values, 0.99) == 99
+    assert percentile([3], 0.99) == 3 and percentile([], 0.5) is None
@@ -0,0 +1,109 @@
+import itertools
+import struct
+
+import pytest
+
+import distances
+from compact import CompactGraph
+from game import WordLadderGame
+from session import (GameContext, GameSession, SessionStore, SNAPSHOT, MOVE_INVALID, MOVE_IMPROVED,
+                     MOVE_WORSENED, MOVE_UNCHANGED)
+
+WORDS = ["cat", "bat", "bet", "bed", "bad", "cad", "dog", "dot"]
+
+@pytest.fixture
+def context():
+    return GameContext(CompactGraph.from_words(WORDS))
+
+def test_session_scores_like_game(context, capsys):
+    game = WordLadderGame("cat", "bed", WORDS, context.graph)
+    session = GameSession(context, "cat", "bed")
+    assert session.remaining == game.prev_remaining == 3
+    for word in ["dog", "bat", "cat", "cad", "bad", "bat", "bet", "bed"]:
+        outcome = session.make_move(word)
+        assert bool(outcome) == game.make_move(word)
+        assert session.score == game.score
+        assert session.current_word == game.current_word
+        assert session.game_status() == game.game_status()
+    assert session.moves_taken == game.moves_taken
+    assert session.game_status() == "win"
+    # Only the game printed (one message per accepted move).
+    assert capsys.readouterr().out.count("\n") == len(game.moves_taken) - 1
+
+def test_move_outcomes():
+    context = GameContext(CompactGraph.from_words(WORDS + ["bit"]))
+    session = GameSession(context, "cat", "bed")
+    assert session.make_move("dog") == MOVE_INVALID
+    assert session.make_move("bat") == MOVE_IMPROVED
+    assert session.make_move("cat") == MOVE_WORSENED
+    assert session.make_move("bat") == MOVE_IMPROVED
+    assert session.make_move("bit") == MOVE_UNCHANGED
+    assert session.request_hint() == "bet"
+    with pytest.raises(ValueError):
+        GameSession(context, "cat", "zzz")
+
+def test_snapshot_round_trip(context):
+    session = GameSession(context, "cat", "bed")
+    session.make_move("bat")
+    session.make_move("bet")
+    data = session.snapshot()
+    restored = GameSession.restore(data, {context.key: context})
+    assert restored.moves_taken == ["cat", "bat", "bet"]
+    assert (restored.score, restored.remaining, restored.goal_word) == (20, 1, "bed")
+    assert restored.make_move("bed") == MOVE_IMPROVED
+    assert restored.game_status() == "win"
+    other = GameContext(CompactGraph.from_words(WORDS + ["cot"]))
+    with pytest.raises(ValueError):
+        GameSession.restore(data, other)
+    with pytest.raises(ValueError):
+        GameSession.restore(data[:-1], context)
+
+def test_corrupted_snapshot_is_rejected(context):
+    session = GameSession(context, "cat", "bed")
+    session.make_move("bat")
+    data = session.snapshot()
+    # Move ids are stored little-endian whatever the host byte order.
+    assert data[SNAPSHOT.size:] == struct.pack("<HH", context.graph.index["cat"], context.graph.index["bat"])
+    fields = list(SNAPSHOT.unpack_from(data))
+    fields[5] = len(WORDS)  # goal id past the end of the graph
+    with pytest.raises(ValueError):
+        GameSession.restore(SNAPSHOT.pack(*fields) + data[SNAPSHOT.size:], context)
+    with pytest.raises(ValueError):
+        GameSession.restore(data[:SNAPSHOT.size] + struct.pack("<HH", 0, 999), context)
+
+def test_store_pages_sessions_out_and_in(context, tmp_path):
+    store = SessionStore(str(tmp_path / "sessions.spill"), {context.key: context}, max_resident=2)
+    ids = [store.add(GameSession(context, "cat", "bed")) for _ in range(5)]
+    store.get(ids[0]).make_move("bat")
+    assert (store.resident_count, store.paged_count) == (2, 3)
+    for session_id in ids:
+        store.get(session_id)
+    session = store.get(ids[0])
+    assert session.moves_taken == ["cat", "bat"] and session.score == 10
+    assert store.page_ins >= 4
+    assert store.remove(ids[1]) and not store.remove(ids[1])
+    assert len(store) == 4 and ids[1] not in store
+    with pytest.raises(KeyError):
+        store.get(ids[1])
+    store.close()
+
+def test_store_holds_fields_of_live_goals(monkeypatch):
+    words = ["".join(letters) for letters in itertools.product("abcdefg", repeat=3)]
+    context = GameContext(CompactGraph.from_words(words))
+    store = SessionStore(None, {context.key: context}, max_resident=len(words))
+    ids = [store.add(GameSession(context, "aaa", goal)) for goal in words[1:]]
+    assert len(words) - 1 > distances.MAX_FIELDS_PER_GRAPH
+    built = []
+
+    class CountingField(distances.DistanceField):
+        def __init__(self, *args, **kwargs):
+            built.append(args[1])
+            super().__init__(*args, **kwargs)
+    monkeypatch.setattr(distances, "DistanceField", CountingField)
+    for session_id in ids:
+        session = store.get(session_id)
+        session.make_move(session.request_hint())
+    assert built == []
+    for session_id in ids:
+        store.remove(session_id)
+    assert context.fields == {}
@@ -0,0 +1,36 @@
+import pytest
+
+pygame = pytest.importorskip("pygame")
+
+from ui import Scene, TextCache
+
+@pytest.fixture
+def font():
+    pygame.font.init()
+    return pygame.font.Font(None, 24)
+
+def test_text_cache(font):
+    cache = TextCache(max_entries=2)
+    first = cache.render("cat", font, (0, 0, 0))
+    assert cache.render("cat", font, (0, 0, 0)) is first
+    cache.render("bat", font, (0, 0, 0))
+    cache.render("bed", font, (0, 0, 0))
+    assert cache.render("cat", font, (0, 0, 0)) is not first
+    assert (cache.hits, cache.misses) == (1, 4)
+
+def test_scene_dirty_rects(font):
+    screen = pygame.Surface((200, 100))
+    background = pygame.Surface((200, 100))
+    background.fill((255, 255, 255))
+    scene = Scene(screen, background, TextCache())
+    items = {"a": ("cat", font, (0, 0, 0), "topleft", (0, 0)),
+             "b": ("bed", font, (0, 0, 0), "topleft", (100, 50))}
+    assert scene.draw(items) == [screen.get_rect()]
+    assert scene.draw(items) == []
+    items["b"] = ("bad", font, (0, 0, 0), "topleft", (100, 50))
+    dirty = scene.draw(items)
+    assert len(dirty) == 2 and all(rect.topleft == (100, 50) for rect in dirty)
+    del items["a"]
+    dirty = scene.draw(items)
+    assert len(dirty) == 1 and dirty[0].topleft == (0, 0)
+    assert screen.get_at((2, 2)) == background.get_at((2, 2))
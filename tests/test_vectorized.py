@@ -0,0 +1,45 @@
+import random
+import string
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import algorithms
+from algorithms import heuristic, search_path
+from compact import CompactGraph
+from graph import differ_by_one
+from vectorized import block_hamming, build_compact_graph, encode_words, goal_distances, hamming_distances
+
+def random_words(count, length, letters="abcde", seed=0):
+    rng = random.Random(seed)
+    return ["".join(rng.choice(letters) for _ in range(length)) for _ in range(count)]
+
+def test_build_matches_pure_python():
+    words = random_words(400, 4) + random_words(300, 3, seed=1) + list("abc") + ["cat", "cat"]
+    expected = CompactGraph.from_words(words)
+    graph = build_compact_graph(words)
+    assert graph.words == expected.words
+    assert graph.offsets == expected.offsets
+    assert graph.targets == expected.targets
+
+def test_hamming_distances():
+    words = list(dict.fromkeys(random_words(60, 5)))
+    codes = encode_words(words)
+    assert list(hamming_distances(codes, words[0])) == [heuristic(word, words[0]) for word in words]
+    matrix = block_hamming(codes, codes[:7], block=16)
+    for i, word in enumerate(words):
+        for j, other in enumerate(words[:7]):
+            assert (matrix[i, j] == 1) == differ_by_one(word, other)
+    assert list(hamming_distances(encode_words(["été", "ete"]), "ete")) == [2, 0]
+    with pytest.raises(ValueError):
+        encode_words(["cat", "cart"])
+
+def test_astar_with_precomputed_heuristic(monkeypatch):
+    words = list(dict.fromkeys(random_words(1500, 5, letters=string.ascii_lowercase[:8])))
+    graph = CompactGraph.from_words(words)
+    assert goal_distances(graph, 3) == bytes(heuristic(word, words[3]) for word in words)
+    pairs = [(words[i], words[-i]) for i in range(1, 40)]
+    expected = [search_path(graph, start, goal, "astar") for start, goal in pairs]
+    monkeypatch.setattr(algorithms, "VECTORIZE_MIN_WORDS", 0)
+    assert [search_path(graph, start, goal, "astar") for start, goal in pairs] == expected
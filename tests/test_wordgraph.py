@@ -0,0 +1,70 @@
+import random
+
+import pytest
+
+from algorithms import search_path
+from components import ComponentIndex
+from distances import get_distance_field
+from game import WordLadderGame
+from graph import build_graph
+from wordgraph import WordGraph
+
+WORDS = ["cat", "bat", "bet", "bed", "dog", "dot", "fig"]
+
+def assert_matches_rebuild(graph):
+    expected = build_graph(list(graph.nodes))
+    assert set(map(frozenset, graph.edges)) == set(map(frozenset, expected.edges))
+    static = ComponentIndex(expected)
+    components = graph.components
+    assert components.number_of_components() == static.number_of_components()
+    for word in graph:
+        for other in graph:
+            assert components.connected(word, other) == static.connected(word, other)
+
+def test_add_and_remove_words():
+    graph = WordGraph(WORDS)
+    components = graph.components
+    assert not components.connected("cat", "dog")
+    assert graph.add_word("cot") and graph.version == 1
+    assert not graph.add_word("cot")
+    assert components.connected("cat", "dog")
+    assert search_path(graph, "cat", "dog") == ["cat", "cot", "dot", "dog"]
+    assert_matches_rebuild(graph)
+
+    assert graph.remove_word("cot") and graph.version == 2
+    assert not graph.remove_word("cot")
+    assert not components.connected("cat", "dog")
+    assert_matches_rebuild(graph)
+
+def test_random_updates_match_rebuild():
+    rng = random.Random(0)
+    pool = ["cat", "cot", "cog", "dog", "dot", "bat", "bet", "bed", "bad", "cad", "fig", "fog"]
+    graph = WordGraph(pool[:4])
+    for _ in range(200):
+        word = rng.choice(pool)
+        if word in graph:
+            graph.remove_word(word)
+        else:
+            graph.add_word(word)
+        if rng.random() < 0.3:
+            assert_matches_rebuild(graph)
+    if graph.number_of_nodes() > 1:
+        try:
+            start, goal = graph.components.sample_pair(rng)
+        except ValueError:
+            return
+        assert search_path(graph, start, goal) is not None
+
+def test_distance_fields_follow_updates():
+    graph = WordGraph(WORDS)
+    field = get_distance_field(graph, "dog")
+    assert field.distance("cat") is None
+    game = WordLadderGame("cat", "dog", WORDS, graph)
+    graph.add_word("cot")
+    assert field.stale and get_distance_field(graph, "dog") is not field
+    assert game.request_hint() == "cot"
+    assert game.make_move("cot") and game.score == 10
+
+def test_sample_pair_without_edges():
+    with pytest.raises(ValueError):
+        WordGraph(["cat", "dog"]).components.sample_pair()